@@ -0,0 +1,38 @@
+"""
+Benchmark de costo y precisión del predictor-corrector de Adams-Bashforth-Moulton (órdenes 2 a 5, modos PECE y PEC)
+contra runge_kutta_4, en el decaimiento del C14 y en la cadena de isótopos de Funciones/Problemas.py
+
+Uso (desde la raíz del repositorio): python Benchmarks/benchmark_adams_moulton.py
+"""
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Benchmarks.medicion import medir
+from Funciones.Metodos import adams_bashforth_moulton, runge_kutta_4
+from Funciones.Problemas import PROBLEMAS
+
+def main():
+    metodos = {'RK4': lambda t_inicial, t_final, h, y_inicial, f: runge_kutta_4(t_inicial, t_final, h, y_inicial, f, como_tabla=False, estadisticas=True)}
+    for orden in (2, 3, 4, 5):
+        for modo in ('PECE', 'PEC'):
+            metodos[f'ABM{orden} {modo}'] = (lambda t_inicial, t_final, h, y_inicial, f, orden=orden, modo=modo:
+                                             adams_bashforth_moulton(t_inicial, t_final, h, y_inicial, f, orden=orden, modo=modo, como_tabla=False, estadisticas=True))
+
+    for nombre_problema in ('C14', 'Cadena'):
+        problema = PROBLEMAS[nombre_problema]
+        print(f"\n{nombre_problema} (t_final = {problema['t_final']})")
+        print(f"{'Método':<12}{'h':>8}{'error máx.':>14}{'eval. f':>10}{'tiempo (s)':>12}{'error x eval.':>15}")
+        for h in (100, 25):
+            for nombre, metodo in metodos.items():
+                tiempo, ((valores_t, valores_y, _), estadisticas) = medir(lambda: metodo(problema['t_inicial'], problema['t_final'], h, problema['y_inicial'], problema['f']))
+                y_real = np.reshape(problema['exacta'](valores_t), valores_y.shape)
+                error = np.nanmax(np.abs(valores_y - y_real))
+                # Con f cara el costo es proporcional a las evaluaciones: error x evaluaciones compara métodos a igual trabajo
+                print(f"{nombre:<12}{h:>8}{error:>14.3e}{estadisticas.evaluaciones_f:>10}{tiempo:>12.4f}{error*estadisticas.evaluaciones_f:>15.3e}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,46 @@
+"""
+Benchmark de los métodos compilados con Numba (Funciones/Compilado.py) contra las versiones en Python de Funciones/Metodos.py
+
+Uso (desde la raíz del repositorio): python Benchmarks/benchmark_compilado.py
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Benchmarks.medicion import medir
+from Funciones.Constantes import LAMBDA, T_INICIAL, T_FINAL
+from Funciones.Compilado import NUMBA_DISPONIBLE, jit_opcional, runge_kutta_2_trapecio_compilado, runge_kutta_4_compilado, adam_bashforth_2_compilado, heun_compilado
+from Funciones.Metodos import runge_kutta_2_trapecio, runge_kutta_4, adam_bashforth_2_con_euler_RK1_explicito, heun
+
+def dy1(t, y):
+    """Derivada de la EDO: dy/dt = -λy"""
+    return -LAMBDA * y
+
+dy1_compilada = jit_opcional(dy1)
+
+def main():
+    h = 0.1
+    metodos = {
+        'RK2': (runge_kutta_2_trapecio, runge_kutta_2_trapecio_compilado, ()),
+        'RK4': (runge_kutta_4, runge_kutta_4_compilado, ()),
+        'AB2': (adam_bashforth_2_con_euler_RK1_explicito, adam_bashforth_2_compilado, ()),
+        'Heun': (heun, heun_compilado, (1e-12, 5)),
+    }
+
+    print(f"Numba disponible: {NUMBA_DISPONIBLE}, h = {h}, horizonte = {T_FINAL} años")
+    print(f"{'Método':<8}{'primera llamada (s)':>22}{'Python (pasos/s)':>20}{'compilado (pasos/s)':>22}{'aceleración':>14}")
+    for nombre, (metodo_python, metodo_compilado, extra) in metodos.items():
+        # La primera llamada incluye la compilación (o la carga desde la caché en disco)
+        inicio = time.perf_counter()
+        metodo_compilado(T_INICIAL, T_FINAL, 1000, 1.0, dy1_compilada, *extra)
+        primera = time.perf_counter() - inicio
+
+        t_python, (valores_t, _, _) = medir(lambda: metodo_python(T_INICIAL, T_FINAL, h, 1.0, dy1, *extra, como_tabla=False))
+        t_compilado, _ = medir(lambda: metodo_compilado(T_INICIAL, T_FINAL, h, 1.0, dy1_compilada, *extra, como_tabla=False))
+        n_pasos = len(valores_t) - 1
+        print(f"{nombre:<8}{primera:>22.3f}{n_pasos/t_python:>20,.0f}{n_pasos/t_compilado:>22,.0f}{t_python/t_compilado:>13.1f}x")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,87 @@
+"""
+Benchmark del tiempo de importación del paquete: cada import se mide en un intérprete nuevo (con la caché de bytecode ya
+generada) y se informa qué dependencias pesadas quedaron cargadas. Con --limite termina con error si algún import de la
+lista básica supera ese tiempo o carga scipy, pandas o matplotlib, para usarlo como control en los workers de corta vida
+
+Uso (desde la raíz del repositorio):
+    python Benchmarks/benchmark_importacion.py
+    python Benchmarks/benchmark_importacion.py --repeticiones 10 --limite 0.5
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+DEPENDENCIAS_PESADAS = ('scipy', 'pandas', 'matplotlib')
+
+# Imports que no deberían cargar ninguna dependencia pesada
+IMPORTS_BASICOS = [
+    'import Funciones',
+    'from Funciones import integrar, runge_kutta_4',
+    'from Funciones.Metodos import *',
+    'from Funciones.Graficas import *',
+    'from Funciones.Errores import *',
+]
+
+# Imports que sí las cargan, como referencia
+IMPORTS_REFERENCIA = [
+    'import numpy',
+    'import scipy.integrate',
+    'import pandas',
+    'import matplotlib.pyplot',
+    'from Funciones import *',
+]
+
+# Se mide dentro del intérprete para no contar su arranque, igual para todos los imports
+CODIGO_MEDICION = """
+import sys, time
+inicio = time.perf_counter()
+{}
+fin = time.perf_counter()
+print(fin - inicio, ','.join(m for m in {!r} if m in sys.modules))
+"""
+
+def medir_import(sentencia, repeticiones):
+    """
+    Mide una sentencia de import en intérpretes nuevos
+
+    :param sentencia: str, sentencia de import
+    :param repeticiones: int, cantidad de intérpretes
+    :return: tupla (mediana del tiempo en s, mínimo en s, dependencias pesadas cargadas)
+    """
+    entorno = dict(os.environ, PYTHONPATH=RAIZ, MPLBACKEND='Agg')
+    tiempos = []
+    for _ in range(repeticiones):
+        salida = subprocess.run([sys.executable, '-c', CODIGO_MEDICION.format(sentencia, DEPENDENCIAS_PESADAS)],
+                                capture_output=True, text=True, cwd=RAIZ, env=entorno, check=True).stdout.split()
+        tiempos.append(float(salida[0]))
+    cargadas = salida[1].split(',') if len(salida) > 1 else []
+    return statistics.median(tiempos), min(tiempos), cargadas
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark del tiempo de importación del paquete Funciones')
+    parser.add_argument('--repeticiones', type=int, default=5)
+    parser.add_argument('--limite', type=float, default=None, help='tiempo máximo en s para los imports básicos (opcional)')
+    argumentos = parser.parse_args()
+
+    # Un primer import genera la caché de bytecode para que no se mida la compilación
+    subprocess.run([sys.executable, '-c', 'from Funciones import *'], cwd=RAIZ, env=dict(os.environ, PYTHONPATH=RAIZ, MPLBACKEND='Agg'), check=True)
+
+    fallas = []
+    print(f"{'Import':<50} {'Mediana (ms)':>13} {'Mínimo (ms)':>12}  Dependencias pesadas")
+    for sentencia in IMPORTS_BASICOS + IMPORTS_REFERENCIA:
+        mediana, minimo, cargadas = medir_import(sentencia, argumentos.repeticiones)
+        print(f"{sentencia:<50} {1000*mediana:>13.1f} {1000*minimo:>12.1f}  {', '.join(cargadas) or '-'}")
+
+        if sentencia in IMPORTS_BASICOS and argumentos.limite is not None and (mediana > argumentos.limite or cargadas):
+            fallas.append(sentencia)
+
+    if fallas:
+        print('\nImports lentos o que cargan dependencias pesadas: ' + '; '.join(fallas))
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,111 @@
+"""
+Benchmark de pasos por segundo de los métodos de paso fijo: versión original con listas de filas
+contra el motor con arreglos reservados de antemano de Funciones/Metodos.py
+
+Uso (desde la raíz del repositorio): python Benchmarks/benchmark_motor_paso_fijo.py
+"""
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Benchmarks.medicion import medir
+from Funciones.Constantes import LAMBDA, T_INICIAL, T_FINAL
+from Funciones.Metodos import runge_kutta_2_trapecio, runge_kutta_4, adam_bashforth_2_con_euler_RK1_explicito, heun
+
+def dy1(t, y):
+    """Derivada de la EDO: dy/dt = -λy"""
+    return -LAMBDA * y
+
+# ==================== VERSIONES ORIGINALES (listas de filas) ====================
+
+def rk2_listas(t_inicial, t_final, h, y_inicial, f):
+    filas_tabla = [[t_inicial, np.nan, np.nan]]
+    y_n = y_inicial
+    for t in np.arange(t_inicial+h, t_final+0.5*h, h).round(4):
+        k1 = f(t-h, y_n)
+        k2 = f(t, y_n + h*k1)
+        y_n_1 = y_n + (h/2) * (k1+k2)
+        e_local = np.abs(y_n_1 - y_n)
+        y_n = y_n_1
+        filas_tabla.append([t, y_n_1, e_local])
+    return pd.DataFrame(columns=['t','y_aprox','error_local'], data=filas_tabla)
+
+def rk4_listas(t_inicial, t_final, h, y_inicial, f):
+    filas_tabla = [[t_inicial, np.nan, np.nan]]
+    y_n = y_inicial
+    for t in np.arange(t_inicial+h, t_final+0.5*h, h).round(4):
+        k1 = f(t-h, y_n)
+        k2 = f(t-h+h/2, y_n + (h/2)*k1)
+        k3 = f(t-h+h/2, y_n + (h/2)*k2)
+        k4 = f(t-h+h, y_n + h*k3)
+        y_n_1 = y_n + (h/6)*(k1+2*k2+2*k3+k4)
+        e_local = np.abs(y_n_1 - y_n)
+        y_n = y_n_1
+        filas_tabla.append([t, y_n_1, e_local])
+    return pd.DataFrame(columns=['t','y_aprox','error_local'], data=filas_tabla)
+
+def ab2_listas(t_inicial, t_final, h, y_inicial, f):
+    y_n_m1 = y_inicial
+    filas_tabla = [[t_inicial, np.nan, np.nan]]
+    y_n = y_n_m1 + h*f(t_inicial, y_n_m1)
+    filas_tabla.append([t_inicial+h, y_n, np.abs(y_n-y_n_m1)])
+    for t in np.arange(t_inicial+2*h, t_final+0.5*h, h).round(4):
+        y_n_1 = y_n + (h/2)*(3*f(t-h, y_n) - f(t-2*h, y_n_m1))
+        e_local = np.abs(y_n_1 - y_n)
+        y_n_m1 = y_n
+        y_n = y_n_1
+        filas_tabla.append([t, y_n_1, e_local])
+    return pd.DataFrame(columns=['t','y_aprox','error_local'], data=filas_tabla)
+
+def heun_listas(t_inicial, t_final, h, y_inicial, f, eps, itmax):
+    filas_tabla = [[t_inicial, np.nan, np.nan]]
+    y_n = y_inicial
+    for t in np.arange(t_inicial+h, t_final+0.5*h, h).round(4):
+        it = 0
+        y_n_1 = y_n + h*f(t-h, y_n)
+        e_local = np.abs(y_n_1 - y_n)
+        while it <= itmax and e_local > eps:
+            aux_y_ant = y_n_1
+            y_n_1 = y_n + (h/2)*(f(t-h, y_n) + f(t, y_n_1))
+            e_local = np.abs(y_n_1 - aux_y_ant)
+            it += 1
+        e_local = np.abs(y_n_1 - y_n)
+        y_n = y_n_1
+        filas_tabla.append([t, y_n_1, e_local])
+    return pd.DataFrame(columns=['t','y_aprox','error_local'], data=filas_tabla)
+
+# ==================== MEDICIÓN ====================
+
+def main():
+    h = 1
+    metodos = {
+        'RK2': (lambda: rk2_listas(T_INICIAL, T_FINAL, h, 1.0, dy1),
+                lambda: runge_kutta_2_trapecio(T_INICIAL, T_FINAL, h, 1.0, dy1),
+                lambda: runge_kutta_2_trapecio(T_INICIAL, T_FINAL, h, 1.0, dy1, como_tabla=False)),
+        'RK4': (lambda: rk4_listas(T_INICIAL, T_FINAL, h, 1.0, dy1),
+                lambda: runge_kutta_4(T_INICIAL, T_FINAL, h, 1.0, dy1),
+                lambda: runge_kutta_4(T_INICIAL, T_FINAL, h, 1.0, dy1, como_tabla=False)),
+        'AB2': (lambda: ab2_listas(T_INICIAL, T_FINAL, h, 1.0, dy1),
+                lambda: adam_bashforth_2_con_euler_RK1_explicito(T_INICIAL, T_FINAL, h, 1.0, dy1),
+                lambda: adam_bashforth_2_con_euler_RK1_explicito(T_INICIAL, T_FINAL, h, 1.0, dy1, como_tabla=False)),
+        'Heun': (lambda: heun_listas(T_INICIAL, T_FINAL, h, 1.0, dy1, 1e-12, 5),
+                 lambda: heun(T_INICIAL, T_FINAL, h, 1.0, dy1, 1e-12, 5),
+                 lambda: heun(T_INICIAL, T_FINAL, h, 1.0, dy1, 1e-12, 5, como_tabla=False)),
+    }
+
+    print(f"h = {h}, horizonte = {T_FINAL} años")
+    print(f"{'Método':<8}{'listas (pasos/s)':>20}{'arreglos (pasos/s)':>22}{'sin tabla (pasos/s)':>22}{'dif. máx.':>12}")
+    for nombre, (original, nuevo, sin_tabla) in metodos.items():
+        t_original, tabla_original = medir(original, repeticiones=5)
+        t_nuevo, tabla_nueva = medir(nuevo, repeticiones=5)
+        t_sin_tabla, _ = medir(sin_tabla, repeticiones=5)
+        n_pasos = len(tabla_original) - 1
+        diferencia = np.nanmax(np.abs(np.asarray(tabla_original['y_aprox']) - np.asarray(tabla_nueva['y_aprox'])))
+        print(f"{nombre:<8}{n_pasos/t_original:>20,.0f}{n_pasos/t_nuevo:>22,.0f}{n_pasos/t_sin_tabla:>22,.0f}{diferencia:>12.1e}")
+
+if __name__ == '__main__':
+    main()
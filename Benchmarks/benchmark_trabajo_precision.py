@@ -0,0 +1,224 @@
+"""
+Benchmark de trabajo-precisión: corre todos los métodos de Funciones/Metodos.py sobre la familia de problemas de
+Funciones/Problemas.py (decaimiento del C14, Prothero-Robinson rígido, Robertson rígido no lineal y una cadena de varios
+isótopos) y guarda, para cada
+configuración, el error contra la solución exacta, el tiempo de pared (con repeticiones y resumen estadístico) y las
+evaluaciones de f. Las configuraciones se arman y ejecutan con Funciones/Barrido.py. Con --comparar se marcan las configuraciones
+que empeoraron respecto de un JSON anterior
+
+Uso (desde la raíz del repositorio):
+    python Benchmarks/benchmark_trabajo_precision.py --salida trabajo_precision.json --graficos figuras_trabajo_precision
+    python Benchmarks/benchmark_trabajo_precision.py --salida nuevo.json --comparar trabajo_precision.json
+"""
+import argparse
+import datetime
+import json
+import os
+import platform
+import subprocess
+import sys
+
+import numpy as np
+import scipy
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Funciones.Barrido import crear_configuraciones, ejecutar_barrido
+from Funciones.Errores import analizar_corridas
+from Funciones.Metodos import METODOS_PASO_FIJO, PARES_ENCAJADOS, METODOS_EXTRAPOLACION, METODOS_SCIPY, TABLAS_IMPLICITAS
+
+# Pasos de los métodos de paso fijo para cada problema (la malla se redondea a 4 decimales, así que h tiene que ser exacto con 4 decimales)
+VALORES_H_PROBLEMA = {
+    'C14': [1000, 300, 100, 30, 10],
+    'ProtheroRobinson': [1e-1, 2e-2, 5e-3, 2e-3, 1e-3, 5e-4, 2e-4, 1e-4],
+    # Pasos grandes a propósito: el jacobiano en y0 no tiene el acoplamiento con y2 y Newton simplificado no alcanza
+    'Robertson': [1, 0.4, 0.1, 0.04],
+    'Cadena': [1000, 300, 100, 30, 10],
+}
+
+# Pares (rtol, atol) de los métodos adaptativos
+TOLERANCIAS = [(1e-3, 1e-6), (1e-5, 1e-8), (1e-7, 1e-10), (1e-9, 1e-12)]
+
+OPCIONES_METODO = {'Heun': {'eps': 1e-10, 'itmax': 5}}
+
+# Problemas que solo se corren con los métodos para problemas rígidos: los explícitos necesitan pasos del orden de 1e-3 o menores
+METODOS_PROBLEMA = {'Robertson': list(TABLAS_IMPLICITAS) + ['Radau', 'BDF', 'LSODA']}
+
+# Las soluciones de los problemas son de orden 1: un error mayor indica que el método divergió (aunque sea finito)
+ERROR_DIVERGENCIA = 1.0
+
+def _a_json(valor):
+    """Convierte NaN e infinitos en None para que el JSON sea válido"""
+    return None if valor is None or not np.isfinite(valor) else float(valor)
+
+def medir_configuraciones(configuraciones, repeticiones, n_procesos=1):
+    """
+    Ejecuta el barrido de configuraciones varias veces con Barrido.ejecutar_barrido y resume tiempo, costo y error de cada una
+
+    :param configuraciones: lista de dicts de configuración (ver Barrido.crear_configuraciones)
+    :param repeticiones: int, cantidad de repeticiones para el tiempo
+    :param n_procesos: int, procesos del barrido (con más de uno los tiempos se miden con los núcleos compartidos)
+    :return: lista de dicts con la configuración y sus mediciones, en el orden de configuraciones
+    """
+    tiempos = []
+    # Los métodos explícitos divergen en el problema rígido con pasos grandes: se registra como configuración no estable
+    with np.errstate(over='ignore', invalid='ignore'):
+        for _ in range(repeticiones):
+            tabla, registros = ejecutar_barrido(configuraciones, n_procesos=n_procesos, estadisticas=True)
+            tiempos.append([registro.tiempo_pared for registro in registros])
+
+        errores_maximos = analizar_corridas(tabla).set_index('configuracion')['error_max']
+        ultimas_filas = tabla['t'] == tabla.groupby('configuracion')['t'].transform('max')
+        errores_finales = tabla[ultimas_filas].groupby('configuracion')['error_global'].max()
+
+    tiempos = np.array(tiempos)
+    resultados = []
+    for i, (configuracion, estadisticas) in enumerate(zip(configuraciones, registros)):
+        error_max = errores_maximos.loc[i]
+        resultados.append({
+            'problema': configuracion['problema'],
+            'metodo': configuracion['metodo'],
+            'h': _a_json(configuracion['h']),
+            'rtol': _a_json(configuracion['rtol']),
+            'atol': _a_json(configuracion['atol']),
+            'estable': bool(error_max < ERROR_DIVERGENCIA),
+            'error_max': _a_json(error_max),
+            'error_final': _a_json(errores_finales.loc[i]),
+            'tiempo_min': float(tiempos[:, i].min()),
+            'tiempo_mediana': float(np.median(tiempos[:, i])),
+            'tiempo_media': float(tiempos[:, i].mean()),
+            'tiempo_desvio': float(tiempos[:, i].std(ddof=1)) if repeticiones > 1 else 0.0,
+            'evaluaciones_f': int(estadisticas.evaluaciones_f),
+            'pasos_aceptados': int(estadisticas.pasos_aceptados),
+            'pasos_rechazados': estadisticas.pasos_rechazados,
+        })
+    return resultados
+
+def _metadatos(repeticiones):
+    """Datos del entorno para poder comparar corridas entre versiones"""
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+
+    return {
+        'fecha': datetime.datetime.now().isoformat(timespec='seconds'),
+        'commit': commit,
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'scipy': scipy.__version__,
+        'plataforma': platform.platform(),
+        'repeticiones': repeticiones,
+    }
+
+def _clave(resultado):
+    return (resultado['problema'], resultado['metodo'], resultado['h'], resultado['rtol'], resultado['atol'])
+
+def comparar(resultados, anteriores, umbral_tiempo=1.25, umbral_error=1.01):
+    """
+    Compara contra un benchmark anterior y devuelve las configuraciones más lentas o menos precisas
+
+    :param resultados: lista de resultados actuales
+    :param anteriores: lista de resultados del JSON anterior
+    :param umbral_tiempo: float, cociente de tiempos medianos a partir del cual se informa una regresión de velocidad
+    :param umbral_error: float, cociente de errores máximos a partir del cual se informa una regresión de precisión
+    :return: lista de tuplas (clave, descripción)
+    """
+    anteriores = {_clave(resultado): resultado for resultado in anteriores}
+    regresiones = []
+    for resultado in resultados:
+        anterior = anteriores.get(_clave(resultado))
+        if anterior is None:
+            continue
+
+        cociente_tiempo = resultado['tiempo_mediana'] / anterior['tiempo_mediana']
+        if cociente_tiempo > umbral_tiempo:
+            regresiones.append((_clave(resultado), f"tiempo x{cociente_tiempo:.2f}"))
+
+        if anterior['estable'] and not resultado['estable']:
+            regresiones.append((_clave(resultado), "dejó de ser estable"))
+        elif anterior['estable'] and anterior['error_max'] > 0 and resultado['error_max'] / anterior['error_max'] > umbral_error:
+            regresiones.append((_clave(resultado), f"error x{resultado['error_max'] / anterior['error_max']:.3g}"))
+
+        if resultado['evaluaciones_f'] > anterior['evaluaciones_f']:
+            regresiones.append((_clave(resultado), f"evaluaciones de f {anterior['evaluaciones_f']} -> {resultado['evaluaciones_f']}"))
+
+    return regresiones
+
+def graficar(resultados, carpeta):
+    """
+    Guarda una figura por problema con las curvas error vs tiempo y error vs evaluaciones de f (una curva por método)
+
+    :param resultados: lista de resultados
+    :param carpeta: str, carpeta donde se guardan los PNG
+    """
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+
+    os.makedirs(carpeta, exist_ok=True)
+    for problema in dict.fromkeys(resultado['problema'] for resultado in resultados):
+        fig, (ax_tiempo, ax_evaluaciones) = plt.subplots(1, 2, figsize=(14, 6))
+        for metodo in dict.fromkeys(resultado['metodo'] for resultado in resultados):
+            puntos = [r for r in resultados if r['problema'] == problema and r['metodo'] == metodo and r['estable'] and r['error_max'] > 0]
+            if not puntos:
+                continue
+            errores = [r['error_max'] for r in puntos]
+            ax_tiempo.loglog([r['tiempo_mediana'] for r in puntos], errores, 'o-', label=metodo)
+            ax_evaluaciones.loglog([r['evaluaciones_f'] for r in puntos], errores, 'o-', label=metodo)
+
+        ax_tiempo.set_xlabel('Tiempo de pared (mediana, s)')
+        ax_evaluaciones.set_xlabel('Evaluaciones de f')
+        for ax in (ax_tiempo, ax_evaluaciones):
+            ax.set_ylabel('Error global máximo')
+            ax.grid(True, which='both', alpha=0.3)
+        ax_evaluaciones.legend(fontsize=8)
+        fig.suptitle(f'Trabajo-precisión: {problema}')
+        fig.tight_layout()
+        fig.savefig(os.path.join(carpeta, f'trabajo_precision_{problema}.png'), dpi=100)
+        plt.close(fig)
+
+def main():
+    todos = list(METODOS_PASO_FIJO) + list(PARES_ENCAJADOS) + list(METODOS_EXTRAPOLACION) + list(METODOS_SCIPY)
+    parser = argparse.ArgumentParser(description='Benchmark de trabajo-precisión de los métodos de Funciones/Metodos.py')
+    parser.add_argument('--problemas', nargs='+', default=list(VALORES_H_PROBLEMA), choices=list(VALORES_H_PROBLEMA))
+    parser.add_argument('--metodos', nargs='+', default=todos, choices=todos)
+    parser.add_argument('--repeticiones', type=int, default=3)
+    parser.add_argument('--procesos', type=int, default=1, help='procesos del barrido (1 para que los tiempos no compitan por los núcleos)')
+    parser.add_argument('--salida', default='trabajo_precision.json', help='archivo JSON de resultados')
+    parser.add_argument('--graficos', default=None, help='carpeta donde guardar las curvas (opcional)')
+    parser.add_argument('--comparar', default=None, help='JSON de un benchmark anterior para detectar regresiones')
+    argumentos = parser.parse_args()
+
+    configuraciones = []
+    for problema in argumentos.problemas:
+        metodos = [metodo for metodo in argumentos.metodos if metodo in METODOS_PROBLEMA.get(problema, argumentos.metodos)]
+        configuraciones += crear_configuraciones(metodos, valores_h=VALORES_H_PROBLEMA, tolerancias=TOLERANCIAS,
+                                                 problemas=[problema], opciones_metodo=OPCIONES_METODO)
+    resultados = medir_configuraciones(configuraciones, argumentos.repeticiones, argumentos.procesos)
+
+    print(f"{'Problema':<18}{'Método':<18}{'h / rtol':>10}{'error máx.':>12}{'tiempo (s)':>12}{'± desvío':>10}{'eval. f':>10}")
+    for resultado in resultados:
+        parametro = resultado['h'] if resultado['h'] is not None else resultado['rtol']
+        error = f"{resultado['error_max']:.2e}" if resultado['estable'] else 'diverge'
+        print(f"{resultado['problema']:<18}{resultado['metodo']:<18}{parametro:>10.0e}{error:>12}"
+              f"{resultado['tiempo_mediana']:>12.4f}{resultado['tiempo_desvio']:>10.4f}{resultado['evaluaciones_f']:>10}")
+
+    with open(argumentos.salida, 'w', encoding='utf-8') as archivo:
+        json.dump({'metadatos': _metadatos(argumentos.repeticiones), 'resultados': resultados}, archivo, indent=2, ensure_ascii=False)
+    print(f"Resultados guardados en {argumentos.salida}")
+
+    if argumentos.graficos:
+        graficar(resultados, argumentos.graficos)
+        print(f"Curvas guardadas en {argumentos.graficos}")
+
+    if argumentos.comparar:
+        with open(argumentos.comparar, encoding='utf-8') as archivo:
+            anterior = json.load(archivo)
+        regresiones = comparar(resultados, anterior['resultados'])
+        print(f"Comparación con {argumentos.comparar} (commit {anterior['metadatos'].get('commit')}): {len(regresiones)} regresiones")
+        for clave, descripcion in regresiones:
+            print(f"  {clave}: {descripcion}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,21 @@
+"""
+Utilidades de medición compartidas por los benchmarks de este directorio
+"""
+import time
+
+import numpy as np
+
+def medir(funcion, repeticiones=3):
+    """
+    Ejecuta la función varias veces y devuelve el mejor tiempo y el último resultado
+
+    :param funcion: función sin argumentos a medir
+    :param repeticiones: int, cantidad de repeticiones
+    :return: tupla (mejor tiempo en segundos, resultado)
+    """
+    mejor = np.inf
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        resultado = funcion()
+        mejor = min(mejor, time.perf_counter() - inicio)
+    return mejor, resultado
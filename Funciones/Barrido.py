@@ -0,0 +1,137 @@
+import functools
+import itertools
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from Funciones.Constantes import VALORES_H
+from Funciones.Errores import calcular_error_global
+from Funciones.Metodos import integrar, solucion_lineal, METODOS_PASO_FIJO, TABLAS_IMPLICITAS
+from Funciones.Problemas import PROBLEMAS
+
+# Columnas que identifican cada configuración en la tabla larga del barrido
+COLUMNAS_CONFIGURACION = ['configuracion', 'problema', 'metodo', 'h', 'rtol', 'atol']
+
+def crear_configuraciones(metodos, valores_h=VALORES_H, tolerancias=((1e-3, 1e-6),), problemas=('C14',), opciones_metodo=None):
+    """
+    Función que arma la grilla de configuraciones de un barrido. Los métodos de paso fijo se combinan con cada h y los
+    adaptativos (pares encajados y scipy) con cada par de tolerancias. 'Exponencial' se omite en los problemas sin matriz
+
+    :param metodos: lista de nombres de métodos ('RK2', 'RK4', 'AB2', 'Heun', 'RK2(1)', 'RK4(5)', 'RK45', ...)
+    :param valores_h: lista de tamaños de paso para los métodos de paso fijo, o dict {nombre del problema: lista} si cada problema usa los suyos
+    :param tolerancias: lista de pares (rtol, atol) para los métodos adaptativos
+    :param problemas: lista de nombres de PROBLEMAS o dicts con f, exacta, t_inicial, t_final e y_inicial (y matriz si el problema es lineal)
+    :param opciones_metodo: dict {metodo: dict de opciones}, por ejemplo {'Heun': {'eps': 0.01, 'itmax': 5}}
+    :return: lista de dicts de configuración, en orden determinista
+    """
+    opciones_metodo = opciones_metodo or {}
+    configuraciones = []
+
+    for problema, metodo in itertools.product(problemas, metodos):
+        nombre, definicion = _obtener_problema(problema)
+        if metodo == 'Exponencial' and definicion.get('matriz') is None:
+            # Solo aplica a los problemas lineales homogéneos
+            continue
+
+        opciones = opciones_metodo.get(metodo, {})
+        if metodo in METODOS_PASO_FIJO:
+            for h in (valores_h[nombre] if isinstance(valores_h, dict) else valores_h):
+                configuraciones.append({'problema': problema, 'metodo': metodo, 'h': h, 'rtol': np.nan, 'atol': np.nan, 'opciones': opciones})
+        else:
+            for rtol, atol in tolerancias:
+                configuraciones.append({'problema': problema, 'metodo': metodo, 'h': np.nan, 'rtol': rtol, 'atol': atol, 'opciones': opciones})
+
+    return configuraciones
+
+def _obtener_problema(problema):
+    """
+    Función que devuelve el nombre y la definición de un problema, dado por nombre o como dict
+
+    :param problema: str (clave de PROBLEMAS) o dict con f, exacta, t_inicial, t_final e y_inicial
+    :return: tupla (nombre, dict del problema)
+    """
+    if isinstance(problema, str):
+        return problema, PROBLEMAS[problema]
+    return problema.get('nombre', getattr(problema['f'], '__name__', 'problema')), problema
+
+def ejecutar_configuracion(configuracion, estadisticas=False):
+    """
+    Función que ejecuta una configuración del barrido y devuelve sus resultados en formato largo (una fila por t y componente).
+    Los métodos implícitos usan el jacobiano del problema si lo tiene y 'Exponencial' su matriz, salvo que las opciones indiquen otros
+
+    :param configuracion: dict con problema, metodo, h, rtol, atol y opciones
+    :param estadisticas: bool, si es True también se devuelve el objeto Estadisticas de la corrida
+    :return: DataFrame con columnas problema, metodo, h, rtol, atol, t, componente, y_aprox, error_local, y_real y error_global
+             (tupla con el DataFrame y las Estadisticas si se piden)
+    """
+    nombre, problema = _obtener_problema(configuracion['problema'])
+    h = None if np.isnan(configuracion['h']) else configuracion['h']
+    opciones = dict(configuracion.get('opciones', {}))
+    if configuracion['metodo'] == 'Exponencial' and 'matriz' not in opciones:
+        opciones['matriz'] = problema['matriz']
+    if configuracion['metodo'] in TABLAS_IMPLICITAS and problema.get('jacobiano') is not None and 'jacobiano' not in opciones:
+        opciones['jacobiano'] = problema['jacobiano']
+
+    (valores_t, valores_y, errores_locales), registro = integrar(configuracion['metodo'], problema['t_inicial'], problema['t_final'],
+                                                                 problema['y_inicial'], problema['f'], h=h,
+                                                                 rtol=configuracion['rtol'], atol=configuracion['atol'],
+                                                                 como_tabla=False, estadisticas=True, **opciones)
+
+    # Formato largo: los sistemas se aplanan con una columna componente
+    n = len(valores_t)
+    n_componentes = 1 if valores_y.ndim == 1 else valores_y.shape[1]
+    tabla_valores = pd.DataFrame({
+        'problema': nombre,
+        'metodo': configuracion['metodo'],
+        'h': configuracion['h'],
+        'rtol': configuracion['rtol'],
+        'atol': configuracion['atol'],
+        't': np.repeat(valores_t, n_componentes),
+        'componente': np.tile(np.arange(n_componentes), n),
+        'y_aprox': valores_y.ravel(),
+        'error_local': errores_locales.ravel(),
+    })
+
+    # Sin fórmula cerrada, los problemas lineales usan como referencia la exponencial de su matriz de tasas
+    exacta = problema.get('exacta')
+    if exacta is None and problema.get('matriz') is not None:
+        exacta = solucion_lineal(problema['matriz'], problema['t_inicial'], problema['y_inicial'])
+
+    if exacta is not None:
+        tabla_valores['y_real'] = np.reshape(exacta(valores_t), (n, n_componentes)).ravel()
+        calcular_error_global(tabla_valores)
+    else:
+        tabla_valores['y_real'] = np.nan
+        tabla_valores['error_global'] = np.nan
+
+    return (tabla_valores, registro) if estadisticas else tabla_valores
+
+def ejecutar_barrido(configuraciones, n_procesos=None, estadisticas=False):
+    """
+    Función que ejecuta todas las configuraciones de un barrido en un grupo de procesos y junta los resultados en una sola tabla larga.
+    Las derivadas de los problemas tienen que poder enviarse a otros procesos (definidas a nivel de módulo, como en Problemas.py)
+
+    :param configuraciones: lista de dicts de configuración (ver crear_configuraciones)
+    :param n_procesos: int, cantidad de procesos (por defecto todos los núcleos; 1 ejecuta todo en el proceso actual)
+    :param estadisticas: bool, si es True también se devuelve la lista de Estadisticas de cada configuración, en el mismo orden
+    :return: DataFrame largo con una columna configuracion (posición en la lista) y el orden de la lista de configuraciones
+             (tupla con el DataFrame y la lista de Estadisticas si se piden)
+    """
+    n_procesos = n_procesos or os.cpu_count() or 1
+    ejecutar = functools.partial(ejecutar_configuracion, estadisticas=True)
+
+    if n_procesos == 1 or len(configuraciones) <= 1:
+        salidas = [ejecutar(configuracion) for configuracion in configuraciones]
+    else:
+        # map conserva el orden de las configuraciones sin importar qué proceso termina primero
+        with ProcessPoolExecutor(max_workers=n_procesos) as ejecutor:
+            salidas = list(ejecutor.map(ejecutar, configuraciones))
+
+    tablas = [tabla_valores for tabla_valores, _ in salidas]
+    for i, tabla_valores in enumerate(tablas):
+        tabla_valores.insert(0, 'configuracion', i)
+
+    tabla = pd.concat(tablas, ignore_index=True)
+    return (tabla, [registro for _, registro in salidas]) if estadisticas else tabla
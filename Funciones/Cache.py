@@ -0,0 +1,242 @@
+import dataclasses
+import functools
+import hashlib
+import os
+import tempfile
+import types
+
+import numpy as np
+
+from Funciones.Estadisticas import Estadisticas
+from Funciones.Metodos import integrar, _armar_salida, METODOS_PASO_FIJO
+
+# Se incluye en todas las claves: cambiarla invalida los resultados guardados con versiones anteriores de los métodos
+VERSION_CACHE = 2
+
+# Prefijo de los arrays del .npz con los campos de las Estadisticas de la corrida
+PREFIJO_ESTADISTICAS = 'estadisticas_'
+
+def _huella_valor(valor, huella, visitadas):
+    """
+    Función que agrega al hash el contenido de un valor (números, arrays, textos, colecciones o funciones)
+
+    :param valor: valor a agregar
+    :param huella: objeto hashlib sobre el que se acumula
+    :param visitadas: set de ids de funciones ya recorridas (para evitar ciclos)
+    """
+    if isinstance(valor, np.ndarray):
+        huella.update(str((valor.dtype, valor.shape)).encode())
+        huella.update(np.ascontiguousarray(valor).tobytes())
+    elif isinstance(valor, (bool, int, float, complex, str, bytes, np.generic)) or valor is None:
+        huella.update(repr(valor).encode())
+    elif isinstance(valor, (list, tuple)):
+        huella.update(type(valor).__name__.encode())
+        for elemento in valor:
+            _huella_valor(elemento, huella, visitadas)
+    elif isinstance(valor, dict):
+        for clave in sorted(valor, key=repr):
+            huella.update(repr(clave).encode())
+            _huella_valor(valor[clave], huella, visitadas)
+    elif isinstance(valor, types.CodeType):
+        huella.update(valor.co_code)
+        huella.update(repr(valor.co_names).encode())
+        for constante in valor.co_consts:
+            _huella_valor(constante, huella, visitadas)
+    elif isinstance(valor, types.ModuleType):
+        huella.update(valor.__name__.encode())
+    elif callable(valor):
+        _huella_funcion(valor, huella, visitadas)
+    else:
+        huella.update(type(valor).__name__.encode())
+        huella.update(repr(valor).encode())
+
+def _huella_funcion(f, huella, visitadas):
+    """
+    Función que agrega al hash una derivada: su bytecode y constantes, los valores globales que usa (por ejemplo LAMBDA),
+    las variables de su clausura y sus valores por defecto. Así, cambiar una constante del problema cambia la clave
+
+    :param f: función derivada (también functools.partial o funciones compiladas con numba)
+    :param huella: objeto hashlib sobre el que se acumula
+    :param visitadas: set de ids de funciones ya recorridas (para evitar ciclos)
+    """
+    if id(f) in visitadas:
+        return
+    visitadas.add(id(f))
+
+    if isinstance(f, functools.partial):
+        _huella_valor(f.func, huella, visitadas)
+        _huella_valor(f.args, huella, visitadas)
+        _huella_valor(f.keywords, huella, visitadas)
+        return
+
+    # Funciones compiladas con numba: se usa la función de Python original
+    f = getattr(f, 'py_func', f)
+    codigo = getattr(f, '__code__', None)
+    if codigo is None:
+        huella.update(type(f).__qualname__.encode())
+        huella.update(repr(f).encode())
+        return
+
+    _huella_valor(codigo, huella, visitadas)
+    globales = getattr(f, '__globals__', {})
+    for nombre in codigo.co_names:
+        if nombre in globales:
+            huella.update(nombre.encode())
+            _huella_valor(globales[nombre], huella, visitadas)
+    for celda in f.__closure__ or ():
+        _huella_valor(celda.cell_contents, huella, visitadas)
+    _huella_valor(f.__defaults__, huella, visitadas)
+    _huella_valor(f.__kwdefaults__, huella, visitadas)
+
+class CacheResultados:
+    """
+    Caché en disco de corridas de integración. Cada resultado se guarda como .npz (arrays .npy sin comprimir) con nombre igual al
+    hash del método, sus parámetros y la derivada, y cuando la caché supera tamano_maximo se borran los menos usados (LRU)
+    """
+
+    def __init__(self, directorio='.cache_resultados', tamano_maximo=512 * 2**20):
+        """
+        :param directorio: str, carpeta donde se guardan los resultados
+        :param tamano_maximo: int, tamaño máximo de la caché en bytes
+        """
+        self.directorio = directorio
+        self.tamano_maximo = tamano_maximo
+        self.aciertos = 0
+        self.fallos = 0
+        os.makedirs(directorio, exist_ok=True)
+
+    def clave(self, metodo, f, **parametros):
+        """
+        Calcula la clave de una corrida
+
+        :param metodo: str, nombre del método
+        :param f: función derivada del PVI
+        :param parametros: parámetros de la corrida (t_inicial, t_final, y_inicial, h, rtol, atol, opciones del método)
+        :return: str, hash sha256 en hexadecimal
+        """
+        huella = hashlib.sha256()
+        _huella_valor((VERSION_CACHE, metodo), huella, set())
+        _huella_valor(parametros, huella, set())
+        _huella_funcion(f, huella, set())
+        return huella.hexdigest()
+
+    def _ruta(self, clave):
+        return os.path.join(self.directorio, clave + '.npz')
+
+    def obtener(self, clave):
+        """
+        Busca un resultado en la caché y, si está, lo marca como usado recientemente
+
+        :param clave: str, clave de la corrida
+        :return: tupla (t, y_aprox, error_local, Estadisticas de la corrida original) o None si no está
+        """
+        ruta = self._ruta(clave)
+        try:
+            with np.load(ruta) as archivo:
+                campos = {nombre[len(PREFIJO_ESTADISTICAS):]: archivo[nombre] for nombre in archivo.files if nombre.startswith(PREFIJO_ESTADISTICAS)}
+                resultado = (archivo['t'], archivo['y_aprox'], archivo['error_local'])
+        except (FileNotFoundError, OSError, KeyError, ValueError):
+            self.fallos += 1
+            return None
+
+        # La fecha de modificación se usa como fecha del último uso para el LRU
+        os.utime(ruta)
+        self.aciertos += 1
+        # Los campos que no se guardaron estaban en None; los escalares vuelven como arrays de dimensión 0
+        registro = Estadisticas(**{campo.name: None for campo in dataclasses.fields(Estadisticas)})
+        for campo, valor in campos.items():
+            setattr(registro, campo, valor.item() if valor.ndim == 0 else valor)
+        return resultado + (registro,)
+
+    def guardar(self, clave, valores_t, valores_y, errores_locales, registro):
+        """
+        Guarda un resultado en la caché y luego aplica el límite de tamaño
+
+        :param clave: str, clave de la corrida
+        :param valores_t: array, valores de t
+        :param valores_y: array, valores de y_aprox
+        :param errores_locales: array, valores de error_local
+        :param registro: Estadisticas de la corrida (los campos en None no se guardan)
+        """
+        estadisticas = {PREFIJO_ESTADISTICAS + campo: valor for campo, valor in vars(registro).items() if valor is not None}
+
+        # Se escribe en un archivo temporal y se renombra, para no dejar archivos a medio escribir
+        descriptor, ruta_temporal = tempfile.mkstemp(dir=self.directorio, suffix='.tmp')
+        with os.fdopen(descriptor, 'wb') as archivo:
+            np.savez(archivo, t=valores_t, y_aprox=valores_y, error_local=errores_locales, **estadisticas)
+        os.replace(ruta_temporal, self._ruta(clave))
+
+        self._liberar_espacio()
+
+    def _liberar_espacio(self):
+        """
+        Borra los resultados usados hace más tiempo hasta que la caché quede por debajo de tamano_maximo
+        """
+        archivos = []
+        for entrada in os.scandir(self.directorio):
+            if entrada.name.endswith('.npz'):
+                informacion = entrada.stat()
+                archivos.append((informacion.st_mtime, informacion.st_size, entrada.path))
+
+        tamano_total = sum(tamano for _, tamano, _ in archivos)
+        for _, tamano, ruta in sorted(archivos):
+            if tamano_total <= self.tamano_maximo:
+                break
+            os.remove(ruta)
+            tamano_total -= tamano
+
+    def invalidar(self, clave=None):
+        """
+        Borra un resultado de la caché, o todos si no se indica clave
+
+        :param clave: str, clave de la corrida a borrar (None para vaciar la caché)
+        """
+        if clave is not None:
+            if os.path.exists(self._ruta(clave)):
+                os.remove(self._ruta(clave))
+            return
+
+        for entrada in os.scandir(self.directorio):
+            if entrada.name.endswith('.npz'):
+                os.remove(entrada.path)
+
+    def integrar(self, metodo, t_inicial, t_final, y_inicial, f, h=None, rtol=1e-3, atol=1e-6, como_tabla=True, interpolante=False, estadisticas=False, **opciones):
+        """
+        Igual que Metodos.integrar, pero si la misma corrida ya está en la caché se devuelve sin volver a integrar. Las estadísticas
+        que se devuelven son las de la corrida original (el costo de integrar, no el de leer la caché)
+
+        :param metodo: str, nombre del método (ver Metodos.integrar)
+        :param t_inicial: float, valor inicial de t
+        :param t_final: float, valor final de t
+        :param y_inicial: float o array, valor inicial
+        :param f: función derivada del PVI
+        :param h: float, tamaño del paso (solo métodos de paso fijo)
+        :param rtol: float, tolerancia relativa (métodos adaptativos)
+        :param atol: float, tolerancia absoluta (métodos adaptativos)
+        :param como_tabla: bool, si es False se devuelven los arrays (t, y_aprox, error_local) sin armar el Resultado
+        :param interpolante: bool, no disponible: la caché solo guarda los nodos, así que True lanza ValueError
+        :param estadisticas: bool, si es True también se devuelve un objeto Estadisticas
+        :param opciones: argumentos propios del método (eps e itmax para Heun, orden y modo para ABM)
+        :return: Resultado, tabla de valores de t, y_aprox y error_local (o tupla de arrays si como_tabla es False); si se piden estadisticas, tupla con la tabla y las estadísticas
+        """
+        if interpolante:
+            raise ValueError("La caché solo guarda los nodos de la corrida: para el interpolante usar Metodos.integrar")
+
+        # Mismos metadatos que integrar: h en los métodos de paso fijo, rtol y atol en los adaptativos. Son también los únicos
+        # parámetros numéricos de la clave, pasados a float para que 0 y 0.0 (o 100 y 100.0) den la misma clave
+        metadatos = dict(h=h) if metodo in METODOS_PASO_FIJO else dict(rtol=rtol, atol=atol)
+        clave = self.clave(metodo, f, t_inicial=float(t_inicial), t_final=float(t_final), y_inicial=np.asarray(y_inicial, dtype=float),
+                           opciones=opciones, **{nombre: None if valor is None else float(valor) for nombre, valor in metadatos.items()})
+
+        resultado = self.obtener(clave)
+        if resultado is None:
+            # Las estadísticas se miden siempre, para poder devolverlas en los aciertos aunque la primera corrida no las pidiera
+            arreglos, registro = integrar(metodo, t_inicial, t_final, y_inicial, f, h=h, rtol=rtol, atol=atol, como_tabla=False, estadisticas=True, **opciones)
+            resultado = arreglos + (registro,)
+            self.guardar(clave, *resultado)
+
+        *arreglos, registro = resultado
+        if not estadisticas:
+            registro = None
+        salida = _armar_salida(*arreglos, como_tabla, metodo=metodo, estadisticas=registro, **metadatos)
+        return salida if registro is None else (salida, registro)
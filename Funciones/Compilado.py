@@ -0,0 +1,195 @@
+import time
+
+import numpy as np
+
+from Funciones.Estadisticas import Estadisticas
+from Funciones.Metodos import _malla_paso_fijo, _armar_salida, _calcular_errores_locales, runge_kutta_2_trapecio, runge_kutta_4, adam_bashforth_2_con_euler_RK1_explicito, heun
+
+# Numba es opcional: si no está instalado los métodos compilados usan las versiones de Metodos.py
+try:
+    import numba
+    from numba import types
+except ImportError:
+    numba = None
+
+NUMBA_DISPONIBLE = numba is not None
+
+def jit_opcional(funcion):
+    """
+    Decorador para las derivadas del PVI: las compila con numba.njit (con caché en disco) si Numba está instalado y si no las deja como están.
+    Las funciones sin archivo fuente (celdas de notebook, exec, stdin) se compilan sin caché, porque Numba no tiene dónde guardarla.
+    Las variables globales que use la función (por ejemplo LAMBDA) quedan fijas al momento de compilar
+
+    :param funcion: función derivada f(t, y) con t e y float
+    :return: función compilada o la misma función
+    """
+    if numba is None:
+        return funcion
+    try:
+        return numba.njit(cache=True)(funcion)
+    except RuntimeError:
+        # "cannot cache function ...: no locator available"
+        return numba.njit(funcion)
+
+# ==================== NÚCLEOS DE LOS MÉTODOS ====================
+# Cada núcleo recorre toda la malla dentro de código compilado y escribe y_aprox en valores_y (la fila 0 no se toca)
+
+# Evaluaciones de f por paso de cada núcleo, para las estadísticas (Heun suma además una por iteración del corrector)
+EVALUACIONES_POR_PASO = {'RK2': 2, 'RK4': 4, 'AB2': 1, 'Heun': 1}
+
+def _nucleo_rk2(f, valores_t, h, y_inicial, valores_y):
+    y_n = y_inicial
+    for i in range(1, len(valores_t)):
+        k1 = f(valores_t[i-1], y_n)
+        k2 = f(valores_t[i], y_n + h*k1)
+        y_n = y_n + (h/2) * (k1+k2)
+        valores_y[i] = y_n
+
+def _nucleo_rk4(f, valores_t, h, y_inicial, valores_y):
+    y_n = y_inicial
+    for i in range(1, len(valores_t)):
+        t_n = valores_t[i-1]
+        k1 = f(t_n, y_n)
+        k2 = f(t_n+h/2, y_n + (h/2)*k1)
+        k3 = f(t_n+h/2, y_n + (h/2)*k2)
+        k4 = f(t_n+h, y_n + h*k3)
+        y_n = y_n + (h/6)*(k1+2*k2+2*k3+k4)
+        valores_y[i] = y_n
+
+def _nucleo_ab2(f, valores_t, h, y_inicial, valores_y):
+    y_n = y_inicial
+    f_n_m1 = 0.0
+    for i in range(1, len(valores_t)):
+        f_n = f(valores_t[i-1], y_n)
+        if i == 1:
+            # Segundo paso inicial aproximado con Euler explícito
+            y_n = y_n + h*f_n
+        else:
+            y_n = y_n + (h/2)*(3*f_n - f_n_m1)
+        f_n_m1 = f_n
+        valores_y[i] = y_n
+
+def _nucleo_heun(f, valores_t, h, y_inicial, valores_y, eps, itmax, iteraciones):
+    y_n = y_inicial
+    for i in range(1, len(valores_t)):
+        f_n = f(valores_t[i-1], y_n)
+
+        # Predictor (Euler explícito RK1)
+        y_n_1 = y_n + h*f_n
+        e_local = abs(y_n_1 - y_n)
+
+        it = 0
+        while it <= itmax and e_local > eps:
+            # Corrector (trapecio)
+            aux_y_ant = y_n_1
+            y_n_1 = y_n + (h/2)*(f_n + f(valores_t[i], y_n_1))
+            e_local = abs(y_n_1 - aux_y_ant)
+            it += 1
+
+        iteraciones[i-1] = it
+        y_n = y_n_1
+        valores_y[i] = y_n
+
+# Los núcleos se compilan la primera vez que se usan (no al importar el módulo) y quedan en la caché de Numba en disco
+_NUCLEOS_COMPILADOS = {}
+
+def _obtener_nucleo(nucleo):
+    """
+    Función que devuelve la versión compilada de un núcleo. La derivada se recibe como tipo función de primera clase
+    float64(float64, float64), así la compilación no depende de qué derivada se use y se puede guardar en caché
+
+    :param nucleo: función núcleo en Python
+    :return: núcleo compilado con numba
+    """
+    if nucleo not in _NUCLEOS_COMPILADOS:
+        tipo_f = types.FunctionType(types.float64(types.float64, types.float64))
+        argumentos = (tipo_f, types.float64[::1], types.float64, types.float64, types.float64[::1])
+        if nucleo is _nucleo_heun:
+            argumentos += (types.float64, types.int64, types.int64[::1])
+        _NUCLEOS_COMPILADOS[nucleo] = numba.njit(types.void(*argumentos), cache=True)(nucleo)
+
+    return _NUCLEOS_COMPILADOS[nucleo]
+
+def _se_puede_compilar(f, y_inicial):
+    """
+    Función que decide si se usa el camino compilado: hace falta Numba, una derivada compilada con njit y un PVI escalar
+
+    :param f: función derivada del PVI
+    :param y_inicial: float o array, valor inicial
+    :return: bool
+    """
+    return numba is not None and isinstance(f, numba.core.registry.CPUDispatcher) and np.ndim(y_inicial) == 0
+
+def _integrar_compilado(nucleo, metodo, t_inicial, t_final, h, y_inicial, f, como_tabla, estadisticas, *opciones):
+    """
+    Función que ejecuta un núcleo compilado sobre la misma malla que los métodos de Metodos.py y arma la misma salida, con los
+    mismos metadatos y estadísticas (las evaluaciones de f se cuentan por paso, porque dentro del núcleo no se puede envolver f)
+
+    :param nucleo: función núcleo en Python
+    :param metodo: str, nombre del método en Metodos.py ('RK2', 'RK4', 'AB2' o 'Heun')
+    :param estadisticas: bool, si es True también se devuelve un objeto Estadisticas
+    :param opciones: argumentos extra del núcleo (eps e itmax para Heun)
+    :return: Resultado, tabla de valores de t, y_aprox y error_local (o tupla de arrays si como_tabla es False); si se piden estadisticas, tupla con la tabla y las estadísticas
+    """
+    valores_t = _malla_paso_fijo(t_inicial, t_final, h).astype(float)
+    valores_y = np.empty(len(valores_t))
+    valores_y[0] = np.nan
+    pasos = len(valores_t) - 1
+    if metodo == 'Heun':
+        opciones += (np.zeros(pasos, dtype=np.int64),)
+
+    nucleo_compilado = _obtener_nucleo(nucleo)
+    inicio = time.perf_counter()
+    nucleo_compilado(f, valores_t, float(h), float(y_inicial), valores_y, *opciones)
+
+    registro = None
+    if estadisticas:
+        registro = Estadisticas(metodo, tiempo_pared=time.perf_counter() - inicio, pasos_aceptados=pasos)
+        registro.evaluaciones_f = EVALUACIONES_POR_PASO[metodo] * pasos
+        if metodo == 'Heun':
+            registro.iteraciones_corrector = opciones[-1]
+            registro.evaluaciones_f += int(opciones[-1].sum())
+
+    salida = _armar_salida(valores_t, valores_y, _calcular_errores_locales(valores_y, y_inicial), como_tabla,
+                           metodo=metodo, h=h, estadisticas=registro)
+    return salida if registro is None else (salida, registro)
+
+def runge_kutta_2_trapecio_compilado(t_inicial, t_final, h, y_inicial, f, como_tabla=True, estadisticas=False):
+    """
+    Versión compilada de runge_kutta_2_trapecio. Si Numba no está instalado, f no está compilada con njit o el PVI no es escalar, se usa la versión de Metodos.py
+    :parametros t_inicial: float, valor inicial de t, t_final: float, valor final de t (valor a aproximar), h: float, tamaño del paso, y_inicial: float, valor inicial para el primer paso, f: función derivada del PVI (idealmente decorada con jit_opcional), como_tabla: bool, si es False se devuelven los arrays (t, y_aprox, error_local) sin armar el Resultado, estadisticas: bool, si es True también se devuelve un objeto Estadisticas (tiempo, evaluaciones de f, pasos)
+    :return: Resultado, tabla de valores de t, y_aprox y error_local (si se piden estadisticas, tupla con la tabla y las estadísticas)
+    """
+    if not _se_puede_compilar(f, y_inicial):
+        return runge_kutta_2_trapecio(t_inicial, t_final, h, y_inicial, f, como_tabla, estadisticas=estadisticas)
+    return _integrar_compilado(_nucleo_rk2, 'RK2', t_inicial, t_final, h, y_inicial, f, como_tabla, estadisticas)
+
+def runge_kutta_4_compilado(t_inicial, t_final, h, y_inicial, f, como_tabla=True, estadisticas=False):
+    """
+    Versión compilada de runge_kutta_4. Si Numba no está instalado, f no está compilada con njit o el PVI no es escalar, se usa la versión de Metodos.py
+    :parametros t_inicial: float, valor inicial de t, t_final: float, valor final de t (valor a aproximar), h: float, tamaño del paso, y_inicial: float, valor inicial para el primer paso, f: función derivada del PVI (idealmente decorada con jit_opcional), como_tabla: bool, si es False se devuelven los arrays (t, y_aprox, error_local) sin armar el Resultado, estadisticas: bool, si es True también se devuelve un objeto Estadisticas (tiempo, evaluaciones de f, pasos)
+    :return: Resultado, tabla de valores de t, y_aprox y error_local (si se piden estadisticas, tupla con la tabla y las estadísticas)
+    """
+    if not _se_puede_compilar(f, y_inicial):
+        return runge_kutta_4(t_inicial, t_final, h, y_inicial, f, como_tabla, estadisticas=estadisticas)
+    return _integrar_compilado(_nucleo_rk4, 'RK4', t_inicial, t_final, h, y_inicial, f, como_tabla, estadisticas)
+
+def adam_bashforth_2_compilado(t_inicial, t_final, h, y_inicial, f, como_tabla=True, estadisticas=False):
+    """
+    Versión compilada de adam_bashforth_2_con_euler_RK1_explicito. Si Numba no está instalado, f no está compilada con njit o el PVI no es escalar, se usa la versión de Metodos.py
+    :parametros t_inicial: float, valor inicial de t, t_final: float, valor final de t (valor a aproximar), h: float, tamaño del paso, y_inicial: float, valor inicial para el primer paso, f: función derivada del PVI (idealmente decorada con jit_opcional), como_tabla: bool, si es False se devuelven los arrays (t, y_aprox, error_local) sin armar el Resultado, estadisticas: bool, si es True también se devuelve un objeto Estadisticas (tiempo, evaluaciones de f, pasos)
+    :return: Resultado, tabla de valores de t, y_aprox y error_local (si se piden estadisticas, tupla con la tabla y las estadísticas)
+    """
+    if not _se_puede_compilar(f, y_inicial):
+        return adam_bashforth_2_con_euler_RK1_explicito(t_inicial, t_final, h, y_inicial, f, como_tabla, estadisticas=estadisticas)
+    return _integrar_compilado(_nucleo_ab2, 'AB2', t_inicial, t_final, h, y_inicial, f, como_tabla, estadisticas)
+
+def heun_compilado(t_inicial, t_final, h, y_inicial, f, eps, itmax, como_tabla=True, estadisticas=False):
+    """
+    Versión compilada de heun (predictor y bucle corrector dentro del código compilado). Si Numba no está instalado, f no está compilada con njit o el PVI no es escalar, se usa la versión de Metodos.py
+    :parametros t_inicial: float, valor inicial de t, t_final: float, valor final de t (valor a aproximar), h: float, tamaño del paso, y_inicial: float, valor inicial para el primer paso, f: función derivada del PVI (idealmente decorada con jit_opcional), eps: float, tolerancia del corrector, itmax: int, cantidad máxima de iteraciones del corrector, como_tabla: bool, si es False se devuelven los arrays (t, y_aprox, error_local) sin armar el Resultado, estadisticas: bool, si es True también se devuelve un objeto Estadisticas (tiempo, evaluaciones de f, pasos e iteraciones del corrector en cada paso)
+    :return: Resultado, tabla de valores de t, y_aprox y error_local (si se piden estadisticas, tupla con la tabla y las estadísticas)
+    """
+    if not _se_puede_compilar(f, y_inicial):
+        return heun(t_inicial, t_final, h, y_inicial, f, eps, itmax, como_tabla, estadisticas=estadisticas)
+    return _integrar_compilado(_nucleo_heun, 'Heun', t_inicial, t_final, h, y_inicial, f, como_tabla, estadisticas, float(eps), int(itmax))
@@ -14,6 +14,11 @@ y0 = 1.0 #La concentración de C14 en el tiempo t=0 (al morir el organismo) se t
 
 T_INICIAL = 0 # años
 T_FINAL = int(-np.log(R_REMANENTE) / LAMBDA)  # Pues sabemos que la concentración final es el 14.5%, despejando t en la fórmula de desintegración radiactiva (años)
+# Para modelos sin fórmula inversa, el tiempo se obtiene numéricamente con calcular_tiempo_para_valor (Metodos.py)
+
+# Incertidumbres (1 sigma) de las entradas, para la propagación Monte Carlo de Incertidumbre.py
+T_HALF_SIGMA = 40.0  # años (vida media de Cambridge: 5730 ± 40)
+R_REMANENTE_SIGMA = 0.002  # incertidumbre de la medición de la fracción remanente
 
 # Valores de h para pruebas con distintos tamaños de paso
 VALORES_H = [5000, 3000, 1000, 100, 10]
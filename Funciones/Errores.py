@@ -4,7 +4,7 @@ def calcular_y_reales(tabla_valores, f):
     """
     Función que calcula los valores de y_real para una tabla de valores de un método de acuerdo con la solución exacta del PVI
 
-    :parametros tabla_valores: DataFrame con columnas t, y_aprox y error_local, f: función que representa la solución exacta del PVI
+    :parametros tabla_valores: DataFrame o Resultado con columnas t, y_aprox y error_local, f: función que representa la solución exacta del PVI
     :return: DataFrame, tabla de valores de t, y_real, y_aprox y error_local
     """
     tabla_valores['y_real'] = f(tabla_valores['t'])
@@ -13,7 +13,161 @@ def calcular_error_global(tabla_valores):
     """
     Función que calcula error global de una tabla de valores y lo agrega a la tabla
 
-    :parametros tabla_valores: DataFrame con columnas t, y_real, y_aprox y error_local
+    :parametros tabla_valores: DataFrame o Resultado con columnas t, y_real, y_aprox y error_local
     :return: DataFrame, tabla de valores de t, y_real, y_aprox, error_global y error_local
     """
-    tabla_valores['error_global'] = np.abs(tabla_valores['y_aprox'] - tabla_valores['y_real'])
\ No newline at end of file
+    tabla_valores['error_global'] = np.abs(tabla_valores['y_aprox'] - tabla_valores['y_real'])
+
+# ==================== ANÁLISIS DE VARIAS CORRIDAS A LA VEZ ====================
+# Las funciones siguientes no modifican tablas: trabajan sobre arrays de todas las corridas juntas
+
+def evaluar_exacta_en_union(valores_t, exacta):
+    """
+    Función que evalúa la solución exacta una sola vez sobre la unión de las mallas de varias corridas (por ejemplo de scipy,
+    con mallas distintas) y reparte el resultado a cada fila
+
+    :parametros valores_t: array (L,), t de todas las filas concatenadas, exacta: función solución exacta y(t) vectorizada
+    :return: array (L,), o (L, N) si la solución es un sistema
+    """
+    t_unicos, inversa = np.unique(np.asarray(valores_t, dtype=float), return_inverse=True)
+    return np.asarray(exacta(t_unicos))[inversa]
+
+def calcular_errores_globales(corridas, exacta):
+    """
+    Función que calcula el error global de varias corridas, con mallas iguales o distintas, evaluando la solución exacta una sola vez
+
+    :parametros corridas: dict {clave: (t, y_aprox, ...)}, por ejemplo salidas de los métodos con como_tabla=False, exacta: función solución exacta y(t) vectorizada
+    :return: dict {clave: array de error global con la forma de y_aprox}
+    """
+    claves = list(corridas)
+    tiempos = [np.asarray(corridas[clave][0], dtype=float) for clave in claves]
+    y_real = evaluar_exacta_en_union(np.concatenate(tiempos), exacta)
+    y_aprox = np.concatenate([np.reshape(corridas[clave][1], (len(t),) + y_real.shape[1:]) for clave, t in zip(claves, tiempos)])
+
+    errores = np.abs(y_aprox - y_real)
+    return dict(zip(claves, np.split(errores, np.cumsum([len(t) for t in tiempos])[:-1])))
+
+def _normas_por_segmento(valores_t, maximos, cuadrados, validos, inicios):
+    """
+    Función que calcula las normas del error de varias corridas concatenadas, con una sola pasada de np.ufunc.reduceat
+
+    :parametros valores_t: array (P,), t de cada punto, maximos: array (P,), máximo del error entre componentes en cada punto, cuadrados: array (P,), suma de los errores al cuadrado en cada punto (0 si no hay error), validos: array (P,), cantidad de errores no NaN en cada punto, inicios: array (R,), índice del primer punto de cada corrida
+    :return: dict con arrays (R,) error_max, error_rms y error_l2
+    """
+    # Norma L2 en el tiempo con la regla del trapecio, sin mezclar el último punto de una corrida con el primero de la siguiente
+    aportes = np.zeros(len(valores_t))
+    aportes[:-1] = np.diff(valores_t) * (cuadrados[:-1] + cuadrados[1:]) / 2
+    aportes[inicios[1:] - 1] = 0.0
+
+    return {
+        'error_max': np.fmax.reduceat(maximos, inicios),
+        'error_rms': np.sqrt(np.add.reduceat(cuadrados, inicios) / np.add.reduceat(validos, inicios)),
+        'error_l2': np.sqrt(np.add.reduceat(aportes, inicios)),
+    }
+
+def normas_error(valores_t, errores, sistema=False):
+    """
+    Función que calcula las normas máxima, RMS y L2 (en el tiempo) del error de un conjunto de corridas apiladas sobre la misma malla,
+    por ejemplo la salida de integrar_conjunto. Los NaN (la primera fila de los métodos de paso fijo) se ignoran en la máxima y la RMS
+    y cuentan como error 0 en la L2
+
+    :parametros valores_t: array (pasos,), malla común, errores: array (pasos,) o (pasos, M) (o (pasos, M, N) / (pasos, N) si sistema es True) con el error global de cada corrida, sistema: bool, si el último eje son las componentes de un sistema (se combinan en la norma)
+    :return: dict con error_max, error_rms y error_l2, cada uno con la forma de errores sin el eje del tiempo (ni el de las componentes)
+    """
+    errores = np.abs(np.asarray(errores, dtype=float))
+    forma = errores.shape[1:-1] if sistema else errores.shape[1:]
+    errores = errores.reshape(len(errores), -1, errores.shape[-1] if sistema else 1)
+
+    # Se trata a cada corrida como un segmento de una malla concatenada
+    n_corridas = errores.shape[1]
+    por_corrida = np.swapaxes(errores, 0, 1).reshape(n_corridas*len(valores_t), -1)
+    normas = _normas_por_segmento(np.tile(np.asarray(valores_t, dtype=float), n_corridas),
+                                  np.fmax.reduce(por_corrida, axis=1), np.nansum(por_corrida**2, axis=1),
+                                  np.sum(~np.isnan(por_corrida), axis=1), np.arange(n_corridas)*len(valores_t))
+
+    return {nombre: valores.reshape(forma) for nombre, valores in normas.items()}
+
+def orden_convergencia(valores_h, errores):
+    """
+    Función que calcula el orden de convergencia observado entre pasos sucesivos: p = log(e_i / e_i-1) / log(h_i / h_i-1), ordenando los h de mayor a menor
+
+    :parametros valores_h: array (H,), tamaños de paso, errores: array (H,) o (H, ...), norma del error con cada h
+    :return: array con la forma de errores; el h más grande queda con NaN
+    """
+    valores_h = np.asarray(valores_h, dtype=float)
+    errores = np.asarray(errores, dtype=float)
+    orden = np.argsort(-valores_h, kind='stable')
+    h, e = valores_h[orden], errores[orden]
+
+    ordenes = np.full(errores.shape, np.nan)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        cocientes_h = np.log(h[1:] / h[:-1]).reshape((-1,) + (1,)*(errores.ndim-1))
+        ordenes[orden[1:]] = np.log(e[1:] / e[:-1]) / cocientes_h
+
+    return ordenes
+
+def analizar_corridas(tabla, exacta=None, columnas_corrida=('configuracion',), norma_orden='error_max'):
+    """
+    Función que analiza todas las corridas de una tabla larga (por ejemplo la de Barrido.ejecutar_barrido) en una sola pasada
+    vectorizada: error global, normas máxima, RMS y L2 de cada corrida y orden de convergencia observado entre h sucesivos
+
+    :parametros tabla: DataFrame largo con columnas t e y_aprox, opcionalmente componente (sistemas), y_real, problema, metodo, h, rtol y atol. No se modifica
+                exacta: función solución exacta y(t), o dict {problema: función}; si es None se usa la columna y_real de la tabla
+                columnas_corrida: columnas que identifican cada corrida
+                norma_orden: str, norma con la que se calcula el orden ('error_max', 'error_rms' o 'error_l2')
+    :return: DataFrame con una fila por corrida: columnas de la corrida (y las de configuración presentes), n_puntos, error_max, error_rms, error_l2 y orden_observado
+    """
+    import pandas as pd
+
+    columnas_corrida = list(columnas_corrida)
+    codigos = tabla.groupby(columnas_corrida, sort=False).ngroup().to_numpy()
+    valores_t = tabla['t'].to_numpy(dtype=float)
+    componentes = tabla['componente'].to_numpy() if 'componente' in tabla else np.zeros(len(tabla), dtype=int)
+
+    # Filas ordenadas por corrida, t y componente (en las tablas del barrido ya lo están y el orden estable no las mueve)
+    orden = np.lexsort((componentes, valores_t, codigos))
+    codigos, valores_t, componentes = codigos[orden], valores_t[orden], componentes[orden]
+    y_aprox = tabla['y_aprox'].to_numpy(dtype=float)[orden]
+
+    if exacta is None:
+        y_real = tabla['y_real'].to_numpy(dtype=float)[orden]
+    else:
+        y_real = np.empty(len(tabla))
+        problemas = tabla['problema'].to_numpy()[orden] if isinstance(exacta, dict) else np.zeros(len(tabla))
+        for problema in pd.unique(problemas):
+            filas = problemas == problema
+            funcion = exacta[problema] if isinstance(exacta, dict) else exacta
+            valores = evaluar_exacta_en_union(valores_t[filas], funcion)
+            y_real[filas] = valores if valores.ndim == 1 else valores[np.arange(len(valores)), componentes[filas]]
+
+    errores = np.abs(y_aprox - y_real)
+
+    # Cada punto (corrida, t) agrupa sus componentes
+    nuevo_punto = np.ones(len(errores), dtype=bool)
+    nuevo_punto[1:] = (codigos[1:] != codigos[:-1]) | (valores_t[1:] != valores_t[:-1])
+    inicios_punto = np.flatnonzero(nuevo_punto)
+    codigos_punto = codigos[inicios_punto]
+    inicios_corrida = np.flatnonzero(np.r_[True, codigos_punto[1:] != codigos_punto[:-1]])
+
+    normas = _normas_por_segmento(valores_t[inicios_punto], np.fmax.reduceat(errores, inicios_punto),
+                                  np.add.reduceat(np.nan_to_num(errores**2), inicios_punto),
+                                  np.add.reduceat(~np.isnan(errores), inicios_punto), inicios_corrida)
+
+    # Una fila por corrida con sus columnas de configuración
+    columnas = columnas_corrida + [c for c in ('problema', 'metodo', 'h', 'rtol', 'atol') if c in tabla and c not in columnas_corrida]
+    resumen = tabla[columnas].iloc[orden[inicios_punto[inicios_corrida]]].reset_index(drop=True)
+    resumen['n_puntos'] = np.diff(np.r_[inicios_corrida, len(inicios_punto)])
+    for nombre, valores in normas.items():
+        resumen[nombre] = valores
+
+    # Orden observado entre h sucesivos de un mismo problema y método (NaN en las corridas adaptativas, sin h)
+    resumen['orden_observado'] = np.nan
+    if 'h' in resumen:
+        grupos = [c for c in ('problema', 'metodo') if c in resumen]
+        ordenado = resumen[resumen['h'].notna()].sort_values(grupos + ['h'], ascending=[True]*len(grupos) + [False])
+        anterior = ordenado.groupby(grupos, sort=False)[['h', norma_orden]].shift() if grupos else ordenado[['h', norma_orden]].shift()
+        with np.errstate(divide='ignore', invalid='ignore'):
+            resumen.loc[ordenado.index, 'orden_observado'] = (np.log(ordenado[norma_orden] / anterior[norma_orden])
+                                                              / np.log(ordenado['h'] / anterior['h']))
+
+    return resumen
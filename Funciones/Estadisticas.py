@@ -0,0 +1,50 @@
+from dataclasses import dataclass, asdict
+from typing import Optional
+
+import numpy as np
+
+@dataclass
+class Estadisticas:
+    """
+    Costo de una corrida de integración. Los campos que un método no informa quedan en None
+    """
+    metodo: str
+    tiempo_pared: float = 0.0  # segundos
+    evaluaciones_f: int = 0
+    pasos_aceptados: int = 0
+    pasos_rechazados: Optional[int] = 0
+    iteraciones_corrector: Optional[np.ndarray] = None  # Heun: iteraciones del corrector en cada paso; implícitos: iteraciones de Newton
+    evaluaciones_jacobiano: Optional[int] = None  # implícitos y scipy (njev)
+    factorizaciones_lu: Optional[int] = None  # implícitos y scipy (nlu)
+
+    def __getitem__(self, campo):
+        # Compatibilidad con el dict que devolvía antes runge_kutta_adaptativo (info['pasos_aceptados'])
+        return getattr(self, campo)
+
+    def como_dict(self):
+        """
+        Devuelve las estadísticas como dict de valores simples (para tablas o JSON). Las iteraciones del corrector se resumen en total y máximo
+
+        :return: dict
+        """
+        valores = asdict(self)
+        iteraciones = valores.pop('iteraciones_corrector')
+        valores['iteraciones_corrector_total'] = None if iteraciones is None else int(np.sum(iteraciones))
+        valores['iteraciones_corrector_max'] = None if iteraciones is None or len(iteraciones) == 0 else int(np.max(iteraciones))
+        return valores
+
+class ContadorEvaluaciones:
+    """
+    Envoltura de la derivada del PVI que cuenta cuántas veces se evalúa
+    """
+
+    def __init__(self, f):
+        """
+        :param f: función derivada del PVI
+        """
+        self.f = f
+        self.evaluaciones = 0
+
+    def __call__(self, t, y):
+        self.evaluaciones += 1
+        return self.f(t, y)
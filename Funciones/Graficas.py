@@ -1,6 +1,23 @@
-import matplotlib.pyplot as plt
+import sys
+
 import numpy as np
 
+from Funciones.Metodos import METODOS_SCIPY
+
+# matplotlib se importa dentro de las funciones que dibujan: importar el módulo (por ejemplo solo para diezmar) no lo carga
+
+# Colores de cada método, los mismos de las figuras de comparación de siempre
+COLORES_METODOS = {'RK2': 'red', 'RK4': 'blue', 'AB2': 'green', 'Heun': 'purple', 'RK45': 'orange', 'RK23': 'cyan',
+                   'DOP853': 'brown', 'Radau': 'pink', 'BDF': 'gray', 'LSODA': 'olive'}
+
+# Paneles que puede tener una figura de comparación: los de método van uno por método, los demás ocupan una fila entera
+PANELES_POR_METODO = ('solucion', 'error_local')
+PANELES_COMBINADOS = ('error_global', 'error_global_log')
+
+# Puntos por serie a partir de los cuales se diezma, y hasta los que se dibujan marcadores
+MAX_PUNTOS = 2000
+MAX_PUNTOS_CON_MARCADOR = 200
+
 def graficar_solucion_exacta(valores_t, valores_y, titulo="Solución exacta"):
     """
     Grafica la solución exacta del problema
@@ -10,6 +27,8 @@ def graficar_solucion_exacta(valores_t, valores_y, titulo="Solución exacta"):
     :param titulo: str, título del gráfico
     :return: figura de matplotlib
     """
+    import matplotlib.pyplot as plt
+
     plt.figure(figsize=(10,5),facecolor='w')
     plt.plot(valores_t, valores_y, label=titulo)
     plt.xlabel('Tiempo (años)')
@@ -18,6 +37,154 @@ def graficar_solucion_exacta(valores_t, valores_y, titulo="Solución exacta"):
     plt.legend()
     plt.show()
 
+def diezmar(valores_t, valores_y, max_puntos=MAX_PUNTOS):
+    """
+    Reduce una serie larga para graficarla sin perder su forma: se divide el eje t en max_puntos/2 cubetas (del orden de un
+    píxel cada una) y de cada cubeta se conservan el mínimo y el máximo de y (envolvente), además del primer y el último punto
+
+    :param valores_t: array (n,), valores de t ordenados
+    :param valores_y: array (n,), valores de y (los NaN se ignoran al buscar los extremos)
+    :param max_puntos: int, cantidad de puntos a partir de la cual se diezma
+    :return: tupla (t, y) con a lo sumo max_puntos + 2 puntos, en orden
+    """
+    valores_t = np.asarray(valores_t, dtype=float)
+    valores_y = np.asarray(valores_y, dtype=float)
+    n = len(valores_t)
+    if n <= max_puntos or valores_t[-1] == valores_t[0]:
+        return valores_t, valores_y
+
+    n_cubetas = max(max_puntos // 2, 1)
+    cubetas = np.minimum(((valores_t - valores_t[0]) / (valores_t[-1] - valores_t[0]) * n_cubetas).astype(np.int64), n_cubetas - 1)
+    inicios = np.flatnonzero(np.r_[True, cubetas[1:] != cubetas[:-1]])
+    largos = np.diff(np.r_[inicios, n])
+
+    indices = [np.array([0, n - 1])]
+    for reduccion in (np.fmin, np.fmax):
+        # Primer índice de cada cubeta donde se alcanza el extremo
+        extremos = np.repeat(reduccion.reduceat(valores_y, inicios), largos)
+        candidatos = np.flatnonzero(valores_y == extremos)
+        _, primeros = np.unique(cubetas[candidatos], return_index=True)
+        indices.append(candidatos[primeros])
+
+    indices = np.unique(np.concatenate(indices))
+    return valores_t[indices], valores_y[indices]
+
+def _normalizar_resultados(resultados):
+    """Convierte un dict {nombre: tabla} o una lista de pares (nombre, tabla) en una lista de pares"""
+    return list(resultados.items()) if isinstance(resultados, dict) else list(resultados)
+
+def _graficar_serie(ax, valores_t, valores_y, max_puntos, **estilo):
+    """Grafica una serie diezmada; los marcadores solo se dibujan si quedan pocos puntos"""
+    valores_t, valores_y = diezmar(valores_t, valores_y, max_puntos)
+    if len(valores_t) > MAX_PUNTOS_CON_MARCADOR:
+        estilo.pop('marker', None)
+    ax.plot(valores_t, valores_y, **estilo)
+
+def _nueva_figura(figsize, archivo):
+    """
+    Crea la figura: con archivo se usa una Figure suelta sobre el backend Agg (no pasa por pyplot, sirve para generar reportes
+    en lote sin pantalla); sin archivo se crea con pyplot, para poder mostrarla con plt.show() en los notebooks
+    """
+    if archivo is None:
+        import matplotlib.pyplot as plt
+        return plt.figure(figsize=figsize, facecolor='w')
+
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+
+    figura = Figure(figsize=figsize, facecolor='w')
+    FigureCanvasAgg(figura)
+    return figura
+
+def guardar_figura(figura, archivo, dpi=100):
+    """
+    Exporta una figura a archivo (el formato sale de la extensión) y, si la maneja pyplot, la cierra para liberar memoria
+
+    :param figura: figura de matplotlib
+    :param archivo: str, ruta del archivo
+    :param dpi: int, resolución
+    """
+    figura.savefig(archivo, dpi=dpi, facecolor='w')
+    # Si pyplot no se importó, la figura no puede ser suya
+    plt = sys.modules.get('matplotlib.pyplot')
+    if plt is not None and plt.fignum_exists(getattr(figura, 'number', -1)):
+        plt.close(figura)
+
+def _panel_metodo(ax, panel, nombre, tabla, valores_t, valores_solucion_exacta, titulo_paso, color, max_puntos, marker='o'):
+    """Dibuja un panel de un método: 'solucion' (con la solución exacta, si se pasó) o 'error_local'"""
+    if panel == 'solucion':
+        ax.set_title("Comparativa de valores reales \n con aproximados {}{}".format(nombre, titulo_paso))
+        if valores_t is not None:
+            ax.plot(valores_t, valores_solucion_exacta, label="Solución exacta")
+        _graficar_serie(ax, tabla['t'], tabla['y_aprox'], max_puntos, label=nombre, marker=marker, color=color)
+    else:
+        ax.set_title("Errores locales {}{}".format(nombre, titulo_paso))
+        _graficar_serie(ax, tabla['t'], tabla['error_local'], max_puntos, label=nombre, marker=marker, color=color)
+    ax.grid()
+    ax.legend()
+
+def _panel_combinado(ax, resultados, columna, titulo, colores, max_puntos, log=False, marcadores=None):
+    """Dibuja una columna de todos los métodos en un mismo panel; marcadores es un dict {nombre: marcador} (por defecto 'o')"""
+    ax.set_title(titulo)
+    if log:
+        ax.set_yscale('log')
+    for nombre, tabla in resultados:
+        marker = 'o' if marcadores is None else marcadores.get(nombre, 'o')
+        _graficar_serie(ax, tabla['t'], tabla[columna], max_puntos, label=nombre, marker=marker, color=colores.get(nombre))
+    ax.grid()
+    ax.legend()
+
+def crear_figura_comparacion(resultados, valores_t=None, valores_solucion_exacta=None, paneles=('solucion', 'error_global', 'error_global_log', 'error_local'),
+                             columnas=5, titulo_paso='', colores=None, max_puntos=MAX_PUNTOS, archivo=None, dpi=100):
+    """
+    Crea una figura de comparación de varios métodos con los paneles pedidos. Solo se crean los subplots de esos paneles y las
+    series largas se diezman (envolvente mínimo/máximo), así que el costo no crece con la cantidad de pasos
+
+    :param resultados: dict {nombre del método: tabla} o lista de pares (nombre, tabla); cada tabla tiene columnas t, y_aprox,
+                       error_global y error_local (las que usen los paneles pedidos)
+    :param valores_t: array, valores de t para la solución exacta (opcional)
+    :param valores_solucion_exacta: array, valores de y para la solución exacta (opcional)
+    :param paneles: tupla con 'solucion' y 'error_local' (un subplot por método) y 'error_global' y 'error_global_log' (un subplot
+                    con todos los métodos, en escala lineal y logarítmica)
+    :param columnas: int, subplots por fila
+    :param titulo_paso: str, texto que se agrega a los títulos (por ejemplo ' (h=100)')
+    :param colores: dict {nombre: color}; por defecto COLORES_METODOS
+    :param max_puntos: int, puntos por serie a partir de los cuales se diezma
+    :param archivo: str, si se indica la figura se genera con el backend Agg y se guarda en ese archivo
+    :param dpi: int, resolución del archivo
+    :return: figura de matplotlib
+    """
+    resultados = _normalizar_resultados(resultados)
+    colores = COLORES_METODOS if colores is None else colores
+    invalidos = set(paneles) - set(PANELES_POR_METODO) - set(PANELES_COMBINADOS)
+    if invalidos:
+        raise ValueError("Paneles no disponibles: {}".format(sorted(invalidos)))
+
+    # Filas que ocupa cada panel, en el orden pedido
+    filas = [(panel, -(-len(resultados) // columnas) if panel in PANELES_POR_METODO else 1) for panel in paneles]
+    n_filas = max(sum(n for _, n in filas), 1)
+    ancho, alto = 5*columnas, 5*n_filas
+    figura = _nueva_figura((ancho, alto), archivo)
+    # Márgenes fijos en pulgadas en lugar de tight_layout, que vuelve a medir todos los textos y con muchos subplots tarda más que dibujarlos
+    gs = figura.add_gridspec(n_filas, columnas, left=0.9/ancho, right=1 - 0.2/ancho, bottom=0.4/alto, top=1 - 0.7/alto, wspace=0.25, hspace=0.45)
+
+    fila = 0
+    for panel, n in filas:
+        if panel in PANELES_COMBINADOS:
+            escala = 'logarítmica' if panel == 'error_global_log' else 'lineal'
+            _panel_combinado(figura.add_subplot(gs[fila, :]), resultados, 'error_global',
+                             "Comparativa de errores globales (escala {}){}".format(escala, titulo_paso), colores, max_puntos,
+                             log=panel == 'error_global_log')
+        else:
+            for i, (nombre, tabla) in enumerate(resultados):
+                _panel_metodo(figura.add_subplot(gs[fila + i // columnas, i % columnas]), panel, nombre, tabla, valores_t,
+                              valores_solucion_exacta, titulo_paso, colores.get(nombre), max_puntos)
+        fila += n
+
+    if archivo is not None:
+        guardar_figura(figura, archivo, dpi=dpi)
+    return figura
+
 def crear_figura_completa_comparacion(h, valores_t, valores_solucion_exacta,
                                       tabla_valores_1_rk2, tabla_valores_1_rk4, 
                                       tabla_valores_1_ab2, tabla_valores_1_heun,
@@ -25,7 +192,8 @@ def crear_figura_completa_comparacion(h, valores_t, valores_solucion_exacta,
                                       tabla_valores_1_dop853, tabla_valores_1_radau,
                                       tabla_valores_1_bdf, tabla_valores_1_lsoda):
     """
-    Crea una figura completa con todos los subplots de comparación para un valor de h dado
+    Crea una figura completa con todos los subplots de comparación para un valor de h dado (la grilla de 4x5 de los notebooks, armada con los
+    mismos paneles que crear_figura_comparacion)
     
     :param h: float, tamaño de paso
     :param valores_t: array, valores de t para la solución exacta
@@ -42,147 +210,32 @@ def crear_figura_completa_comparacion(h, valores_t, valores_solucion_exacta,
     :param tabla_valores_1_lsoda: DataFrame con resultados de LSODA (scipy)
     :return: figura de matplotlib
     """
-    figura = plt.figure(figsize=(25,20),facecolor='w')
-    gs = figura.add_gridspec(4,5)
-
-    # Subplots que muestran la gráfica de la solución exacta y las aproximaciones de RK2, RK4, AB2 y Heun
-    ax11 = figura.add_subplot(gs[0,0])
-    ax11.set_title("Comparativa de valores reales \n con aproximados RK2 (h={})".format(h))
-    ax11.plot(valores_t, valores_solucion_exacta, label="Solución exacta")
-    ax11.plot(tabla_valores_1_rk2['t'], tabla_valores_1_rk2['y_aprox'], label="RK2",marker='o',color='red')
-    ax11.grid()
-    ax11.legend()
-
-    ax12 = figura.add_subplot(gs[0,1])
-    ax12.set_title("Comparativa de valores reales \n con aproximados RK4 (h={})".format(h))
-    ax12.plot(valores_t, valores_solucion_exacta, label="Solución exacta")
-    ax12.plot(tabla_valores_1_rk4['t'], tabla_valores_1_rk4['y_aprox'], label="RK4",marker='o',color='blue')
-    ax12.grid()
-    ax12.legend()
-
-    ax13 = figura.add_subplot(gs[0,2])
-    ax13.set_title("Comparativa de valores reales \n con aproximados AB2 (h={})".format(h))
-    ax13.plot(valores_t, valores_solucion_exacta, label="Solución exacta")
-    ax13.plot(tabla_valores_1_ab2['t'], tabla_valores_1_ab2['y_aprox'], label="AB2",marker='o',color='green')
-    ax13.grid()
-    ax13.legend()
-
-    ax14 = figura.add_subplot(gs[0,3])
-    ax14.set_title("Comparativa de valores reales \ncon aproximados Heun (h={})".format(h))
-    ax14.plot(valores_t, valores_solucion_exacta, label="Solución exacta")
-    ax14.plot(tabla_valores_1_heun['t'], tabla_valores_1_heun['y_aprox'], label="Heun",marker='o',color='purple')
-    ax14.grid()
-    ax14.legend()
-
-    # Subplots para métodos de scipy
-    ax15 = figura.add_subplot(gs[0,4])
-    ax15.set_title("Comparativa de valores reales \ncon aproximados RK45".format(h))
-    ax15.plot(valores_t, valores_solucion_exacta, label="Solución exacta")
-    ax15.plot(tabla_valores_1_rk45['t'], tabla_valores_1_rk45['y_aprox'], label="RK45",marker='o',color='orange')
-    ax15.grid()
-    ax15.legend()
-
-    ax16 = figura.add_subplot(gs[1,0])
-    ax16.set_title("Comparativa de valores reales \ncon aproximados RK23".format(h))
-    ax16.plot(valores_t, valores_solucion_exacta, label="Solución exacta")
-    ax16.plot(tabla_valores_1_rk23['t'], tabla_valores_1_rk23['y_aprox'], label="RK23",marker='o',color='cyan')
-    ax16.grid()
-    ax16.legend()
-
-    ax17 = figura.add_subplot(gs[1,1])
-    ax17.set_title("Comparativa de valores reales \ncon aproximados DOP853".format(h))
-    ax17.plot(valores_t, valores_solucion_exacta, label="Solución exacta")
-    ax17.plot(tabla_valores_1_dop853['t'], tabla_valores_1_dop853['y_aprox'], label="DOP853",marker='o',color='brown')
-    ax17.grid()
-    ax17.legend()
-
-    ax18 = figura.add_subplot(gs[1,2])
-    ax18.set_title("Comparativa de valores reales \ncon aproximados Radau".format(h))
-    ax18.plot(valores_t, valores_solucion_exacta, label="Solución exacta")
-    ax18.plot(tabla_valores_1_radau['t'], tabla_valores_1_radau['y_aprox'], label="Radau",marker='o',color='pink')
-    ax18.grid()
-    ax18.legend()
-
-    ax19 = figura.add_subplot(gs[1,3])
-    ax19.set_title("Comparativa de valores reales \ncon aproximados BDF".format(h))
-    ax19.plot(valores_t, valores_solucion_exacta, label="Solución exacta")
-    ax19.plot(tabla_valores_1_bdf['t'], tabla_valores_1_bdf['y_aprox'], label="BDF",marker='o',color='gray')
-    ax19.grid()
-    ax19.legend()
-
-    ax110 = figura.add_subplot(gs[1,4])
-    ax110.set_title("Comparativa de valores reales \ncon aproximados LSODA".format(h))
-    ax110.plot(valores_t, valores_solucion_exacta, label="Solución exacta")
-    ax110.plot(tabla_valores_1_lsoda['t'], tabla_valores_1_lsoda['y_aprox'], label="LSODA",marker='o',color='olive')
-    ax110.grid()
-    ax110.legend()
-
-    # Subplots que muestran los errores globales de cada método (escala lineal y log)
-    ax21 = figura.add_subplot(gs[2,:-2])
-    ax21.set_title("Comparativa de errores globales \n (escala lineal) (h={})".format(h))
-    ax21.grid()
-    ax21.plot(tabla_valores_1_rk2['t'], tabla_valores_1_rk2['error_global'], label="RK2",marker='o',color='red')
-    ax21.plot(tabla_valores_1_rk2['t'], tabla_valores_1_rk4['error_global'], label="RK4",marker='o',color='blue')
-    ax21.plot(tabla_valores_1_rk2['t'], tabla_valores_1_ab2['error_global'], label="AB2",marker='o',color='green')
-    ax21.plot(tabla_valores_1_rk2['t'], tabla_valores_1_heun['error_global'], label="Heun",marker='o',color='purple')
-    ax21.plot(tabla_valores_1_rk45['t'], tabla_valores_1_rk45['error_global'], label="RK45",marker='x',color='orange')
-    ax21.plot(tabla_valores_1_rk23['t'], tabla_valores_1_rk23['error_global'], label="RK23",marker='x',color='cyan')
-    ax21.plot(tabla_valores_1_dop853['t'], tabla_valores_1_dop853['error_global'], label="DOP853",marker='x',color='brown')
-    ax21.plot(tabla_valores_1_radau['t'], tabla_valores_1_radau['error_global'], label="Radau",marker='x',color='pink')
-    ax21.plot(tabla_valores_1_bdf['t'], tabla_valores_1_bdf['error_global'], label="BDF",marker='x',color='gray')
-    ax21.plot(tabla_valores_1_lsoda['t'], tabla_valores_1_lsoda['error_global'], label="LSODA",marker='x',color='olive')
-    ax21.legend()
-
-    ax22 = figura.add_subplot(gs[2,-2:])
-    ax22.set_title("Comparativa de errores globales \n (escala log.) (h={})".format(h))
-    ax22.grid()
-    ax22.set_yscale('log') 
-    ax22.plot(tabla_valores_1_rk2['t'], tabla_valores_1_rk2['error_global'], label="RK2",marker='o',color='red')
-    ax22.plot(tabla_valores_1_rk2['t'], tabla_valores_1_rk4['error_global'], label="RK4",marker='o',color='blue')
-    ax22.plot(tabla_valores_1_rk2['t'], tabla_valores_1_ab2['error_global'], label="AB2",marker='o',color='green')
-    ax22.plot(tabla_valores_1_rk2['t'], tabla_valores_1_heun['error_global'], label="Heun",marker='o',color='purple')
-    ax22.plot(tabla_valores_1_rk45['t'], tabla_valores_1_rk45['error_global'], label="RK45",marker='x',color='orange')
-    ax22.plot(tabla_valores_1_rk23['t'], tabla_valores_1_rk23['error_global'], label="RK23",marker='x',color='cyan')
-    ax22.plot(tabla_valores_1_dop853['t'], tabla_valores_1_dop853['error_global'], label="DOP853",marker='x',color='brown')
-    ax22.plot(tabla_valores_1_radau['t'], tabla_valores_1_radau['error_global'], label="Radau",marker='x',color='pink')
-    ax22.plot(tabla_valores_1_bdf['t'], tabla_valores_1_bdf['error_global'], label="BDF",marker='x',color='gray')
-    ax22.plot(tabla_valores_1_lsoda['t'], tabla_valores_1_lsoda['error_global'], label="LSODA",marker='x',color='olive')
-    ax22.legend()
-
-    # Subplot que muestra los errores locales de cada método
-    ax31 = figura.add_subplot(gs[3,0])
-    ax31.set_title("Errores locales RK2 (h={})".format(h))
-    ax31.plot(tabla_valores_1_rk2['t'], tabla_valores_1_rk2['error_local'], label="RK2",marker='o',color='red')
-    ax31.legend()
-    ax31.grid()
-
-    ax32 = figura.add_subplot(gs[3,1])
-    ax32.set_title("Errores locales RK4  (h={})".format(h))
-    ax32.plot(tabla_valores_1_rk4['t'], tabla_valores_1_rk4['error_local'], label="RK4",marker='o',color='blue')
-    ax32.legend()
-    ax32.grid()
-
-    ax33 = figura.add_subplot(gs[3,2])
-    ax33.set_title("Errores locales AB2  (h={})".format(h))
-    ax33.plot(tabla_valores_1_ab2['t'], tabla_valores_1_ab2['error_local'], label="AB2",marker='o',color='green')
-    ax33.legend()
-    ax33.grid()
-
-    ax34 = figura.add_subplot(gs[3,3])
-    ax34.set_title("Errores locales Heun (h={})".format(h))
-    ax34.plot(tabla_valores_1_heun['t'], tabla_valores_1_heun['error_local'], label="Heun",marker='o',color='purple')
-    ax34.legend()
-    ax34.grid()
-
-    ax35 = figura.add_subplot(gs[3,4])
-    ax35.set_title("Errores locales scipy (paso adaptativo)")
-    ax35.plot(tabla_valores_1_rk45['t'], tabla_valores_1_rk45['error_local'], label="RK45",marker='x',color='orange')
-    ax35.plot(tabla_valores_1_rk23['t'], tabla_valores_1_rk23['error_local'], label="RK23",marker='x',color='cyan')
-    ax35.plot(tabla_valores_1_dop853['t'], tabla_valores_1_dop853['error_local'], label="DOP853",marker='x',color='brown')
-    ax35.plot(tabla_valores_1_radau['t'], tabla_valores_1_radau['error_local'], label="Radau",marker='x',color='pink')
-    ax35.plot(tabla_valores_1_bdf['t'], tabla_valores_1_bdf['error_local'], label="BDF",marker='x',color='gray')
-    ax35.plot(tabla_valores_1_lsoda['t'], tabla_valores_1_lsoda['error_local'], label="LSODA",marker='x',color='olive')
-    ax35.legend()
-    ax35.grid()
-
+    resultados = {'RK2': tabla_valores_1_rk2, 'RK4': tabla_valores_1_rk4, 'AB2': tabla_valores_1_ab2, 'Heun': tabla_valores_1_heun,
+                  'RK45': tabla_valores_1_rk45, 'RK23': tabla_valores_1_rk23, 'DOP853': tabla_valores_1_dop853,
+                  'Radau': tabla_valores_1_radau, 'BDF': tabla_valores_1_bdf, 'LSODA': tabla_valores_1_lsoda}
+    titulo_paso = " (h={})".format(h)
+    # Los métodos de scipy (paso adaptativo) van con 'x', como en la figura original de los notebooks
+    marcadores = {nombre: 'x' if nombre in METODOS_SCIPY else 'o' for nombre in resultados}
+    propios = [(nombre, tabla) for nombre, tabla in resultados.items() if nombre not in METODOS_SCIPY]
+    scipy = [(nombre, tabla) for nombre, tabla in resultados.items() if nombre in METODOS_SCIPY]
+
+    # La misma grilla de 4x5 de siempre: dos filas de soluciones, errores globales lineal y log lado a lado, y errores locales
+    # de los métodos propios más uno combinado para los de scipy
+    figura = _nueva_figura((25, 20), None)
+    gs = figura.add_gridspec(4, 5, left=0.9/25, right=1 - 0.2/25, bottom=0.4/20, top=1 - 0.7/20, wspace=0.25, hspace=0.45)
+
+    for i, (nombre, tabla) in enumerate(resultados.items()):
+        _panel_metodo(figura.add_subplot(gs[i // 5, i % 5]), 'solucion', nombre, tabla, valores_t, valores_solucion_exacta,
+                      titulo_paso, COLORES_METODOS[nombre], MAX_PUNTOS, marker=marcadores[nombre])
+
+    todos = list(resultados.items())
+    _panel_combinado(figura.add_subplot(gs[2, :-2]), todos, 'error_global', "Comparativa de errores globales \n (escala lineal){}".format(titulo_paso),
+                     COLORES_METODOS, MAX_PUNTOS, marcadores=marcadores)
+    _panel_combinado(figura.add_subplot(gs[2, -2:]), todos, 'error_global', "Comparativa de errores globales \n (escala log.){}".format(titulo_paso),
+                     COLORES_METODOS, MAX_PUNTOS, log=True, marcadores=marcadores)
+
+    for i, (nombre, tabla) in enumerate(propios):
+        _panel_metodo(figura.add_subplot(gs[3, i]), 'error_local', nombre, tabla, None, None, titulo_paso, COLORES_METODOS[nombre], MAX_PUNTOS)
+    _panel_combinado(figura.add_subplot(gs[3, 4]), scipy, 'error_local', "Errores locales scipy (paso adaptativo)",
+                     COLORES_METODOS, MAX_PUNTOS, marcadores=marcadores)
     return figura
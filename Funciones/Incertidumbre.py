@@ -0,0 +1,304 @@
+import os
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Optional
+
+import numpy as np
+
+from Funciones.Constantes import T_HALF, T_HALF_SIGMA, R_REMANENTE, R_REMANENTE_SIGMA, T_INICIAL, T_FINAL, y0
+from Funciones.Metodos import integrar_conjunto, _malla_paso_fijo
+
+# ==================== PROPAGACIÓN DE INCERTIDUMBRE (MONTE CARLO / QUASI-MONTE CARLO) ====================
+# T_HALF y R_REMANENTE se muestrean como normales independientes; cada bloque de muestras se integra como un conjunto
+# (una constante de desintegración por muestra) y la edad de cada una se despeja sobre el interpolante del conjunto
+
+# Percentiles informados: mediana e intervalos de 68% y 95%
+PERCENTILES = (2.5, 16.0, 50.0, 84.0, 97.5)
+
+# Muestras por bloque: acota la memoria de cada integración del conjunto (pasos x muestras por bloque)
+TAMANO_BLOQUE = 2**15
+
+# Paso de la sucesión R2 (quasi-Monte Carlo): inversas de la primera y segunda potencia del número plástico
+_ALFA_KRONECKER = np.array([1/1.32471795724474602596, 1/1.32471795724474602596**2])
+
+# Intervalos del histograma de cada tiempo de las curvas de concentración, sobre [0, y0]
+BINS_CONCENTRACION = 2**14
+
+# Muestreos disponibles (ver muestrear_entradas)
+MUESTREOS = ('kronecker', 'sobol', 'mc')
+
+@dataclass
+class PropagacionIncertidumbre:
+    """
+    Resultado de propagar la incertidumbre de T_HALF y R_REMANENTE: percentiles de la edad y de la curva de concentración
+    """
+    muestreo: str
+    muestras: int
+    percentiles: np.ndarray  # (P,)
+    edad: np.ndarray  # (P,), percentiles de la edad en años
+    edad_media: float
+    edad_desviacion: float
+    valores_t: np.ndarray  # (K,), tiempos de las curvas
+    concentracion: np.ndarray  # (P, K), percentiles de la concentración en cada tiempo
+    no_alcanzadas: int = 0  # muestras cuya fracción no se alcanzó antes de t_max (quedan fuera de los percentiles de la edad)
+    edades: Optional[np.ndarray] = None  # edad de cada muestra, si se pidió
+
+    def como_dict(self):
+        """
+        Devuelve el resultado como dict de valores simples (para JSON), sin las edades de cada muestra
+
+        :return: dict
+        """
+        return {'muestreo': self.muestreo, 'muestras': self.muestras, 'no_alcanzadas': self.no_alcanzadas,
+                'percentiles': np.asarray(self.percentiles).tolist(), 'edad': self.edad.tolist(),
+                'edad_media': self.edad_media, 'edad_desviacion': self.edad_desviacion,
+                'valores_t': self.valores_t.tolist(), 'concentracion': self.concentracion.tolist()}
+
+def dy_decaimiento(t, y, lam):
+    """Derivada de la EDO con una constante de desintegración por muestra: dy/dt = -λy"""
+    return -lam * y
+
+def _uniformes(inicio, cantidad, muestreo, semilla):
+    """
+    Genera los puntos inicio, ..., inicio+cantidad-1 de una sucesión de puntos uniformes en [0, 1)^2 que depende solo de la
+    semilla, así que cada bloque se puede generar en cualquier proceso y el resultado no cambia con el tamaño de los bloques
+
+    :param inicio: int, índice del primer punto
+    :param cantidad: int, cantidad de puntos
+    :param muestreo: str, 'kronecker', 'sobol' o 'mc' (ver muestrear_entradas)
+    :param semilla: int, semilla de la aleatorización
+    :return: array (cantidad, 2)
+    """
+    if muestreo == 'kronecker':
+        # Sucesión R2: i*alfa (mod 1), con alfa de la raíz real de x^3 = x + 1, corrida por un desplazamiento aleatorio
+        desplazamiento = np.random.default_rng(semilla).random(2)
+        indices = np.arange(inicio, inicio + cantidad, dtype=float)[:, None]
+        return (desplazamiento + indices*_ALFA_KRONECKER) % 1.0
+
+    if muestreo == 'sobol':
+        from scipy.stats import qmc
+
+        motor = qmc.Sobol(d=2, scramble=True, rng=semilla)
+        if inicio:
+            motor.fast_forward(inicio)
+        with warnings.catch_warnings():
+            # Sobol avisa si la cantidad no es potencia de 2: los bloques lo son, salvo quizás el último
+            warnings.simplefilter('ignore', UserWarning)
+            return motor.random(cantidad)
+
+    if muestreo == 'mc':
+        # Cada uniforme usa exactamente un número del generador: se adelanta hasta el punto inicio
+        generador = np.random.PCG64(semilla)
+        generador.advance(2*inicio)
+        return np.random.Generator(generador).random((cantidad, 2))
+
+    raise ValueError("Muestreo '{}' no disponible, usar uno de {}".format(muestreo, MUESTREOS))
+
+def muestrear_entradas(inicio, cantidad, muestreo='kronecker', semilla=0, t_half=(T_HALF, T_HALF_SIGMA), r_remanente=(R_REMANENTE, R_REMANENTE_SIGMA)):
+    """
+    Genera las muestras inicio, ..., inicio+cantidad-1 de la vida media y de la fracción remanente, como normales independientes
+
+    :param inicio: int, índice de la primera muestra
+    :param cantidad: int, cantidad de muestras
+    :param muestreo: str, 'kronecker' (quasi-Monte Carlo con la sucesión R2, solo NumPy), 'sobol' (quasi-Monte Carlo con una
+                     sucesión de Sobol aleatorizada de scipy, que tarda más en importarse) o 'mc' (Monte Carlo)
+    :param semilla: int, semilla del muestreo
+    :param t_half: tupla (media, desviación) de la vida media en años
+    :param r_remanente: tupla (media, desviación) de la fracción remanente medida
+    :return: tupla de arrays (cantidad,): vidas medias y fracciones remanentes
+    """
+    uniformes = _uniformes(inicio, cantidad, muestreo, semilla)
+
+    # Box-Muller: transforma cada punto del cuadrado en un par de normales independientes (1 - u evita log(0))
+    radio = np.sqrt(-2*np.log1p(-uniformes[:, 0]))
+    angulo = 2*np.pi*uniformes[:, 1]
+
+    # Se descartan los valores sin sentido físico (vida media no positiva, fracción fuera de (0, 1])
+    minimo = np.finfo(float).tiny
+    vidas_medias = np.maximum(t_half[0] + t_half[1]*radio*np.cos(angulo), minimo)
+    fracciones = np.clip(r_remanente[0] + r_remanente[1]*radio*np.sin(angulo), minimo, 1.0)
+    return vidas_medias, fracciones
+
+def _hermite(s, y_a, y_b, hd_a, hd_b):
+    """
+    Cúbica de Hermite de un tramo y su derivada respecto de la posición relativa s, con las derivadas de los extremos ya
+    multiplicadas por el ancho del tramo
+
+    :return: tupla de arrays (valor, derivada)
+    """
+    uno_menos_s = 1 - s
+    valor = (1 + 2*s)*uno_menos_s**2*y_a + s*uno_menos_s**2*hd_a + s**2*(3 - 2*s)*y_b + s**2*(s - 1)*hd_b
+    derivada = 6*s*uno_menos_s*(y_b - y_a) + uno_menos_s*(1 - 3*s)*hd_a + s*(3*s - 2)*hd_b
+    return valor, derivada
+
+def _edades_conjunto(interpolante, fracciones, tol, itmax=20):
+    """
+    Busca, para cada muestra de un conjunto, el primer tiempo en que su solución baja hasta su fracción remanente. Como
+    buscar_tiempos, pero cada muestra tiene su propia curva: se ubica el tramo de cada una y el cruce se refina con Newton sobre
+    la cúbica del tramo, partiendo de la interpolación lineal, para todas las muestras a la vez
+
+    :param interpolante: InterpolanteHermite del conjunto, con valores (pasos, M)
+    :param fracciones: array (M,), fracción remanente de cada muestra
+    :param tol: float, corrección máxima en t de la última iteración
+    :param itmax: int, cantidad máxima de iteraciones de Newton
+    :return: array (M,) de edades (NaN si la fracción no se alcanza en el intervalo integrado)
+    """
+    nodos_t = interpolante.valores_t
+    miembros = np.arange(len(fracciones))
+
+    # Primer nodo con y <= fracción: como las soluciones decrecen, es la cantidad de nodos que quedan por encima
+    j = np.count_nonzero(interpolante.valores_y > fracciones, axis=0)
+    alcanzada = j < len(nodos_t)
+    i = np.clip(j - 1, 0, len(nodos_t) - 2)
+
+    h = nodos_t[i+1] - nodos_t[i]
+    y_a, y_b = interpolante.valores_y[i, miembros], interpolante.valores_y[i+1, miembros]
+    hd_a, hd_b = h*interpolante.derivadas[i, miembros], h*interpolante.derivadas[i+1, miembros]
+
+    # Newton en la posición relativa s del tramo, sin salir de [0, 1]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        s = np.nan_to_num(np.clip((y_a - fracciones) / (y_a - y_b), 0.0, 1.0))
+        for _ in range(itmax):
+            valor, derivada = _hermite(s, y_a, y_b, hd_a, hd_b)
+            correccion = np.where(derivada != 0, (valor - fracciones) / derivada, 0.0)
+            s = np.clip(s - correccion, 0.0, 1.0)
+            if np.max(np.abs(correccion)*h) <= tol:
+                break
+
+    edades = nodos_t[i] + s*h
+    edades[~alcanzada] = np.nan
+    return edades
+
+def _histograma_curvas(interpolante, valores_t, filas_nodos, bordes):
+    """
+    Cuenta, para cada tiempo de las curvas, cuántas muestras caen en cada intervalo de concentración. Los histogramas de
+    distintos bloques se suman, así que los percentiles de las curvas no requieren guardar las curvas de todas las muestras.
+    También devuelve el mínimo y el máximo de cada tiempo, que acotan los percentiles interpolados dentro de los intervalos
+
+    :param interpolante: InterpolanteHermite del conjunto, con valores (pasos, M)
+    :param valores_t: array (K,), tiempos de las curvas
+    :param filas_nodos: array (K,) de enteros, nodos de la malla que coinciden con valores_t, o None si hay que interpolar
+    :param bordes: array (B+1,), bordes equiespaciados de los intervalos
+    :return: tupla (array (K, B) de enteros, array (K,) de mínimos, array (K,) de máximos)
+    """
+    n_bins = len(bordes) - 1
+    # En los nodos de la malla se usan los valores integrados, sin pasar por el interpolante
+    valores = interpolante.valores_y[filas_nodos] if filas_nodos is not None else interpolante(valores_t)
+
+    indices = ((valores - bordes[0]) * (n_bins / (bordes[-1] - bordes[0]))).astype(np.int64)
+    np.clip(indices, 0, n_bins - 1, out=indices)
+    indices += np.arange(len(valores_t))[:, None] * n_bins
+    conteos = np.bincount(indices.ravel(), minlength=len(valores_t)*n_bins).reshape(len(valores_t), n_bins)
+    return conteos, valores.min(axis=1), valores.max(axis=1)
+
+def _percentiles_histograma(conteos, bordes, percentiles, minimos, maximos):
+    """
+    Calcula percentiles a partir de histogramas, interpolando linealmente dentro del intervalo que contiene a cada uno. El
+    resultado se acota al rango observado de cada tiempo: sin eso, un tiempo en que todas las muestras valen lo mismo (como
+    t = 0) daría percentiles desplazados hasta un ancho de intervalo
+
+    :param conteos: array (K, B), histograma de cada tiempo
+    :param bordes: array (B+1,), bordes equiespaciados de los intervalos
+    :param percentiles: array (P,), percentiles entre 0 y 100
+    :param minimos: array (K,), valor mínimo observado en cada tiempo
+    :param maximos: array (K,), valor máximo observado en cada tiempo
+    :return: array (P, K)
+    """
+    acumulados = np.cumsum(conteos, axis=1)
+    objetivos = np.asarray(percentiles, dtype=float)[None, :] / 100 * acumulados[:, -1:]
+    filas = np.arange(len(conteos))[:, None]
+
+    # Primer intervalo en el que el acumulado llega a cada objetivo
+    j = np.minimum((acumulados[:, None, :] < objetivos[:, :, None]).sum(axis=2), conteos.shape[1] - 1)
+    anteriores = np.where(j > 0, acumulados[filas, np.maximum(j - 1, 0)], 0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        fracciones = np.nan_to_num((objetivos - anteriores) / conteos[filas, j])
+
+    return np.clip(bordes[j] + fracciones*(bordes[1] - bordes[0]), minimos[:, None], maximos[:, None]).T
+
+def _procesar_bloque(tarea):
+    """
+    Muestrea e integra un bloque de muestras. Está a nivel de módulo para poder enviarse a otros procesos
+
+    :param tarea: tupla (inicio, cantidad, configuracion), con la configuración armada en propagar_incertidumbre
+    :return: tupla (edades del bloque, histograma de las curvas, mínimos y máximos de las curvas)
+    """
+    inicio, cantidad, configuracion = tarea
+    vidas_medias, fracciones = muestrear_entradas(inicio, cantidad, configuracion['muestreo'], configuracion['semilla'],
+                                                  configuracion['t_half'], configuracion['r_remanente'])
+
+    _, interpolante = integrar_conjunto(configuracion['metodo'], T_INICIAL, configuracion['t_max'], configuracion['h'],
+                                        np.full(cantidad, y0), dy_decaimiento, parametros={'lam': np.log(2) / vidas_medias},
+                                        interpolante=True)
+
+    return (_edades_conjunto(interpolante, fracciones, configuracion['tol']),
+            *_histograma_curvas(interpolante, configuracion['valores_t'], configuracion['filas_nodos'], configuracion['bordes']))
+
+def propagar_incertidumbre(muestras=2**20, muestreo='kronecker', semilla=0, t_half=(T_HALF, T_HALF_SIGMA), r_remanente=(R_REMANENTE, R_REMANENTE_SIGMA),
+                           valores_t=None, percentiles=PERCENTILES, metodo='RK4', h=500, t_max=None, tol=1e-3,
+                           tamano_bloque=TAMANO_BLOQUE, n_procesos=1, guardar_edades=False):
+    """
+    Propaga la incertidumbre de la vida media y de la fracción remanente a la edad de la muestra y a la curva de concentración.
+    Las muestras se procesan de a bloques: cada bloque se integra como un conjunto con integrar_conjunto (una constante de
+    desintegración por muestra), la edad de cada muestra se despeja sobre el interpolante y las curvas se acumulan en histogramas,
+    así que la memoria depende del tamaño del bloque y no de la cantidad de muestras
+
+    :param muestras: int, cantidad de muestras (con 'sobol' conviene una potencia de 2)
+    :param muestreo: str, 'kronecker' o 'sobol' (quasi-Monte Carlo) o 'mc' (Monte Carlo), ver muestrear_entradas
+    :param semilla: int, semilla del muestreo
+    :param t_half: tupla (media, desviación) de la vida media en años
+    :param r_remanente: tupla (media, desviación) de la fracción remanente medida
+    :param valores_t: array, tiempos de las curvas de concentración (por defecto los nodos de la malla entre T_INICIAL y T_FINAL,
+                      que no necesitan interpolación)
+    :param percentiles: secuencia de percentiles entre 0 y 100
+    :param metodo: str, método de paso fijo (ver Metodos.integrar_conjunto)
+    :param h: float, tamaño del paso
+    :param t_max: float, tiempo hasta el que se integra (por defecto 1.25*T_FINAL); las muestras más viejas quedan como no alcanzadas
+    :param tol: float, tolerancia en t de la edad
+    :param tamano_bloque: int, muestras por bloque
+    :param n_procesos: int, cantidad de procesos (None usa todos los núcleos; 1 ejecuta todo en el proceso actual)
+    :param guardar_edades: bool, si es True el resultado incluye la edad de cada muestra
+    :return: PropagacionIncertidumbre
+    """
+    # Se valida acá y no en cada bloque, para que un nombre mal escrito no falle recién dentro de otro proceso
+    if muestreo not in MUESTREOS:
+        raise ValueError("Muestreo '{}' no disponible, usar uno de {}".format(muestreo, MUESTREOS))
+
+    t_max = 1.25*T_FINAL if t_max is None else t_max
+    nodos = _malla_paso_fijo(T_INICIAL, t_max, h)
+    valores_t = nodos[nodos <= T_FINAL] if valores_t is None else np.asarray(valores_t, dtype=float)
+    if valores_t.max() > nodos[-1]:
+        raise ValueError("Los tiempos de las curvas tienen que ser menores que t_max = {}".format(t_max))
+
+    filas_nodos = np.minimum(np.searchsorted(nodos, valores_t), len(nodos) - 1)
+    if np.any(nodos[filas_nodos] != valores_t):
+        filas_nodos = None
+
+    configuracion = {'muestreo': muestreo, 'semilla': semilla, 't_half': t_half, 'r_remanente': r_remanente, 'metodo': metodo,
+                     'h': h, 't_max': t_max, 'tol': tol, 'valores_t': valores_t, 'filas_nodos': filas_nodos,
+                     'bordes': np.linspace(0.0, y0, BINS_CONCENTRACION + 1)}
+    tareas = [(inicio, min(tamano_bloque, muestras - inicio), configuracion) for inicio in range(0, muestras, tamano_bloque)]
+
+    n_procesos = n_procesos or os.cpu_count() or 1
+    if n_procesos == 1 or len(tareas) <= 1:
+        resultados = map(_procesar_bloque, tareas)
+    else:
+        # map conserva el orden de los bloques, así que las edades quedan en el orden de la sucesión
+        with ProcessPoolExecutor(max_workers=n_procesos) as ejecutor:
+            resultados = list(ejecutor.map(_procesar_bloque, tareas))
+
+    edades = np.empty(muestras)
+    conteos = np.zeros((len(valores_t), BINS_CONCENTRACION), dtype=np.int64)
+    minimos, maximos = np.full(len(valores_t), np.inf), np.full(len(valores_t), -np.inf)
+    for (inicio, cantidad, _), (edades_bloque, conteos_bloque, minimos_bloque, maximos_bloque) in zip(tareas, resultados):
+        edades[inicio:inicio+cantidad] = edades_bloque
+        conteos += conteos_bloque
+        np.minimum(minimos, minimos_bloque, out=minimos)
+        np.maximum(maximos, maximos_bloque, out=maximos)
+
+    return PropagacionIncertidumbre(muestreo=muestreo, muestras=muestras, percentiles=np.asarray(percentiles, dtype=float),
+                                    edad=np.nanpercentile(edades, percentiles), edad_media=float(np.nanmean(edades)),
+                                    edad_desviacion=float(np.nanstd(edades)), valores_t=valores_t,
+                                    concentracion=_percentiles_histograma(conteos, configuracion['bordes'], percentiles, minimos, maximos),
+                                    no_alcanzadas=int(np.isnan(edades).sum()), edades=edades if guardar_edades else None)
@@ -0,0 +1,181 @@
+import numpy as np
+
+class InterpolanteHermite:
+    """
+    Interpolante cúbico de Hermite por tramos construido con los valores y las derivadas de una corrida en los nodos de la malla.
+    Permite consultar la solución en tiempos arbitrarios sin volver a integrar
+    """
+
+    def __init__(self, valores_t, valores_y, derivadas):
+        """
+        :param valores_t: array (pasos,), tiempos de los nodos (crecientes)
+        :param valores_y: array (pasos,) o (pasos, N), valores de la solución en los nodos
+        :param derivadas: array con la misma forma que valores_y, f(t, y) en los nodos
+        """
+        self.valores_t = np.asarray(valores_t, dtype=float)
+        self.valores_y = np.asarray(valores_y, dtype=float)
+        self.derivadas = np.asarray(derivadas, dtype=float)
+
+    def __call__(self, t):
+        """
+        Evalúa el interpolante de forma vectorizada
+
+        :param t: float o array de tiempos de consulta
+        :return: array de forma t.shape + forma del estado; NaN fuera del intervalo integrado
+        """
+        t = np.asarray(t, dtype=float)
+        consulta = t.ravel()
+        nodos = self.valores_t
+
+        if len(nodos) == 1:
+            # Corrida sin pasos (t_final < t_inicial + h): solo se conoce el valor en el único nodo
+            valores = np.repeat(self.valores_y[:1], len(consulta), axis=0)
+            valores[consulta != nodos[0]] = np.nan
+            return valores.reshape(t.shape + self.valores_y.shape[1:])
+
+        # Tramo de cada consulta: t_i <= t < t_i+1 (el último nodo cae en el último tramo)
+        i = np.clip(np.searchsorted(nodos, consulta, side='right') - 1, 0, len(nodos) - 2)
+        h = nodos[i+1] - nodos[i]
+        s = (consulta - nodos[i]) / h
+
+        # Bases de Hermite, con una dimensión extra para estados vectoriales
+        forma = (-1,) + (1,)*(self.valores_y.ndim - 1)
+        s = s.reshape(forma)
+        h = h.reshape(forma)
+        uno_menos_s = 1 - s
+        h00 = (1 + 2*s) * uno_menos_s**2
+        h10 = s * uno_menos_s**2
+        h01 = s**2 * (3 - 2*s)
+        h11 = s**2 * (s - 1)
+
+        valores = (h00*self.valores_y[i] + h10*h*self.derivadas[i]
+                   + h01*self.valores_y[i+1] + h11*h*self.derivadas[i+1])
+
+        fuera = (consulta < nodos[0]) | (consulta > nodos[-1])
+        valores[fuera] = np.nan
+
+        return valores.reshape(t.shape + self.valores_y.shape[1:])
+
+class InterpolanteScipy:
+    """
+    Envoltura de la salida densa de solve_ivp (dense_output=True) con la misma interfaz que InterpolanteHermite
+    """
+
+    def __init__(self, solucion, escalar):
+        """
+        :param solucion: resultado de scipy.integrate.solve_ivp calculado con dense_output=True
+        :param escalar: bool, si el PVI original era escalar (se devuelve sin la dimensión de componentes)
+        """
+        self.solucion_densa = solucion.sol
+        self.valores_t = solucion.t
+        self.valores_y = solucion.y[0] if escalar else np.ascontiguousarray(solucion.y.T)
+        self.escalar = escalar
+
+    def __call__(self, t):
+        """
+        Evalúa el interpolante de forma vectorizada
+
+        :param t: float o array de tiempos de consulta
+        :return: array de forma t.shape + forma del estado; NaN fuera del intervalo integrado
+        """
+        t = np.asarray(t, dtype=float)
+        consulta = t.ravel()
+
+        # OdeSolution devuelve (N, consultas)
+        valores = self.solucion_densa(consulta).T
+        if self.escalar:
+            valores = valores[:, 0]
+
+        fuera = (consulta < self.valores_t[0]) | (consulta > self.valores_t[-1])
+        valores[fuera] = np.nan
+
+        return valores.reshape(t.shape + self.valores_y.shape[1:])
+
+def _primer_cruce(valores_nodos, valores_objetivo, tamano_bloque=1024):
+    """
+    Función que encuentra, para cada valor objetivo, el primer tramo de la malla en el que la solución lo cruza
+
+    :param valores_nodos: array (pasos,), valores de la solución en los nodos
+    :param valores_objetivo: array (K,), valores buscados
+    :param tamano_bloque: int, cantidad de objetivos que se procesan juntos si la solución no es monótona
+    :return: array (K,) de enteros, índice i del tramo [t_i, t_i+1] (-1 si el valor no se alcanza)
+    """
+    n = len(valores_nodos)
+    diferencias = np.diff(valores_nodos)
+
+    # Caso usual (desintegración): solución monótona, alcanza con una búsqueda binaria
+    if np.all(diferencias <= 0) or np.all(diferencias >= 0):
+        decreciente = valores_nodos[-1] < valores_nodos[0]
+        if decreciente:
+            j = np.searchsorted(-valores_nodos, -valores_objetivo, side='left')
+        else:
+            j = np.searchsorted(valores_nodos, valores_objetivo, side='left')
+
+        tramos = np.maximum(j - 1, 0)
+        # j == 0 solo es válido si el objetivo coincide con el valor inicial
+        no_alcanzado = (j == n) | ((j == 0) & (valores_objetivo != valores_nodos[0]))
+        tramos[no_alcanzado] = -1
+        return tramos
+
+    # Caso general: primer cambio de signo de y - objetivo, por bloques para acotar memoria
+    tramos = np.full(len(valores_objetivo), -1)
+    for inicio in range(0, len(valores_objetivo), tamano_bloque):
+        objetivos = valores_objetivo[inicio:inicio+tamano_bloque]
+        signo = valores_nodos[:, None] - objetivos[None, :]
+        cruza = signo[:-1] * signo[1:] <= 0
+        hay_cruce = cruza.any(axis=0)
+        tramos[inicio:inicio+tamano_bloque] = np.where(hay_cruce, cruza.argmax(axis=0), -1)
+
+    return tramos
+
+def buscar_tiempos(interpolante, valores_objetivo, componente=None, tol=1e-6, itmax=200):
+    """
+    Función que busca el primer tiempo en que la solución alcanza cada valor objetivo. Primero ubica el tramo de la malla
+    que contiene el cruce y luego lo refina con bisección sobre el interpolante, para todos los objetivos a la vez
+
+    :param interpolante: InterpolanteHermite o InterpolanteScipy de una corrida
+    :param valores_objetivo: float o array de valores buscados (por ejemplo, fracciones remanentes de C14)
+    :param componente: int, componente del estado a usar si la corrida es de un sistema
+    :param tol: float, ancho máximo del intervalo final en t
+    :param itmax: int, cantidad máxima de bisecciones
+    :return: float o array con los tiempos encontrados (NaN si el valor no se alcanza en el intervalo integrado)
+    """
+    objetivos = np.atleast_1d(np.asarray(valores_objetivo, dtype=float))
+    nodos_t = interpolante.valores_t
+    nodos_y = interpolante.valores_y if componente is None else interpolante.valores_y[:, componente]
+
+    def evaluar(t):
+        valores = interpolante(t)
+        return valores if componente is None else valores[:, componente]
+
+    if len(nodos_t) == 1:
+        # Un solo nodo: el único valor alcanzado es el inicial
+        tiempos = np.where(objetivos == nodos_y[0], nodos_t[0], np.nan)
+        return tiempos[0] if np.ndim(valores_objetivo) == 0 else tiempos
+
+    tramos = _primer_cruce(nodos_y, objetivos.ravel())
+    encontrados = tramos >= 0
+    tiempos = np.full(objetivos.size, np.nan)
+
+    i = tramos[encontrados]
+    c = objetivos.ravel()[encontrados]
+    a, b = nodos_t[i], nodos_t[i+1]
+    # Signo de y - c en el extremo izquierdo de cada intervalo
+    signo_a = np.sign(nodos_y[i] - c)
+
+    it = 0
+    while len(a) and np.max(b - a) > tol and it < itmax:
+        medio = 0.5*(a + b)
+        signo_medio = np.sign(evaluar(medio) - c)
+        # El cruce queda del lado donde cambia el signo (o en el medio si y = c)
+        mismo_lado = signo_medio == signo_a
+        a = np.where(mismo_lado, medio, a)
+        b = np.where(mismo_lado, b, medio)
+        it += 1
+
+    # Si el objetivo coincide con el nodo izquierdo, el tiempo es ese nodo
+    tiempos[encontrados] = np.where(signo_a == 0, nodos_t[i], 0.5*(a + b))
+
+    if np.ndim(valores_objetivo) == 0:
+        return tiempos[0]
+    return tiempos.reshape(objetivos.shape)
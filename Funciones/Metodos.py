@@ -1,172 +1,1224 @@
-import pandas as pd
+import functools
+import time
+
 import numpy as np
-import scipy.integrate as spi
 
-def runge_kutta_2_trapecio(t_inicial, t_final, h, y_inicial, f):
+from Funciones.Estadisticas import Estadisticas, ContadorEvaluaciones
+from Funciones.Interpolacion import InterpolanteHermite, InterpolanteScipy, buscar_tiempos
+from Funciones.Resultado import Resultado
+
+def _malla_paso_fijo(t_inicial, t_final, h):
     """
-    Función que implementa el método del trapecio o Euler modificado (Runge-Kutta de segundo orden)
-    :parametros t_inicial: float, valor inicial de t, t_final: float, valor final de t (valor a aproximar), h: float, tamaño del paso, y_inicial: float, valor inicial para el primer paso, f: función derivada del PVI
-    :return: DataFrame, tabla de valores de t, y_aprox y error_local
+    Función que arma la malla de tiempos de los métodos de paso fijo, igual a la que se recorría con np.arange
+
+    :parametros t_inicial: float, valor inicial de t, t_final: float, valor final de t (valor a aproximar), h: float, tamaño del paso
+    :return: array, valores de t de la tabla (el primero es t_inicial)
     """
-    # Guardamos los valores en listas para luego armar la tabla
-    filas_tabla = []
+    # Se usa t_final+0.5*h para incluir el valor a aproximar
+    valores_t = np.arange(t_inicial+h, t_final+0.5*h, h).round(4)
 
-    # Se agrega la primera linea
-    y_n = y_inicial
-    filas_tabla.append([t_inicial, np.nan, np.nan]) # no se guarda como valor aprox el valor inicial
-    
-    # Se calcula el resto de las filas, usando t_final+h para incluir el valor a aproximar. 
-    for t in np.arange(t_inicial+h, t_final+0.5*h, h).round(4):
-        # Calculo de y_n+1, valor aproximado
-        k1 = f(t-h, y_n)
-        k2 = f(t, y_n + h*k1)
-        y_n_1 = y_n + (h/2) * (k1+k2)
-
-        # Calculo del error local antes de reasignar y_n_1
-        e_local = np.abs(y_n_1 - y_n)
-
-        # Reasignación para próximo paso
-        y_n = y_n_1
-        
-        # Agregamos los valores al conjunto de filas para la tabla
-        filas_tabla.append([t, y_n_1, e_local])
-    
-    tabla_valores = pd.DataFrame(columns=['t','y_aprox','error_local'], data=filas_tabla)
-    
-    return tabla_valores
+    return np.concatenate(([t_inicial], valores_t))
 
-def runge_kutta_4(t_inicial, t_final, h, y_inicial, f):
+def _armar_salida(valores_t, valores_y, errores_locales, como_tabla, **metadatos):
     """
-    Función que implementa el método de Runge-Kutta de cuarto orden
-    :parametros t_inicial: float, valor inicial de t, t_final: float, valor final de t (valor a aproximar), h: float, tamaño del paso, y_inicial: float valor de y inicial para el primer paso, f: función derivada del PVI
-    :return: DataFrame, tabla de valores de t, y_aprox y error_local
+    Función que arma la salida de un método a partir de los arreglos ya calculados
+
+    :parametros valores_t: array, valores de t, valores_y: array, valores de y_aprox (forma (pasos,) o (pasos, N) para sistemas), errores_locales: array, valores de error_local (misma forma que valores_y), como_tabla: bool, si es True se arma un Resultado, si no se devuelven los arreglos, metadatos: metodo, h, rtol, atol y estadisticas de la corrida para el Resultado
+    :return: Resultado con columnas t, y_aprox y error_local (sin copiar los arreglos; a_pandas() arma el DataFrame), o tupla de arrays (t, y_aprox, error_local)
     """
-    # Guardamos los valores en listas para luego armar la tabla
-    filas_tabla = []
+    if not como_tabla:
+        return valores_t, valores_y, errores_locales
+
+    return Resultado(valores_t, valores_y, errores_locales, **metadatos)
+
+def _estado_inicial(y_inicial):
+    """
+    Función que normaliza el valor inicial: los escalares se dejan como están (camino rápido) y los vectores de estado se pasan a array de float64
+
+    :parametros y_inicial: float o array, valor inicial del PVI
+    :return: float o array de float64
+    """
+    if np.ndim(y_inicial) == 0:
+        return y_inicial
+    return np.array(y_inicial, dtype=float)
+
+def _calcular_errores_locales(valores_y, y_inicial):
+    """
+    Función que calcula el error local de una corrida de paso fijo (diferencia con el valor del paso anterior) de una sola vez
+
+    :parametros valores_y: array, valores de y_aprox con NaN en la primera fila, y_inicial: float o array, valor inicial del PVI
+    :return: array con la misma forma que valores_y
+    """
+    errores_locales = np.empty_like(valores_y)
+    errores_locales[0] = np.nan
+
+    if len(valores_y) > 1:
+        errores_locales[1] = np.abs(valores_y[1] - y_inicial)
+        np.abs(np.diff(valores_y[1:], axis=0), out=errores_locales[2:])
+
+    return errores_locales
+
+def _integrar_paso_fijo(paso, f, t_inicial, t_final, h, y_inicial, como_tabla=True, interpolante=False, detener=None, registro=None, metodo=None):
+    """
+    Motor común de los métodos de paso fijo. Recorre la malla de tiempos y guarda los resultados en arreglos de float64 reservados de antemano
+
+    :parametros paso: función paso(t_n, t_n_1, y_n) que devuelve (y_n_1, f(t_n, y_n)), f: función derivada del PVI (solo se usa para la derivada del último nodo del interpolante), t_inicial: float, valor inicial de t, t_final: float, valor final de t (valor a aproximar), h: float, tamaño del paso, y_inicial: float o array (vector de estado o conjunto de condiciones iniciales), valor inicial para el primer paso, como_tabla: bool, si es True devuelve un Resultado, si no los arreglos, interpolante: bool, si es True también se devuelve un InterpolanteHermite de la corrida, detener: función detener(t, y) que se evalúa después de cada paso; si devuelve True la corrida termina en ese paso, registro: Estadisticas donde se anota la cantidad de pasos (o None), metodo: str, nombre del método para los metadatos del Resultado
+    :return: Resultado con t, y_aprox y error_local (o tupla de arrays si como_tabla es False, con una fila contigua por paso). Si interpolante es True, tupla (tabla, interpolante)
+    """
+    valores_t = _malla_paso_fijo(t_inicial, t_final, h)
+    n = len(valores_t)
+
+    valores_y = np.empty((n,) + np.shape(y_inicial))
+
+    # En la primera línea no se guarda como valor aprox el valor inicial
+    valores_y[0] = np.nan
+
+    # Las derivadas en los nodos solo se guardan si se pide el interpolante
+    derivadas = np.empty_like(valores_y) if interpolante else None
+
+    # Recorrer la malla como lista de floats es más rápido que indexar el array en cada paso
+    lista_t = valores_t.tolist()
 
-    # Se agrega la primera linea
     y_n = y_inicial
-    filas_tabla.append([t_inicial, np.nan, np.nan])
-    # print("valor de yinicial", y_inicial) PARA CONTROL
-    
-    # Se calcula el resto de las filas, usando t_final+h para incluir el valor a aproximar. 
-    for t in np.arange(t_inicial+h, t_final+0.5*h, h).round(4):
-        # Calculo de y_n+1, valor aproximado
-        k1 = f(t-h, y_n)
-        k2 = f(t-h+h/2, y_n + (h/2)*k1)
-        k3 = f(t-h+h/2, y_n + (h/2)*k2)
-        k4 = f(t-h+h, y_n + h*k3)
-        # print("Valores de k1, k2, k3, k4", k1, k2, k3, k4, "calculados con", t-h, t-h+h/2, t-h+h/2, t-h+h, y_n) PARA CONTROL
+    for i in range(1, n):
+        y_n, f_n = paso(lista_t[i-1], lista_t[i], y_n)
+        valores_y[i] = y_n
+        if derivadas is not None:
+            derivadas[i-1] = f_n
+        if detener is not None and detener(lista_t[i], y_n):
+            n = i + 1
+            break
 
-        y_n_1 = y_n + (h/6)*(k1+2*k2+2*k3+k4)
+    if n < len(valores_t):
+        # Corrida terminada antes por un evento: se descarta la parte no usada de los arreglos
+        valores_t = valores_t[:n]
+        valores_y = valores_y[:n]
+        lista_t = lista_t[:n]
+        if derivadas is not None:
+            derivadas = derivadas[:n]
 
-        # Calculo del error local antes de reasignar y_n_1
-        e_local = np.abs(y_n_1 - y_n)
+    if registro is not None:
+        registro.pasos_aceptados = n - 1
 
-        # Reasignación para próximo paso
-        y_n = y_n_1
+    salida = _armar_salida(valores_t, valores_y, _calcular_errores_locales(valores_y, y_inicial), como_tabla,
+                           metodo=metodo, h=h, estadisticas=registro)
+    if not interpolante:
+        return salida
 
-        # Agregamos los valores al conjunto de filas para la tabla
-        filas_tabla.append([t, y_n_1, e_local])
-    
-    tabla_valores = pd.DataFrame(columns=['t','y_aprox','error_local'], data=filas_tabla)
-    
-    return tabla_valores
+    # El interpolante necesita el valor inicial en el primer nodo y la derivada en el último
+    derivadas[-1] = f(lista_t[-1], y_n)
+    valores_nodos = valores_y.copy()
+    valores_nodos[0] = y_inicial
+
+    return salida, InterpolanteHermite(valores_t, valores_nodos, derivadas)
 
-def adam_bashforth_2_con_euler_RK1_explicito(t_inicial, t_final, h, y_inicial, f):
+def _crear_paso_rk2(f, h):
     """
-    Función que implementa el método de Adam-Bashforth 2, usando para el segundo paso inicial el método de Euler explícito (RK1)
+    Función que crea el paso del método del trapecio o Euler modificado (Runge-Kutta de segundo orden)
 
-    :parametros t_inicial: float, valor inicial de t, t_final: float, valor final de t (valor a aproximar), h: float, tamaño del paso, y_inicial: float, valor de y inicial para el primer paso inicial f: función derivada del PVI
-    :return: DataFrame, tabla de valores de t, y_real, y_aprox, error_global y error_local
+    :parametros f: función derivada del PVI, h: float, tamaño del paso
+    :return: función paso(t_n, t_n_1, y_n) que devuelve (y_n_1, f(t_n, y_n))
     """
-    # Guardamos los valores en listas para luego armar la tabla
-    filas_tabla = []
+    def paso(t_n, t_n_1, y_n):
+        k1 = f(t_n, y_n)
+        k2 = f(t_n_1, y_n + h*k1)
+        return y_n + (h/2) * (k1+k2), k1
 
-    # Se agrega la primera linea
-    y_n_m1 = y_inicial
-    filas_tabla.append([t_inicial, np.nan, np.nan])
+    return paso
 
-    # Se agrega la segunda línea usando el método de Euler explícito (RK1) 
-    y_n = y_n_m1 + h*f(t_inicial, y_n_m1) #aproximado con Euler explícito
+def _crear_paso_rk4(f, h):
+    """
+    Función que crea el paso del método de Runge-Kutta de cuarto orden
 
-    e_local = np.abs(y_n-y_n_m1)
-    filas_tabla.append([t_inicial+h, y_n, e_local])
+    :parametros f: función derivada del PVI, h: float, tamaño del paso
+    :return: función paso(t_n, t_n_1, y_n) que devuelve (y_n_1, f(t_n, y_n))
+    """
+    def paso(t_n, t_n_1, y_n):
+        k1 = f(t_n, y_n)
+        k2 = f(t_n+h/2, y_n + (h/2)*k1)
+        k3 = f(t_n+h/2, y_n + (h/2)*k2)
+        k4 = f(t_n+h, y_n + h*k3)
+        return y_n + (h/6)*(k1+2*k2+2*k3+k4), k1
 
-    # Se calcula el resto de las filas, usando t_final+h para incluir el valor a aproximar. Ahora se comienza desde el tercer paso (t_inicial+2*h)
-    
-    for t in np.arange(t_inicial+2*h, t_final+0.5*h, h).round(4):
-        # Calculo del valor aproximado
-        y_n_1 = y_n + (h/2)*(3*f(t-h, y_n) - f(t-2*h, y_n_m1))
-        # print("calculado yaprox usando", y_n, y_n_m1, t-h, t-2*h, f(t-h, y_n), f(t-2*h, y_n_m1)) PARA CONTROL
-        # Calculo del error local antes de reasignar 
-        e_local = np.abs(y_n_1 - y_n)
-
-        # Reasignación para próximo paso
-        y_n_m1 = y_n
-        y_n = y_n_1
-        
-        # Agregamos los valores al conjunto de filas para la tabla
-        filas_tabla.append([t, y_n_1, e_local])
-    
-    tabla_valores = pd.DataFrame(columns=['t','y_aprox','error_local'], data=filas_tabla)
-    
-    return tabla_valores
+    return paso
 
-def heun(t_inicial, t_final, h, y_inicial, f, eps, itmax):
+def _crear_paso_ab2(f, h):
     """
-    Función que implementa el método de Heun predictor-corrector. Se usa como método predictor el método de Euler explícito (RK1) y como corrector el método de Euler modificado (RK2) o trapecio
+    Función que crea el paso del método de Adam-Bashforth 2. El primer paso se da con Euler explícito (RK1) y luego se reutiliza la derivada del paso anterior en lugar de volver a evaluarla
 
-    :parametros t_inicial: float, valor inicial de t, t_final: float, valor final de t (valor a aproximar), h: float, tamaño del paso, y_inicial: float valor de y inicial para el primer paso f: función derivada del PVI, eps: float, representa la tolerancia en cuanto al error, itmax: int, cantidad máxima de iteraciones que se aceptará
-    :return: DataFrame, tabla de valores de t, y_real, y_aprox, error_global y error_local
+    :parametros f: función derivada del PVI, h: float, tamaño del paso
+    :return: función paso(t_n, t_n_1, y_n) que devuelve (y_n_1, f(t_n, y_n))
     """
-    # Guardamos los valores en listas para luego armar la tabla
-    filas_tabla = []
+    f_n_m1 = None
 
-    # Se agrega la primera linea
-    y_n = y_inicial
-    filas_tabla.append([t_inicial, np.nan, np.nan])
+    def paso(t_n, t_n_1, y_n):
+        nonlocal f_n_m1
+        f_n = f(t_n, y_n)
 
-    # Se calcula el resto de las filas, usando t_final+h para incluir el valor a aproximar. 
-    for t in np.arange(t_inicial+h, t_final+0.5*h, h).round(4):
+        if f_n_m1 is None:
+            # Segundo paso inicial aproximado con Euler explícito
+            y_n_1 = y_n + h*f_n
+        else:
+            y_n_1 = y_n + (h/2)*(3*f_n - f_n_m1)
 
-        it = 0
+        f_n_m1 = f_n
+        return y_n_1, f_n
 
-        # Usamos el método predictor (Euler explícito RK1)
-        y_n_1 = y_n + h*f(t-h, y_n)
+    return paso
 
-        # Calculo del error local antes de aplicar el corrector
-        e_local = np.abs(y_n_1 - y_n)
+def _crear_paso_heun(f, h, eps, itmax, vectorial=False, iteraciones=None):
+    """
+    Función que crea el paso del método de Heun predictor-corrector (predictor Euler explícito, corrector trapecio)
 
-        # print("Del predictor resulta yaprox", y_n_1, "con error local", e_local, "calculado usando",y_n, t-h) PARA CONTROL
-    
+    :parametros f: función derivada del PVI, h: float, tamaño del paso, eps: float, tolerancia del corrector, itmax: int, cantidad máxima de iteraciones del corrector, vectorial: bool, si el estado es un vector se usa la norma máxima del error para decidir si seguir iterando, iteraciones: lista donde se agregan las iteraciones del corrector de cada paso (o None)
+    :return: función paso(t_n, t_n_1, y_n) que devuelve (y_n_1, f(t_n, y_n))
+    """
+    norma = np.max if vectorial else (lambda e: e)
+
+    def paso(t_n, t_n_1, y_n):
+        f_n = f(t_n, y_n)
+
+        # Usamos el método predictor (Euler explícito RK1)
+        y_n_1 = y_n + h*f_n
+        e_local = norma(np.abs(y_n_1 - y_n))
+
+        it = 0
         while it <= itmax and e_local > eps:
-            # Método corrector (Euler modificado RK2)
-            aux_y_ant = y_n_1 # para calcular el error necesitamos almacenar el valor otorgado por el predictor en una primera iteración o por el corrector si se sigue iterando más.
+            # Método corrector (Euler modificado RK2). f(t_n, y_n) no cambia entre iteraciones
+            aux_y_ant = y_n_1
+            y_n_1 = y_n + (h/2)*(f_n + f(t_n_1, y_n_1))
+            e_local = norma(np.abs(y_n_1 - aux_y_ant))
+            it += 1
+
+        if iteraciones is not None:
+            iteraciones.append(it)
 
-            y_n_1 = y_n + (h/2)*(f(t-h, y_n) + f(t, y_n_1))
-            e_local = np.abs(y_n_1 - aux_y_ant)
-            # Notar que y_n sigue correspondiendo al valor del paso anterior ya que no hubo reasignación aún.
+        return y_n_1, f_n
+
+    return paso
+
+def _crear_paso_heun_conjunto(f, h, eps, itmax, iteraciones=None):
+    """
+    Función que crea el paso del método de Heun para un conjunto de condiciones iniciales. Cada miembro sigue iterando el corrector solo mientras su propio error supere eps, igual que en una corrida escalar
+
+    :parametros f: función derivada del PVI (vectorizada), h: float, tamaño del paso, eps: float, tolerancia del corrector, itmax: int, cantidad máxima de iteraciones del corrector, iteraciones: lista donde se agregan las iteraciones del corrector de cada paso (las del miembro que más iteró) o None
+    :return: función paso(t_n, t_n_1, y_n) que devuelve (y_n_1, f(t_n, y_n)), con y_n de forma (M,) o (M, N) para un conjunto de sistemas
+    """
+    def error_por_miembro(e):
+        # En un conjunto de sistemas se toma la norma máxima de cada miembro
+        if e.ndim == 1:
+            return e
+        return e.reshape(len(e), -1).max(axis=1)
 
-            # print("Paso ", t, " Iteración ", it, " Error local ", e_local, "valor corregido", y_n_1) PARA CONTROL
+    def paso(t_n, t_n_1, y_n):
+        f_n = f(t_n, y_n)
 
+        # Predictor (Euler explícito RK1) para todo el conjunto
+        y_n_1 = y_n + h*f_n
+        activos = error_por_miembro(np.abs(y_n_1 - y_n)) > eps
+        forma_mascara = activos.shape + (1,)*(y_n.ndim-1)
+
+        it = 0
+        while it <= itmax and activos.any():
+            # Corrector (trapecio), solo se actualizan los miembros que no convergieron
+            y_corregido = y_n + (h/2)*(f_n + f(t_n_1, y_n_1))
+            e_local = error_por_miembro(np.abs(y_corregido - y_n_1))
+            y_n_1 = np.where(activos.reshape(forma_mascara), y_corregido, y_n_1)
+            activos &= e_local > eps
             it += 1
 
-        # Calculo del error local definitivo del paso
-        e_local = np.abs(y_n_1 - y_n)
+        if iteraciones is not None:
+            iteraciones.append(it)
 
-        # Reasignacion
-        y_n = y_n_1
-        #print("el valor de y_n_1 resultante es ", y_n_1, "paso", t)
-        
-        # Agregamos los valores al conjunto de filas para la tabla
-        filas_tabla.append([t,y_n_1, e_local])
-    
-    tabla_valores = pd.DataFrame(columns=['t','y_aprox','error_local'], data=filas_tabla)
-    
-    return tabla_valores
+        return y_n_1, f_n
+
+    return paso
+
+# Coeficientes de Adams por orden k. Adams-Bashforth (explícito): pesos de f_n, f_n-1, ..., f_n-k+1.
+# Adams-Moulton (implícito): pesos de f_n+1, f_n, ..., f_n-k+2
+COEFICIENTES_ADAMS_BASHFORTH = {
+    2: np.array([3, -1]) / 2,
+    3: np.array([23, -16, 5]) / 12,
+    4: np.array([55, -59, 37, -9]) / 24,
+    5: np.array([1901, -2774, 2616, -1274, 251]) / 720,
+}
+COEFICIENTES_ADAMS_MOULTON = {
+    2: np.array([1, 1]) / 2,
+    3: np.array([5, 8, -1]) / 12,
+    4: np.array([9, 19, -5, 1]) / 24,
+    5: np.array([251, 646, -264, 106, -19]) / 720,
+}
+
+def _crear_paso_abm(f, h, orden=4, modo='PECE'):
+    """
+    Función que crea el paso del predictor-corrector de Adams-Bashforth-Moulton de orden k: predictor Adams-Bashforth de k pasos y
+    corrector Adams-Moulton del mismo orden. Los primeros k-1 pasos se dan con RK4 y las derivadas se guardan en un buffer circular
+    de k lugares, así cada derivada se evalúa una sola vez
+
+    :parametros f: función derivada del PVI, h: float, tamaño del paso, orden: int, orden k del método (2 a 5), modo: str, 'PECE' (se vuelve a evaluar f en el valor corregido, 2 evaluaciones por paso) o 'PEC' (se guarda la derivada del predictor, 1 evaluación por paso)
+    :return: función paso(t_n, t_n_1, y_n) que devuelve (y_n_1, f(t_n, y_n))
+    """
+    if orden not in COEFICIENTES_ADAMS_BASHFORTH:
+        raise ValueError("Orden {} no disponible, usar uno de {}".format(orden, list(COEFICIENTES_ADAMS_BASHFORTH)))
+    if modo not in ('PECE', 'PEC'):
+        raise ValueError("Modo '{}' no disponible, usar 'PECE' o 'PEC'".format(modo))
+
+    # Pesos reordenados según la posición de f_n en el buffer: en la posición p está f_n y en (p - j) % k está f_n-j
+    pesos_bashforth = np.zeros((orden, orden))
+    pesos_moulton = np.zeros((orden, orden))
+    for p in range(orden):
+        for j in range(orden):
+            pesos_bashforth[p, (p - j) % orden] = COEFICIENTES_ADAMS_BASHFORTH[orden][j]
+        for j in range(1, orden):
+            pesos_moulton[p, (p - j + 1) % orden] = COEFICIENTES_ADAMS_MOULTON[orden][j]
+    peso_moulton_nuevo = COEFICIENTES_ADAMS_MOULTON[orden][0]
+
+    derivadas = None
+    combinar = None
+    f_siguiente = None  # derivada en el punto actual ya evaluada en el paso anterior
+    n = 0
+
+    def paso(t_n, t_n_1, y_n):
+        nonlocal derivadas, combinar, f_siguiente, n
+        f_n = f(t_n, y_n) if f_siguiente is None else f_siguiente
+        if derivadas is None:
+            derivadas = np.empty((orden,) + np.shape(f_n))
+            # El producto matricial es mucho más rápido que tensordot, pero solo sirve para escalares y sistemas (no para conjuntos de sistemas)
+            combinar = np.matmul if derivadas.ndim <= 2 else functools.partial(np.tensordot, axes=1)
+        p = n % orden
+        derivadas[p] = f_n
+        n += 1
+
+        if n < orden:
+            # Arranque con RK4 (k1 es la derivada ya guardada)
+            k2 = f(t_n+h/2, y_n + (h/2)*f_n)
+            k3 = f(t_n+h/2, y_n + (h/2)*k2)
+            k4 = f(t_n+h, y_n + h*k3)
+            f_siguiente = None
+            return y_n + (h/6)*(f_n+2*k2+2*k3+k4), f_n
+
+        # P: predictor Adams-Bashforth, E: derivada en el valor predicho
+        y_predicho = y_n + h*combinar(pesos_bashforth[p], derivadas)
+        f_predicho = f(t_n_1, y_predicho)
+
+        # C: corrector Adams-Moulton, E (solo en PECE): derivada en el valor corregido para el paso siguiente
+        y_n_1 = y_n + h*(peso_moulton_nuevo*f_predicho + combinar(pesos_moulton[p], derivadas))
+        f_siguiente = f(t_n_1, y_n_1) if modo == 'PECE' else f_predicho
+
+        return y_n_1, f_n
+
+    return paso
+
+# Métodos implícitos de Runge-Kutta diagonal (DIRK) para problemas rígidos. Los tres son "stiffly accurate" (b es la última
+# fila de A), así que y_n+1 es el valor de la última etapa, y todas sus etapas implícitas tienen el mismo a_ii (gamma),
+# por lo que una sola factorización de I - h*gamma*J sirve para todas las etapas
+_GAMMA_SDIRK2 = 1 - np.sqrt(2)/2
+TABLAS_IMPLICITAS = {
+    # Euler implícito (orden 1, L-estable)
+    'EulerImplicito': {'c': np.array([1.0]), 'A': np.array([[1.0]])},
+    # Trapecio implícito o Crank-Nicolson (orden 2, A-estable): la primera etapa es explícita
+    'TrapecioImplicito': {'c': np.array([0.0, 1.0]), 'A': np.array([[0.0, 0.0], [0.5, 0.5]])},
+    # SDIRK de 2 etapas de Alexander (orden 2, L-estable)
+    'SDIRK2': {'c': np.array([_GAMMA_SDIRK2, 1.0]), 'A': np.array([[_GAMMA_SDIRK2, 0.0], [1 - _GAMMA_SDIRK2, _GAMMA_SDIRK2]])},
+}
+
+def _jacobiano_diferencias_finitas(f, t, y, f_y, por_elemento):
+    """
+    Función que aproxima el jacobiano df/dy con diferencias finitas hacia adelante, con una sola evaluación de f: todos los estados
+    perturbados se pasan juntos como un conjunto, por lo que f debe estar vectorizada (como las de Problemas.py)
+
+    :parametros f: función derivada del PVI, t: float, tiempo, y: float o array, estado (forma (N,), o (M,) o (M, N) en un conjunto), f_y: valor de f(t, y), por_elemento: bool, si cada componente de y es un PVI escalar independiente (escalares y conjuntos de escalares)
+    :return: jacobiano con la forma de y si por_elemento es True, o de forma (..., N, N) si no
+    """
+    delta = np.sqrt(np.finfo(float).eps) * np.maximum(1.0, np.abs(y))
+    if por_elemento:
+        return (f(t, y + delta) - f_y) / delta
+
+    # Fila j de los estados perturbados: y + delta_j e_j (para un conjunto, una matriz de N filas por miembro)
+    n = np.shape(y)[-1]
+    perturbados = y[..., None, :] + np.eye(n) * delta[..., :, None]
+    diferencias = (f(t, perturbados) - f_y[..., None, :]) / delta[..., :, None]
+
+    return np.swapaxes(diferencias, -1, -2)
+
+def _factorizar_newton(jacobiano, h_gamma, por_elemento):
+    """
+    Función que factoriza la matriz de la iteración de Newton, I - h*gamma*J, y devuelve una función que resuelve sistemas con ella
+
+    :parametros jacobiano: jacobiano (ver _jacobiano_diferencias_finitas), h_gamma: float, h por el coeficiente diagonal del método, por_elemento: bool, si el jacobiano es diagonal (un valor por componente)
+    :return: función resolver(r) que devuelve x tal que (I - h*gamma*J) x = r
+    """
+    if por_elemento:
+        matriz = 1.0 - h_gamma*jacobiano
+        return lambda r: r / matriz
+
+    matriz = np.eye(np.shape(jacobiano)[-1]) - h_gamma*jacobiano
+    if matriz.ndim == 2:
+        import scipy.linalg as spl
+        # Sin check_finite para que un jacobiano o un residuo no finito llegue a Newton, que lo detecta y cambia de estrategia
+        lu = spl.lu_factor(matriz, check_finite=False)
+        return lambda r: spl.lu_solve(lu, r, check_finite=False)
+
+    # Conjunto de sistemas: una matriz por miembro. Se guardan las inversas para resolver todo el conjunto con un producto
+    inversas = np.linalg.inv(matriz)
+    return lambda r: np.matmul(inversas, r[..., None])[..., 0]
+
+# Factor sobre itmax de las iteraciones permitidas a Newton completo, el último recurso antes de declarar que la etapa no converge
+ITERACIONES_NEWTON_COMPLETO = 5
+
+def _crear_paso_implicito(f, h, metodo, jacobiano=None, tol=1e-10, itmax=10, conjunto=False, iteraciones=None, registro=None):
+    """
+    Función que crea el paso de un método implícito de TABLAS_IMPLICITAS. Cada etapa implícita se resuelve con Newton simplificado:
+    el jacobiano y la factorización LU se reutilizan entre pasos y solo se recalculan cuando Newton no converge. Si tampoco converge
+    con el jacobiano recién calculado en y_n (por ejemplo en Robertson, donde el jacobiano en y0 no tiene el acoplamiento con y2),
+    la etapa se resuelve con Newton completo, recalculando el jacobiano en cada iterado; si aun así no converge se lanza ValueError
+
+    :parametros f: función derivada del PVI, h: float, tamaño del paso, metodo: str, clave de TABLAS_IMPLICITAS, jacobiano: función jacobiano(t, y) que devuelve df/dy (matriz (N, N), un escalar para PVI escalares, o por miembro en un conjunto); si es None se aproxima con diferencias finitas, tol: float, tolerancia relativa de Newton, itmax: int, cantidad máxima de iteraciones de Newton por etapa, conjunto: bool, si y es un conjunto de condiciones iniciales, iteraciones: lista donde se agregan las iteraciones de Newton de cada paso (o None), registro: Estadisticas donde se cuentan jacobianos y factorizaciones (o None)
+    :return: función paso(t_n, t_n_1, y_n) que devuelve (y_n_1, f(t_n, y_n))
+    """
+    A, c = TABLAS_IMPLICITAS[metodo]['A'], TABLAS_IMPLICITAS[metodo]['c']
+    gamma = A.diagonal().max()
+    por_elemento = None
+    resolver = None
+    jacobiano_actual = False
+
+    def actualizar_jacobiano(t_n, y_n, f_n):
+        nonlocal resolver, jacobiano_actual
+        if jacobiano is not None:
+            matriz_jacobiana = jacobiano(t_n, y_n)
+        else:
+            matriz_jacobiana = _jacobiano_diferencias_finitas(f, t_n, y_n, f_n, por_elemento)
+        resolver = _factorizar_newton(matriz_jacobiana, h*gamma, por_elemento)
+        jacobiano_actual = True
+        if registro is not None:
+            registro.evaluaciones_jacobiano += 1
+            registro.factorizaciones_lu += 1
+
+    def newton(t_i, base, z, completo=False):
+        # Resuelve z = base + h*gamma*f(t_i, z). Con completo=True el jacobiano se recalcula en cada iterado y se permiten más
+        # iteraciones: lejos de la solución Newton avanza lento (en Robertson y2 se reduce a la mitad por iteración)
+        # Un iterado que diverge se detecta por el paso no finito, sin avisos de desborde de numpy
+        with np.errstate(over='ignore', invalid='ignore', divide='ignore'):
+            for it in range(1, (ITERACIONES_NEWTON_COMPLETO if completo else 1)*itmax + 1):
+                f_z = f(t_i, z)
+                if completo:
+                    actualizar_jacobiano(t_i, z, f_z)
+                dz = resolver(base + (h*gamma)*f_z - z)
+                z = z + dz
+                norma_dz, norma_z = np.max(np.abs(dz)), np.max(np.abs(z))
+                if not np.isfinite(norma_dz + norma_z):
+                    break
+                if norma_dz <= tol*(1 + norma_z):
+                    return z, it, True
+        return z, it, False
+
+    def paso(t_n, t_n_1, y_n):
+        nonlocal por_elemento, jacobiano_actual
+        f_n = f(t_n, y_n)
+        if resolver is None:
+            por_elemento = np.ndim(y_n) == 0 or (conjunto and np.ndim(y_n) == 1)
+            actualizar_jacobiano(t_n, y_n, f_n)
+
+        k = []
+        total_iteraciones = 0
+        for i in range(len(c)):
+            base = y_n
+            for j in range(i):
+                base = base + (h*A[i, j])*k[j]
+
+            if A[i, i] == 0:
+                # Etapa explícita (la primera del trapecio: k = f(t_n, y_n))
+                k.append(f_n if c[i] == 0 else f(t_n + c[i]*h, base))
+                continue
+
+            # Valor inicial de Newton: un paso de Euler desde base con la última pendiente conocida
+            z_inicial = base + (h*gamma)*(k[-1] if k else f_n)
+            z, it, convergio = newton(t_n + c[i]*h, base, z_inicial)
+            if not convergio and not jacobiano_actual:
+                # Jacobiano viejo: se recalcula en el punto actual y se repite la etapa
+                actualizar_jacobiano(t_n, y_n, f_n)
+                z, it_nuevo, convergio = newton(t_n + c[i]*h, base, z_inicial)
+                it += it_nuevo
+            if not convergio:
+                # Newton completo desde base, que siempre es finito: en los problemas rígidos el valor inicial de Euler puede estar
+                # muy lejos de la solución (o ser infinito)
+                z, it_nuevo, convergio = newton(t_n + c[i]*h, base, base, completo=True)
+                it += it_nuevo
+            if not convergio:
+                raise ValueError("Newton no convergió en el paso t_n = {} con h = {} ({}): usar un h menor o aumentar itmax".format(t_n, h, metodo))
+            total_iteraciones += it
+
+            # Pendiente de la etapa sin volver a evaluar f: z = base + h*gamma*k
+            k.append((z - base) / (h*gamma))
+
+        jacobiano_actual = False
+        if iteraciones is not None:
+            iteraciones.append(total_iteraciones)
+
+        return z, f_n
+
+    return paso
+
+def _crear_paso_euler_implicito(f, h, **opciones):
+    """Paso de Euler implícito (ver _crear_paso_implicito)"""
+    return _crear_paso_implicito(f, h, 'EulerImplicito', **opciones)
+
+def _crear_paso_trapecio_implicito(f, h, **opciones):
+    """Paso del trapecio implícito (ver _crear_paso_implicito)"""
+    return _crear_paso_implicito(f, h, 'TrapecioImplicito', **opciones)
+
+def _crear_paso_sdirk2(f, h, **opciones):
+    """Paso del SDIRK de 2 etapas (ver _crear_paso_implicito)"""
+    return _crear_paso_implicito(f, h, 'SDIRK2', **opciones)
+
+def _derivada_lineal(t, y, matriz):
+    """Derivada de un sistema lineal de coeficientes constantes: dy/dt = A y, con y de forma (N,) o (M, N) (o escalar si A es escalar)"""
+    return matriz * y if np.ndim(matriz) == 0 else y @ matriz.T
+
+def _crear_paso_exponencial(f, h, matriz):
+    """
+    Función que crea el paso exacto de un sistema lineal de coeficientes constantes dy/dt = A y (integrador exponencial):
+    y_n+1 = expm(A (t_n+1 - t_n)) y_n, un producto matriz-vector por paso. La exponencial se calcula una sola vez por cada
+    largo de paso distinto de la malla (por el redondeo de la malla suelen ser uno o dos)
+
+    :parametros f: función derivada del PVI (no se evalúa: la derivada es A y), h: float, tamaño del paso, matriz: float o array (N, N), matriz de tasas A
+    :return: función paso(t_n, t_n_1, y_n) que devuelve (y_n_1, f(t_n, y_n))
+    """
+    matriz = np.asarray(matriz, dtype=float)
+    if matriz.ndim == 0:
+        tasa = float(matriz)
+
+        @functools.lru_cache(maxsize=None)
+        def propagador(dt):
+            return np.exp(tasa*dt)
+
+        def paso(t_n, t_n_1, y_n):
+            return propagador(t_n_1 - t_n) * y_n, tasa * y_n
+
+        return paso
+
+    import scipy.linalg as spl
+
+    # Se trabaja con las transpuestas para que y pueda ser (N,) o un conjunto (M, N)
+    transpuesta = matriz.T.copy()
+
+    @functools.lru_cache(maxsize=None)
+    def propagador(dt):
+        return spl.expm(matriz*dt).T.copy()
+
+    def paso(t_n, t_n_1, y_n):
+        return y_n @ propagador(t_n_1 - t_n), y_n @ transpuesta
+
+    return paso
+
+# Pasos disponibles para los métodos de paso fijo, usados por integrar_conjunto
+METODOS_PASO_FIJO = {
+    'RK2': _crear_paso_rk2,
+    'RK4': _crear_paso_rk4,
+    'AB2': _crear_paso_ab2,
+    'Heun': _crear_paso_heun_conjunto,
+    'ABM': _crear_paso_abm,
+    'EulerImplicito': functools.partial(_crear_paso_euler_implicito, conjunto=True),
+    'TrapecioImplicito': functools.partial(_crear_paso_trapecio_implicito, conjunto=True),
+    'SDIRK2': functools.partial(_crear_paso_sdirk2, conjunto=True),
+    'Exponencial': _crear_paso_exponencial,
+}
+
+# Métodos de scipy.integrate.solve_ivp que se pueden usar con resolver_con_scipy
+METODOS_SCIPY = ('RK45', 'RK23', 'DOP853', 'Radau', 'BDF', 'LSODA')
+
+def _crear_paso(metodo, f, h, y_inicial, **opciones):
+    """
+    Función que crea el paso de un método de paso fijo para una corrida individual (escalar o sistema)
+
+    :parametros metodo: str, nombre del método en METODOS_PASO_FIJO, f: función derivada del PVI, h: float, tamaño del paso, y_inicial: float o array, valor inicial, opciones: argumentos propios del método (eps e itmax para Heun, orden y modo para ABM, jacobiano, tol e itmax para los implícitos, matriz para Exponencial)
+    :return: función paso(t_n, t_n_1, y_n) que devuelve (y_n_1, f(t_n, y_n))
+    """
+    if metodo == 'Heun':
+        return _crear_paso_heun(f, h, vectorial=np.ndim(y_inicial) > 0, **opciones)
+    if metodo in TABLAS_IMPLICITAS:
+        return _crear_paso_implicito(f, h, metodo, **opciones)
+    return METODOS_PASO_FIJO[metodo](f, h, **opciones)
+
+def _resolver_paso_fijo(metodo, t_inicial, t_final, h, y_inicial, f, como_tabla, interpolante, estadisticas, conjunto=False, **opciones):
+    """
+    Función que arma y ejecuta una corrida de paso fijo, registrando tiempo, evaluaciones de f, iteraciones del corrector (o de Newton) y jacobianos si se piden estadísticas
+
+    :parametros metodo: str, nombre del método en METODOS_PASO_FIJO, t_inicial: float, valor inicial de t, t_final: float, valor final de t, h: float, tamaño del paso, y_inicial: float o array, valor inicial ya normalizado, f: función derivada del PVI, como_tabla: bool, si es True devuelve un Resultado, interpolante: bool, si es True también se devuelve el interpolante, estadisticas: bool, si es True también se devuelve un objeto Estadisticas, conjunto: bool, si y_inicial es un conjunto de condiciones iniciales, opciones: argumentos propios del método (eps e itmax para Heun, orden y modo para ABM, jacobiano, tol e itmax para los implícitos, matriz para Exponencial)
+    :return: salida del motor de paso fijo, con las Estadisticas al final si se pidieron
+    """
+    registro = None
+    if estadisticas:
+        registro = Estadisticas(metodo)
+        f = ContadorEvaluaciones(f)
+        if metodo == 'Heun' or metodo in TABLAS_IMPLICITAS:
+            opciones['iteraciones'] = []
+        if metodo in TABLAS_IMPLICITAS:
+            registro.evaluaciones_jacobiano = 0
+            registro.factorizaciones_lu = 0
+            opciones['registro'] = registro
+        inicio = time.perf_counter()
+
+    if conjunto:
+        paso = METODOS_PASO_FIJO[metodo](f, h, **opciones)
+    else:
+        paso = _crear_paso(metodo, f, h, y_inicial, **opciones)
+
+    resultado = _integrar_paso_fijo(paso, f, t_inicial, t_final, h, y_inicial, como_tabla, interpolante, registro=registro, metodo=metodo)
+    if registro is None:
+        return resultado
+
+    registro.tiempo_pared = time.perf_counter() - inicio
+    registro.evaluaciones_f = f.evaluaciones
+    if 'iteraciones' in opciones:
+        registro.iteraciones_corrector = np.array(opciones['iteraciones'])
+
+    return resultado + (registro,) if interpolante else (resultado, registro)
+
+def runge_kutta_2_trapecio(t_inicial, t_final, h, y_inicial, f, como_tabla=True, interpolante=False, estadisticas=False):
+    """
+    Función que implementa el método del trapecio o Euler modificado (Runge-Kutta de segundo orden)
+    :parametros t_inicial: float, valor inicial de t, t_final: float, valor final de t (valor a aproximar), h: float, tamaño del paso, y_inicial: float o array (vector de estado de un sistema), valor inicial para el primer paso, f: función derivada del PVI, como_tabla: bool, si es False se devuelven los arrays (t, y_aprox, error_local) sin armar el Resultado, interpolante: bool, si es True también se devuelve un InterpolanteHermite para consultar la solución en cualquier t, estadisticas: bool, si es True también se devuelve un objeto Estadisticas (tiempo, evaluaciones de f, pasos)
+    :return: Resultado, tabla de valores de t, y_aprox y error_local (si se pide interpolante o estadisticas, tupla con la tabla y luego esos objetos en ese orden)
+    """
+    return _resolver_paso_fijo('RK2', t_inicial, t_final, h, _estado_inicial(y_inicial), f, como_tabla, interpolante, estadisticas)
+
+def runge_kutta_4(t_inicial, t_final, h, y_inicial, f, como_tabla=True, interpolante=False, estadisticas=False):
+    """
+    Función que implementa el método de Runge-Kutta de cuarto orden
+    :parametros t_inicial: float, valor inicial de t, t_final: float, valor final de t (valor a aproximar), h: float, tamaño del paso, y_inicial: float o array (vector de estado de un sistema), valor de y inicial para el primer paso, f: función derivada del PVI, como_tabla: bool, si es False se devuelven los arrays (t, y_aprox, error_local) sin armar el Resultado, interpolante: bool, si es True también se devuelve un InterpolanteHermite para consultar la solución en cualquier t, estadisticas: bool, si es True también se devuelve un objeto Estadisticas (tiempo, evaluaciones de f, pasos)
+    :return: Resultado, tabla de valores de t, y_aprox y error_local (si se pide interpolante o estadisticas, tupla con la tabla y luego esos objetos en ese orden)
+    """
+    return _resolver_paso_fijo('RK4', t_inicial, t_final, h, _estado_inicial(y_inicial), f, como_tabla, interpolante, estadisticas)
+
+def adam_bashforth_2_con_euler_RK1_explicito(t_inicial, t_final, h, y_inicial, f, como_tabla=True, interpolante=False, estadisticas=False):
+    """
+    Función que implementa el método de Adam-Bashforth 2, usando para el segundo paso inicial el método de Euler explícito (RK1)
+
+    :parametros t_inicial: float, valor inicial de t, t_final: float, valor final de t (valor a aproximar), h: float, tamaño del paso, y_inicial: float o array (vector de estado de un sistema), valor de y inicial para el primer paso inicial f: función derivada del PVI, como_tabla: bool, si es False se devuelven los arrays (t, y_aprox, error_local) sin armar el Resultado, interpolante: bool, si es True también se devuelve un InterpolanteHermite para consultar la solución en cualquier t, estadisticas: bool, si es True también se devuelve un objeto Estadisticas (tiempo, evaluaciones de f, pasos)
+    :return: Resultado, tabla de valores de t, y_aprox y error_local (si se pide interpolante o estadisticas, tupla con la tabla y luego esos objetos en ese orden)
+    """
+    return _resolver_paso_fijo('AB2', t_inicial, t_final, h, _estado_inicial(y_inicial), f, como_tabla, interpolante, estadisticas)
+
+def heun(t_inicial, t_final, h, y_inicial, f, eps, itmax, como_tabla=True, interpolante=False, estadisticas=False):
+    """
+    Función que implementa el método de Heun predictor-corrector. Se usa como método predictor el método de Euler explícito (RK1) y como corrector el método de Euler modificado (RK2) o trapecio
+
+    :parametros t_inicial: float, valor inicial de t, t_final: float, valor final de t (valor a aproximar), h: float, tamaño del paso, y_inicial: float o array (vector de estado de un sistema), valor de y inicial para el primer paso f: función derivada del PVI, eps: float, representa la tolerancia en cuanto al error, itmax: int, cantidad máxima de iteraciones que se aceptará, como_tabla: bool, si es False se devuelven los arrays (t, y_aprox, error_local) sin armar el Resultado, interpolante: bool, si es True también se devuelve un InterpolanteHermite para consultar la solución en cualquier t, estadisticas: bool, si es True también se devuelve un objeto Estadisticas (tiempo, evaluaciones de f, pasos e iteraciones del corrector en cada paso)
+    :return: Resultado, tabla de valores de t, y_aprox y error_local (si se pide interpolante o estadisticas, tupla con la tabla y luego esos objetos en ese orden)
+    """
+    return _resolver_paso_fijo('Heun', t_inicial, t_final, h, _estado_inicial(y_inicial), f, como_tabla, interpolante, estadisticas, eps=eps, itmax=itmax)
+
+def adams_bashforth_moulton(t_inicial, t_final, h, y_inicial, f, orden=4, modo='PECE', como_tabla=True, interpolante=False, estadisticas=False):
+    """
+    Función que implementa el predictor-corrector de Adams-Bashforth-Moulton de orden 2 a 5, con arranque RK4. En modo 'PEC' hace una sola evaluación de f por paso, lo que conviene cuando f es cara
 
-def resolver_con_scipy(metodo, dya, t_inicial, t_final, y_inicial, rtol=1e-3, atol=1e-6):
+    :parametros t_inicial: float, valor inicial de t, t_final: float, valor final de t (valor a aproximar), h: float, tamaño del paso, y_inicial: float o array (vector de estado de un sistema), valor inicial para el primer paso, f: función derivada del PVI, orden: int, orden del método (2 a 5), modo: str, 'PECE' o 'PEC', como_tabla: bool, si es False se devuelven los arrays (t, y_aprox, error_local) sin armar el Resultado, interpolante: bool, si es True también se devuelve un InterpolanteHermite para consultar la solución en cualquier t, estadisticas: bool, si es True también se devuelve un objeto Estadisticas (tiempo, evaluaciones de f, pasos)
+    :return: Resultado, tabla de valores de t, y_aprox y error_local (si se pide interpolante o estadisticas, tupla con la tabla y luego esos objetos en ese orden)
+    """
+    return _resolver_paso_fijo('ABM', t_inicial, t_final, h, _estado_inicial(y_inicial), f, como_tabla, interpolante, estadisticas, orden=orden, modo=modo)
+
+def euler_implicito(t_inicial, t_final, h, y_inicial, f, jacobiano=None, tol=1e-10, itmax=10, como_tabla=True, interpolante=False, estadisticas=False):
+    """
+    Función que implementa el método de Euler implícito (orden 1, L-estable), para problemas rígidos. Cada paso resuelve las etapas implícitas con Newton simplificado, reutilizando el jacobiano y su factorización LU mientras Newton converja
+
+    :parametros t_inicial: float, valor inicial de t, t_final: float, valor final de t (valor a aproximar), h: float, tamaño del paso, y_inicial: float o array (vector de estado de un sistema), valor inicial para el primer paso, f: función derivada del PVI (vectorizada si no se da el jacobiano), jacobiano: función jacobiano(t, y) con df/dy (si es None se aproxima con diferencias finitas), tol: float, tolerancia relativa de Newton, itmax: int, cantidad máxima de iteraciones de Newton por etapa, como_tabla: bool, si es False se devuelven los arrays (t, y_aprox, error_local) sin armar el Resultado, interpolante: bool, si es True también se devuelve un InterpolanteHermite para consultar la solución en cualquier t, estadisticas: bool, si es True también se devuelve un objeto Estadisticas (tiempo, evaluaciones de f, iteraciones de Newton en cada paso, jacobianos y factorizaciones)
+    :return: Resultado, tabla de valores de t, y_aprox y error_local (si se pide interpolante o estadisticas, tupla con la tabla y luego esos objetos en ese orden)
+    """
+    return _resolver_paso_fijo('EulerImplicito', t_inicial, t_final, h, _estado_inicial(y_inicial), f, como_tabla, interpolante, estadisticas, jacobiano=jacobiano, tol=tol, itmax=itmax)
+
+def trapecio_implicito(t_inicial, t_final, h, y_inicial, f, jacobiano=None, tol=1e-10, itmax=10, como_tabla=True, interpolante=False, estadisticas=False):
+    """
+    Función que implementa el método del trapecio implícito o Crank-Nicolson (orden 2, A-estable), para problemas rígidos. Cada paso resuelve las etapas implícitas con Newton simplificado, reutilizando el jacobiano y su factorización LU mientras Newton converja
+
+    :parametros t_inicial: float, valor inicial de t, t_final: float, valor final de t (valor a aproximar), h: float, tamaño del paso, y_inicial: float o array (vector de estado de un sistema), valor inicial para el primer paso, f: función derivada del PVI (vectorizada si no se da el jacobiano), jacobiano: función jacobiano(t, y) con df/dy (si es None se aproxima con diferencias finitas), tol: float, tolerancia relativa de Newton, itmax: int, cantidad máxima de iteraciones de Newton por etapa, como_tabla: bool, si es False se devuelven los arrays (t, y_aprox, error_local) sin armar el Resultado, interpolante: bool, si es True también se devuelve un InterpolanteHermite para consultar la solución en cualquier t, estadisticas: bool, si es True también se devuelve un objeto Estadisticas (tiempo, evaluaciones de f, iteraciones de Newton en cada paso, jacobianos y factorizaciones)
+    :return: Resultado, tabla de valores de t, y_aprox y error_local (si se pide interpolante o estadisticas, tupla con la tabla y luego esos objetos en ese orden)
+    """
+    return _resolver_paso_fijo('TrapecioImplicito', t_inicial, t_final, h, _estado_inicial(y_inicial), f, como_tabla, interpolante, estadisticas, jacobiano=jacobiano, tol=tol, itmax=itmax)
+
+def sdirk2(t_inicial, t_final, h, y_inicial, f, jacobiano=None, tol=1e-10, itmax=10, como_tabla=True, interpolante=False, estadisticas=False):
+    """
+    Función que implementa el método SDIRK de 2 etapas de Alexander (orden 2, L-estable), para problemas rígidos. Cada paso resuelve las etapas implícitas con Newton simplificado, reutilizando el jacobiano y su factorización LU mientras Newton converja
+
+    :parametros t_inicial: float, valor inicial de t, t_final: float, valor final de t (valor a aproximar), h: float, tamaño del paso, y_inicial: float o array (vector de estado de un sistema), valor inicial para el primer paso, f: función derivada del PVI (vectorizada si no se da el jacobiano), jacobiano: función jacobiano(t, y) con df/dy (si es None se aproxima con diferencias finitas), tol: float, tolerancia relativa de Newton, itmax: int, cantidad máxima de iteraciones de Newton por etapa, como_tabla: bool, si es False se devuelven los arrays (t, y_aprox, error_local) sin armar el Resultado, interpolante: bool, si es True también se devuelve un InterpolanteHermite para consultar la solución en cualquier t, estadisticas: bool, si es True también se devuelve un objeto Estadisticas (tiempo, evaluaciones de f, iteraciones de Newton en cada paso, jacobianos y factorizaciones)
+    :return: Resultado, tabla de valores de t, y_aprox y error_local (si se pide interpolante o estadisticas, tupla con la tabla y luego esos objetos en ese orden)
+    """
+    return _resolver_paso_fijo('SDIRK2', t_inicial, t_final, h, _estado_inicial(y_inicial), f, como_tabla, interpolante, estadisticas, jacobiano=jacobiano, tol=tol, itmax=itmax)
+
+def exponencial_lineal(t_inicial, t_final, h, y_inicial, matriz, como_tabla=True, interpolante=False, estadisticas=False):
+    """
+    Función que resuelve un sistema lineal de coeficientes constantes dy/dt = A y (decaimiento del C14 con A = -LAMBDA, cadenas de Bateman)
+    avanzando con la exponencial de la matriz precalculada: la solución en los nodos es exacta salvo redondeo y cada paso es un producto matriz-vector
+
+    :parametros t_inicial: float, valor inicial de t, t_final: float, valor final de t (valor a aproximar), h: float, tamaño del paso, y_inicial: float o array (vector de estado de un sistema), valor inicial para el primer paso, matriz: float o array (N, N), matriz de tasas A, como_tabla: bool, si es False se devuelven los arrays (t, y_aprox, error_local) sin armar el Resultado, interpolante: bool, si es True también se devuelve un InterpolanteHermite para consultar la solución en cualquier t (para valores exactos fuera de los nodos usar solucion_lineal), estadisticas: bool, si es True también se devuelve un objeto Estadisticas (tiempo, pasos)
+    :return: Resultado, tabla de valores de t, y_aprox y error_local (si se pide interpolante o estadisticas, tupla con la tabla y luego esos objetos en ese orden)
+    """
+    matriz = np.asarray(matriz, dtype=float)
+    f = functools.partial(_derivada_lineal, matriz=matriz)
+    return _resolver_paso_fijo('Exponencial', t_inicial, t_final, h, _estado_inicial(y_inicial), f, como_tabla, interpolante, estadisticas, matriz=matriz)
+
+def solucion_lineal(matriz, t_inicial, y_inicial, cond_max=1e8):
+    """
+    Función que crea la solución exacta de un sistema lineal de coeficientes constantes, y(t) = expm(A (t - t_inicial)) y_inicial,
+    evaluable en cualquier conjunto de tiempos de una vez. Con A diagonalizable (A = V diag(λ) V^-1) se usa y(t) = V (e^(λ (t - t_inicial)) c),
+    con c = V^-1 y_inicial; si V está mal condicionada (autovalores repetidos o muy cercanos) se calcula expm para cada t. Sirve como
+    solución de referencia para Errores.py cuando no hay una fórmula cerrada escrita a mano
+
+    :parametros matriz: float o array (N, N), matriz de tasas A, t_inicial: float, tiempo del valor inicial, y_inicial: float o array (N,), valor inicial, cond_max: float, número de condición máximo de V para usar la descomposición
+    :return: función exacta(t) vectorizada: devuelve la forma de t si el problema es escalar, o (N,) / (len(t), N) si es un sistema
+    """
+    matriz = np.asarray(matriz, dtype=float)
+    y_inicial = np.asarray(y_inicial, dtype=float)
+
+    if matriz.ndim == 0:
+        def exacta(t):
+            return y_inicial * np.exp(matriz * (np.asarray(t, dtype=float) - t_inicial))
+        return exacta
+
+    autovalores, autovectores = np.linalg.eig(matriz)
+    if np.linalg.cond(autovectores) < cond_max:
+        coeficientes = np.linalg.solve(autovectores, y_inicial)
+        # Se multiplica por V transpuesta para que el eje de las componentes quede último
+        autovectores_t = autovectores.T * coeficientes[:, None]
+
+        def exacta(t):
+            exponenciales = np.exp(np.multiply.outer(np.asarray(t, dtype=float) - t_inicial, autovalores))
+            return (exponenciales @ autovectores_t).real
+        return exacta
+
+    import scipy.linalg as spl
+
+    def exacta(t):
+        # expm acepta una pila de matrices (..., N, N)
+        return spl.expm(np.multiply.outer(np.asarray(t, dtype=float) - t_inicial, matriz)) @ y_inicial
+    return exacta
+
+def integrar_conjunto(metodo, t_inicial, t_final, h, y_inicial, f, parametros=None, interpolante=False, estadisticas=False, **opciones):
+    """
+    Función que integra un conjunto de PVI (por ejemplo, muchas muestras a fechar) en una sola corrida. Cada paso avanza a todo el conjunto con operaciones de NumPy, por lo que f debe estar vectorizada
+
+    :parametros metodo: str, nombre del método ('RK2', 'RK4', 'AB2', 'Heun', 'ABM', 'EulerImplicito', 'TrapecioImplicito', 'SDIRK2', 'Exponencial')
+                t_inicial: float, valor inicial de t
+                t_final: float, valor final de t, común a todo el conjunto (si cada muestra tiene su propio R_REMANENTE se usa el mayor horizonte)
+                h: float, tamaño del paso
+                y_inicial: array de forma (M,), valores iniciales de cada miembro, o (M, N) si cada miembro es un sistema de N componentes
+                f: función derivada del PVI, f(t, y, **parametros), con y de forma (M,) o (M, N)
+                parametros: dict, parámetros por miembro (arrays de forma (M,) o escalares) que se pasan a f, por ejemplo {'lam': valores_lambda}
+                interpolante: bool, si es True también se devuelve un InterpolanteHermite de todo el conjunto
+                estadisticas: bool, si es True también se devuelve un objeto Estadisticas
+                opciones: argumentos propios del método (eps e itmax para Heun, orden y modo para ABM, jacobiano, tol e itmax para los implícitos, matriz para Exponencial)
+    :return: tupla de arrays (t, y_aprox, error_local), con y_aprox y error_local de forma (pasos, M) o (pasos, M, N). Si se pide interpolante o estadisticas, tupla con los arrays y luego esos objetos en ese orden
+    """
+    if metodo not in METODOS_PASO_FIJO:
+        raise ValueError("Método '{}' no disponible, usar uno de {}".format(metodo, list(METODOS_PASO_FIJO)))
+
+    if parametros:
+        f = functools.partial(f, **parametros)
+
+    y_inicial = np.asarray(y_inicial, dtype=float)
+
+    return _resolver_paso_fijo(metodo, t_inicial, t_final, h, y_inicial, f, False, interpolante, estadisticas, conjunto=True, **opciones)
+
+def _malla_paso_fijo_por_bloques(t_inicial, t_final, h, tamano_bloque):
+    """
+    Función que genera la malla de _malla_paso_fijo (sin t_inicial) de a bloques, sin armarla entera. Se calcula igual que np.arange
+    (inicio + i*delta) para que los valores coincidan exactamente
+
+    :parametros t_inicial: float, valor inicial de t, t_final: float, valor final de t, h: float, tamaño del paso, tamano_bloque: int, cantidad de valores por bloque
+    :return: generador de arrays con los valores de t de cada bloque
+    """
+    inicio = t_inicial + h
+    delta = (inicio + h) - inicio
+    n_pasos = max(int(np.ceil((t_final + 0.5*h - inicio) / h)), 0)
+
+    for i0 in range(0, n_pasos, tamano_bloque):
+        yield (inicio + np.arange(i0, min(i0 + tamano_bloque, n_pasos))*delta).round(4)
+
+def integrar_por_bloques(metodo, t_inicial, t_final, h, y_inicial, f, tamano_bloque=65536, decimacion=1, solo_final=False, **opciones):
+    """
+    Función que integra un PVI con un método de paso fijo sin guardar toda la trayectoria: genera bloques de (t, y_aprox, error_local)
+    a medida que avanza, así la memoria usada no depende de la cantidad de pasos. Los valores son los mismos que en la tabla de la versión completa
+
+    :parametros metodo: str, nombre del método ('RK2', 'RK4', 'AB2', 'Heun', 'ABM', 'EulerImplicito', 'TrapecioImplicito', 'SDIRK2', 'Exponencial')
+                t_inicial: float, valor inicial de t
+                t_final: float, valor final de t (valor a aproximar)
+                h: float, tamaño del paso
+                y_inicial: float o array (vector de estado de un sistema), valor inicial
+                f: función derivada del PVI
+                tamano_bloque: int, cantidad de pasos que se calculan por bloque
+                decimacion: int, se conserva una fila de cada decimacion (más la fila inicial y la final)
+                solo_final: bool, si es True no se generan bloques intermedios y solo se genera uno con la última fila
+                opciones: argumentos propios del método (eps e itmax para Heun, orden y modo para ABM, jacobiano, tol e itmax para los implícitos, matriz para Exponencial)
+    :return: generador de tuplas de arrays (t, y_aprox, error_local). El primer bloque empieza con la fila de t_inicial (y_aprox y error_local NaN)
+    """
+    if metodo not in METODOS_PASO_FIJO:
+        raise ValueError("Método '{}' no disponible, usar uno de {}".format(metodo, list(METODOS_PASO_FIJO)))
+
+    y_inicial = _estado_inicial(y_inicial)
+    forma = np.shape(y_inicial)
+    paso = _crear_paso(metodo, f, h, y_inicial, **opciones)
+
+    if not solo_final:
+        yield np.array([t_inicial], dtype=float), np.full((1,) + forma, np.nan), np.full((1,) + forma, np.nan)
+
+    t_n = t_inicial
+    y_n = y_inicial
+    ultimo = None
+    valores_y = np.empty((tamano_bloque,) + forma)
+    errores_locales = np.empty_like(valores_y)
+    i_global = 0
+
+    for bloque_t in _malla_paso_fijo_por_bloques(t_inicial, t_final, h, tamano_bloque):
+        n = len(bloque_t)
+        if not solo_final:
+            # Cada bloque que se entrega tiene sus propios arreglos; en modo solo_final se reutilizan siempre los mismos
+            valores_y = np.empty((n,) + forma)
+            errores_locales = np.empty_like(valores_y)
+
+        for i, t_n_1 in enumerate(bloque_t.tolist()):
+            y_n_1, _ = paso(t_n, t_n_1, y_n)
+            valores_y[i] = y_n_1
+            errores_locales[i] = np.abs(y_n_1 - y_n)
+            t_n, y_n = t_n_1, y_n_1
+
+        i_global += n
+        ultimo = (bloque_t[-1:], valores_y[n-1:n].copy(), errores_locales[n-1:n].copy())
+        if solo_final:
+            continue
+
+        if decimacion > 1:
+            # Índices globales de las filas conservadas: múltiplos de decimacion (la fila 0 es la de t_inicial)
+            indices = np.arange((-(i_global - n + 1)) % decimacion, n, decimacion)
+            yield bloque_t[indices], valores_y[indices], errores_locales[indices]
+        else:
+            yield bloque_t, valores_y[:n], errores_locales[:n]
+
+    if ultimo is None:
+        # Malla sin pasos: solo está la fila inicial
+        if solo_final:
+            yield np.array([t_inicial], dtype=float), np.full((1,) + forma, np.nan), np.full((1,) + forma, np.nan)
+        return
+
+    if solo_final or (decimacion > 1 and i_global % decimacion != 0):
+        # La última fila se entrega siempre, aunque no caiga en la decimación
+        yield ultimo
+
+# Pares encajados de Runge-Kutta para el control adaptativo de paso: coeficientes c, matriz A,
+# pesos b del método que se propaga, pesos b_encajado del otro método del par y menor orden del par
+PARES_ENCAJADOS = {
+    # Heun-Euler: trapecio (orden 2) con Euler explícito (orden 1) como estimador
+    'RK2(1)': {
+        'c': np.array([0.0, 1.0]),
+        'A': np.array([[0.0, 0.0],
+                       [1.0, 0.0]]),
+        'b': np.array([1/2, 1/2]),
+        'b_encajado': np.array([1.0, 0.0]),
+        'orden_menor': 1,
+    },
+    # Runge-Kutta-Fehlberg: se propaga la solución de orden 4 y la de orden 5 estima el error
+    'RK4(5)': {
+        'c': np.array([0.0, 1/4, 3/8, 12/13, 1.0, 1/2]),
+        'A': np.array([[0.0, 0.0, 0.0, 0.0, 0.0, 0.0],
+                       [1/4, 0.0, 0.0, 0.0, 0.0, 0.0],
+                       [3/32, 9/32, 0.0, 0.0, 0.0, 0.0],
+                       [1932/2197, -7200/2197, 7296/2197, 0.0, 0.0, 0.0],
+                       [439/216, -8.0, 3680/513, -845/4104, 0.0, 0.0],
+                       [-8/27, 2.0, -3544/2565, 1859/4104, -11/40, 0.0]]),
+        'b': np.array([25/216, 0.0, 1408/2565, 2197/4104, -1/5, 0.0]),
+        'b_encajado': np.array([16/135, 0.0, 6656/12825, 28561/56430, -9/50, 2/55]),
+        'orden_menor': 4,
+    },
+}
+
+def _norma_escalada(valores, escala):
+    """
+    Función que calcula la norma RMS de un vector dividido por la escala de tolerancias (igual que solve_ivp)
+
+    :parametros valores: array, vector a medir, escala: array, atol + rtol*|y| por componente
+    :return: float, norma RMS escalada
+    """
+    return np.sqrt(np.mean((valores / escala)**2))
+
+def _paso_inicial(f, t_inicial, y_inicial, f_inicial, orden, rtol, atol):
+    """
+    Función que estima un primer tamaño de paso a partir de la derivada en el punto inicial (mismo criterio que solve_ivp)
+
+    :parametros f: función derivada del PVI, t_inicial: float, valor inicial de t, y_inicial: array, valor inicial, f_inicial: array, f(t_inicial, y_inicial), orden: int, orden del estimador de error, rtol: float, tolerancia relativa, atol: float, tolerancia absoluta
+    :return: float, tamaño del primer paso
+    """
+    escala = atol + rtol*np.abs(y_inicial)
+    d0 = _norma_escalada(y_inicial, escala)
+    d1 = _norma_escalada(f_inicial, escala)
+    h0 = 1e-6 if d0 < 1e-5 or d1 < 1e-5 else 0.01*d0/d1
+
+    # Se da un paso de Euler de prueba para estimar la segunda derivada
+    f_prueba = f(t_inicial + h0, y_inicial + h0*f_inicial)
+    d2 = _norma_escalada(f_prueba - f_inicial, escala) / h0
+
+    if max(d1, d2) <= 1e-15:
+        h1 = max(1e-6, h0*1e-3)
+    else:
+        h1 = (0.01 / max(d1, d2))**(1/(orden+1))
+
+    return min(100*h0, h1)
+
+def runge_kutta_adaptativo(t_inicial, t_final, y_inicial, f, par='RK4(5)', rtol=1e-3, atol=1e-6, h_inicial=None, h_max=np.inf, como_tabla=True, interpolante=False, estadisticas=False):
+    """
+    Función que implementa un Runge-Kutta con control adaptativo de paso usando un par encajado. En cada paso la diferencia entre las dos soluciones del par estima el error y el paso se acepta solo si ese error escalado (atol + rtol*|y|) es menor que 1
+
+    :parametros t_inicial: float, valor inicial de t
+                t_final: float, valor final de t
+                y_inicial: float o array (vector de estado de un sistema), valor inicial
+                f: función derivada del PVI
+                par: str, par encajado a usar ('RK2(1)' o 'RK4(5)')
+                rtol: float, tolerancia relativa (por defecto 1e-3, igual que resolver_con_scipy)
+                atol: float, tolerancia absoluta (por defecto 1e-6, igual que resolver_con_scipy)
+                h_inicial: float, tamaño del primer paso (si es None se estima)
+                h_max: float, tamaño de paso máximo
+                como_tabla: bool, si es False se devuelven los arrays (t, y_aprox, error_local) sin armar el Resultado
+                interpolante: bool, si es True también se devuelve un InterpolanteHermite sobre los pasos aceptados
+                estadisticas: bool, si es True también se devuelve un objeto Estadisticas con tiempo, pasos aceptados y rechazados y evaluaciones de f
+    :return: tabla de valores de t, y_aprox y error_local; si se pide interpolante o estadisticas, tupla con la tabla y luego esos objetos en ese orden
+    """
+    if par not in PARES_ENCAJADOS:
+        raise ValueError("Par '{}' no disponible, usar uno de {}".format(par, list(PARES_ENCAJADOS)))
+
+    inicio = time.perf_counter()
+    coeficientes = PARES_ENCAJADOS[par]
+    c, A, b = coeficientes['c'], coeficientes['A'], coeficientes['b']
+    diferencia_b = b - coeficientes['b_encajado']
+    exponente = -1 / (coeficientes['orden_menor'] + 1)
+    etapas = len(c)
+
+    # Se trabaja siempre con un vector de estado; al final se devuelve escalar si el PVI lo era
+    y_n = np.atleast_1d(np.asarray(y_inicial, dtype=float))
+    t_n = t_inicial
+
+    # Arreglos con capacidad que se duplica cuando se llenan, para no agregar filas a listas
+    capacidad = 64
+    valores_t = np.empty(capacidad)
+    valores_y = np.empty((capacidad,) + y_n.shape)
+    derivadas = np.empty_like(valores_y) if interpolante else None
+    valores_t[0] = t_n
+    valores_y[0] = y_n
+    n = 1
+
+    k = np.empty((etapas,) + y_n.shape)
+    k[0] = f(t_n, y_n)
+    evaluaciones_f = 1
+    if derivadas is not None:
+        derivadas[0] = k[0]
+
+    if h_inicial is None:
+        h = _paso_inicial(f, t_n, y_n, k[0], coeficientes['orden_menor'], rtol, atol)
+        evaluaciones_f += 1
+    else:
+        h = h_inicial
+
+    pasos_aceptados = 0
+    pasos_rechazados = 0
+
+    while t_n < t_final:
+        h = min(h, h_max)
+        ultimo_paso = t_n + h >= t_final
+        if ultimo_paso:
+            h = t_final - t_n
+
+        # Etapas del método (k[0] ya está calculado en el punto actual)
+        for i in range(1, etapas):
+            k[i] = f(t_n + c[i]*h, y_n + h*(A[i, :i] @ k[:i]))
+        evaluaciones_f += etapas - 1
+
+        y_n_1 = y_n + h*(b @ k)
+        escala = atol + rtol*np.maximum(np.abs(y_n), np.abs(y_n_1))
+        error = _norma_escalada(h*(diferencia_b @ k), escala)
+
+        if error <= 1:
+            t_n = t_final if ultimo_paso else t_n + h
+            y_n = y_n_1
+            pasos_aceptados += 1
+
+            if n == capacidad:
+                capacidad *= 2
+                valores_t = np.resize(valores_t, capacidad)
+                valores_y = np.resize(valores_y, (capacidad,) + y_n.shape)
+                if derivadas is not None:
+                    derivadas = np.resize(derivadas, (capacidad,) + y_n.shape)
+            valores_t[n] = t_n
+            valores_y[n] = y_n
+            n += 1
+
+            # En el último nodo la derivada solo hace falta para el interpolante
+            if ultimo_paso and derivadas is None:
+                break
+
+            k[0] = f(t_n, y_n)
+            evaluaciones_f += 1
+            if derivadas is not None:
+                derivadas[n-1] = k[0]
+            if ultimo_paso:
+                break
+
+            # El paso puede crecer como máximo 5 veces
+            h *= 5.0 if error == 0 else min(5.0, 0.9*error**exponente)
+        else:
+            # Paso rechazado: se achica (como máximo a la quinta parte) y se repite desde el mismo punto
+            pasos_rechazados += 1
+            h *= max(0.2, 0.9*error**exponente)
+
+    valores_t = valores_t[:n].copy()
+    valores_y = valores_y[:n].copy()
+    if np.ndim(y_inicial) == 0:
+        valores_y = valores_y[:, 0].copy()
+
+    # Error local: diferencia con el paso anterior, como en los demás métodos
+    errores_locales = np.empty_like(valores_y)
+    errores_locales[0] = np.nan
+    np.abs(np.diff(valores_y, axis=0), out=errores_locales[1:])
+
+    registro = None
+    if estadisticas:
+        registro = Estadisticas(par, tiempo_pared=time.perf_counter() - inicio, evaluaciones_f=evaluaciones_f,
+                                pasos_aceptados=pasos_aceptados, pasos_rechazados=pasos_rechazados)
+
+    salida = [_armar_salida(valores_t, valores_y, errores_locales, como_tabla, metodo=par, rtol=rtol, atol=atol, estadisticas=registro)]
+    if interpolante:
+        derivadas = derivadas[:n]
+        if np.ndim(y_inicial) == 0:
+            derivadas = derivadas[:, 0]
+        salida.append(InterpolanteHermite(valores_t, valores_y, derivadas))
+    if registro is not None:
+        salida.append(registro)
+
+    return salida[0] if len(salida) == 1 else tuple(salida)
+
+# Métodos de extrapolación disponibles en integrar: nombre -> método base que se extrapola
+METODOS_EXTRAPOLACION = {'GBS': 'PuntoMedio', 'RichardsonRK2': 'RK2'}
+
+# Cantidades de subpasos de cada columna de la tabla de extrapolación: sucesión de Deuflhard para el punto medio (pares, como pide
+# la regla de Gragg) y duplicación para RK2, con la que la eliminación de Richardson de potencias sucesivas de h es exacta
+SUBPASOS_EXTRAPOLACION = {
+    'PuntoMedio': np.array([2, 4, 6, 8, 10, 12, 14, 16, 18, 20]),
+    'RK2': np.array([1, 2, 4, 8, 16, 32, 64, 128]),
+}
+
+# Crecimiento máximo del macro paso de un paso al siguiente (el mismo límite que ODEX, de Hairer y Wanner): con las columnas
+# altas, un error muy por debajo de la tolerancia justifica un H mucho mayor y con un límite más bajo el arranque desde el
+# primer paso estimado lleva varios macro pasos
+FACTOR_MAXIMO_EXTRAPOLACION = 50.0
+
+def _subpasos_base(base, f, t_n, y_n, f_n, H, n):
+    """
+    Función que avanza un macro paso H con n subpasos del método base, reutilizando f(t_n, y_n)
+
+    :parametros base: str, 'PuntoMedio' (regla del punto medio de Gragg) o 'RK2' (trapecio, como runge_kutta_2_trapecio), f: función derivada del PVI, t_n: float, tiempo actual, y_n: array, valor actual, f_n: array, f(t_n, y_n), H: float, tamaño del macro paso, n: int, cantidad de subpasos
+    :return: tupla (aproximación de y(t_n + H), evaluaciones de f usadas)
+    """
+    h = H / n
+    if base == 'PuntoMedio':
+        # z_1 con Euler y luego z_m+1 = z_m-1 + 2h f(z_m): el error tiene solo potencias pares de h si n es par
+        z_anterior, z = y_n, y_n + h*f_n
+        for m in range(1, n):
+            z_anterior, z = z, z_anterior + (2*h)*f(t_n + m*h, z)
+        return z, n - 1
+
+    y = y_n
+    k1 = f_n
+    for m in range(n):
+        if m > 0:
+            k1 = f(t_n + m*h, y)
+        k2 = f(t_n + (m+1)*h, y + h*k1)
+        y = y + (h/2)*(k1 + k2)
+    return y, 2*n - 1
+
+def extrapolacion(t_inicial, t_final, y_inicial, f, base='PuntoMedio', rtol=1e-3, atol=1e-6, h_inicial=None, columnas_max=8, como_tabla=True, interpolante=False, estadisticas=False):
+    """
+    Función que implementa la extrapolación de Richardson (Gragg-Bulirsch-Stoer con base 'PuntoMedio'). En cada macro paso H se
+    avanza con el método base usando n = 2, 4, 6, ... subpasos (1, 2, 4, ... con RK2) y los resultados se extrapolan a h -> 0 con el esquema de
+    Aitken-Neville. Se agregan columnas hasta que la diferencia entre las dos últimas extrapolaciones cumpla la tolerancia; la
+    columna objetivo y el próximo H se eligen entre las columnas vecinas minimizando el trabajo por unidad de tiempo.
+    En problemas suaves como el C14, GBS necesita a igual error aproximadamente las mismas evaluaciones de f que DOP853 y
+    solo sale ganando a tolerancias muy estrictas (rtol de 1e-11 o menos); en la cadena de isótopos DOP853 sigue siendo más barato
+
+    :parametros t_inicial: float, valor inicial de t
+                t_final: float, valor final de t
+                y_inicial: float o array (vector de estado de un sistema), valor inicial
+                f: función derivada del PVI
+                base: str, método que se extrapola: 'PuntoMedio' (error en potencias pares de h) o 'RK2' (trapecio, error en todas las potencias desde h^2)
+                rtol: float, tolerancia relativa
+                atol: float, tolerancia absoluta
+                h_inicial: float, tamaño del primer macro paso (si es None se estima)
+                columnas_max: int, cantidad máxima de columnas de la tabla de extrapolación (entre 2 y la cantidad de SUBPASOS_EXTRAPOLACION[base])
+                como_tabla: bool, si es False se devuelven los arrays (t, y_aprox, error_local) sin armar el Resultado
+                interpolante: bool, no disponible: la extrapolación no tiene salida densa (una cúbica de Hermite sobre macro pasos tan largos no mejora al ajustar la tolerancia), así que True lanza ValueError
+                estadisticas: bool, si es True también se devuelve un objeto Estadisticas (pasos_rechazados cuenta los macro pasos rechazados)
+    :return: tabla de valores de t, y_aprox y error_local en los macro pasos; si se piden estadisticas, tupla con la tabla y las estadísticas
+    """
+    if base not in ('PuntoMedio', 'RK2'):
+        raise ValueError("Base '{}' no disponible, usar 'PuntoMedio' o 'RK2'".format(base))
+    if interpolante:
+        raise ValueError("La extrapolación no tiene salida densa: usar un par encajado ('RK4(5)') o un método de scipy ('DOP853') para pedir el interpolante")
+
+    inicio = time.perf_counter()
+    subpasos = SUBPASOS_EXTRAPOLACION[base][:max(columnas_max, 2)]
+    # Orden de cada columna: T[j][k] tiene error global del orden de h^exponentes[k] (y local de H^(exponentes[k] + 1))
+    exponentes = 2*np.arange(1, len(subpasos)+1) if base == 'PuntoMedio' else np.arange(2, len(subpasos)+2)
+
+    y_n = np.atleast_1d(np.asarray(y_inicial, dtype=float))
+    t_n = t_inicial
+    f_n = f(t_n, y_n)
+    evaluaciones_f = 1
+
+    # Columna objetivo: se busca la convergencia en las columnas k_objetivo - 1, k_objetivo y k_objetivo + 1; se empieza
+    # por la segunda para poder aceptar los primeros pasos, todavía cortos, con pocas columnas
+    k_objetivo = min(2, len(subpasos) - 1)
+
+    if h_inicial is None:
+        # El primer paso se estima con el orden de la columna objetivo
+        H = _paso_inicial(f, t_n, y_n, f_n, exponentes[k_objetivo], rtol, atol)
+        evaluaciones_f += 1
+    else:
+        H = h_inicial
+
+    # Trabajo (evaluaciones de f) acumulado hasta cada columna, contando f(t_n, y_n)
+    trabajo = 1 + np.cumsum(subpasos - 1 if base == 'PuntoMedio' else 2*subpasos - 1)
+
+    valores_t, valores_y = [t_n], [y_n]
+    pasos_aceptados = 0
+    pasos_rechazados = 0
+
+    while t_n < t_final:
+        ultimo_paso = t_n + H >= t_final
+        if ultimo_paso:
+            H = t_final - t_n
+
+        # Tabla de Aitken-Neville fila por fila: tabla[k] es T[j][k] de la fila actual
+        tabla = []
+        pasos_columna = {}  # columna -> macro paso que la haría cumplir justo la tolerancia
+        aceptado = False
+        for j, n in enumerate(subpasos):
+            aproximacion, evaluaciones = _subpasos_base(base, f, t_n, y_n, f_n, H, n)
+            evaluaciones_f += evaluaciones
+
+            fila = [aproximacion]
+            for k in range(j):
+                # Punto medio: interpolación polinómica en h^2 (Neville); RK2: Richardson eliminando h^exponentes[k] con cociente 2
+                cociente = (n / subpasos[j-k-1])**2 if base == 'PuntoMedio' else 2.0**exponentes[k]
+                fila.append(fila[k] + (fila[k] - tabla[k]) / (cociente - 1))
+            tabla = fila
+            if j == 0:
+                continue
+
+            escala = atol + rtol*np.maximum(np.abs(y_n), np.abs(fila[j]))
+            error = _norma_escalada(fila[j] - fila[j-1], escala)
+            if not np.isfinite(error):
+                # El método base divergió (por ejemplo en un problema rígido): se achica mucho el macro paso
+                pasos_columna[j] = 0.1*H
+                break
+            factor = FACTOR_MAXIMO_EXTRAPOLACION if error == 0 else min(FACTOR_MAXIMO_EXTRAPOLACION, max(0.2, 0.94*(0.65/error)**(1/(exponentes[j-1]+1))))
+            pasos_columna[j] = H*factor
+            if error <= 1 and j >= k_objetivo - 1:
+                aceptado = True
+                break
+            if j >= k_objetivo + 1:
+                break
+
+        # Próxima columna objetivo entre las vecinas de la última calculada, por trabajo por unidad de tiempo (Hairer, Nørsett y
+        # Wanner, II.9). Las columnas más bajas no se comparan: su paso suele estar limitado por el factor mínimo
+        trabajo_por_tiempo = {k: trabajo[k] / pasos_columna[k] for k in pasos_columna}
+        k_objetivo = j
+        if j >= 2 and j - 1 in trabajo_por_tiempo and trabajo_por_tiempo[j-1] < 0.8*trabajo_por_tiempo[j]:
+            k_objetivo = j - 1
+        H_nuevo = pasos_columna[k_objetivo]
+        if aceptado and k_objetivo == j and j + 1 < len(subpasos) and (j < 2 or trabajo_por_tiempo[j] < 0.9*trabajo_por_tiempo[j-1]):
+            # Una columna más cuesta más por paso pero permite un H mayor en la proporción de trabajo
+            k_objetivo = j + 1
+            H_nuevo *= trabajo[j+1] / trabajo[j]
+
+        if not aceptado:
+            pasos_rechazados += 1
+            H = H_nuevo
+            continue
+
+        t_n = t_final if ultimo_paso else t_n + H
+        y_n = fila[j]
+        if not ultimo_paso:
+            f_n = f(t_n, y_n)
+            evaluaciones_f += 1
+        pasos_aceptados += 1
+        valores_t.append(t_n)
+        valores_y.append(y_n)
+
+        H = H_nuevo
+
+    valores_t = np.array(valores_t)
+    valores_y = np.array(valores_y)
+    if np.ndim(y_inicial) == 0:
+        valores_y = valores_y[:, 0].copy()
+
+    # Error local: diferencia con el paso anterior, como en los demás métodos
+    errores_locales = np.empty_like(valores_y)
+    errores_locales[0] = np.nan
+    np.abs(np.diff(valores_y, axis=0), out=errores_locales[1:])
+
+    nombre = 'GBS' if base == 'PuntoMedio' else 'RichardsonRK2'
+    registro = None
+    if estadisticas:
+        registro = Estadisticas(nombre, tiempo_pared=time.perf_counter() - inicio, evaluaciones_f=evaluaciones_f,
+                                pasos_aceptados=pasos_aceptados, pasos_rechazados=pasos_rechazados)
+
+    salida = _armar_salida(valores_t, valores_y, errores_locales, como_tabla, metodo=nombre, rtol=rtol, atol=atol, estadisticas=registro)
+    return salida if registro is None else (salida, registro)
+
+def calcular_tiempo_para_valor(valores_objetivo, t_inicial, y_inicial, f, t_max, metodo='RK4', h=None, componente=None, tol=1e-6, rtol=1e-3, atol=1e-6, **opciones):
+    """
+    Función que resuelve el problema inverso: el tiempo en que la solución alcanza cada valor objetivo (por ejemplo, la edad
+    de una muestra a partir de su R_REMANENTE). Se integra una sola vez con salida densa, deteniendo la corrida cuando ya se
+    cruzaron todos los objetivos, y cada cruce se ubica con bisección sobre el interpolante
+
+    :parametros valores_objetivo: float o array, valores de y buscados (se resuelven todos con la misma integración)
+                t_inicial: float, valor inicial de t
+                y_inicial: float o array (vector de estado de un sistema), valor inicial
+                f: función derivada del PVI
+                t_max: float, tiempo máximo hasta el que se integra si algún objetivo no se alcanza
+                metodo: str, método de paso fijo ('RK2', 'RK4', 'AB2', 'Heun', 'ABM', 'EulerImplicito', 'TrapecioImplicito', 'SDIRK2', 'Exponencial'), par adaptativo ('RK2(1)', 'RK4(5)') o método de scipy ('RK45', 'DOP853', ...). Los de extrapolación no sirven: no tienen salida densa
+                h: float, tamaño del paso (solo métodos de paso fijo)
+                componente: int, componente del estado a comparar con los objetivos si el PVI es un sistema
+                tol: float, tolerancia en t de la bisección
+                rtol: float, tolerancia relativa (métodos adaptativos)
+                atol: float, tolerancia absoluta (métodos adaptativos)
+                opciones: argumentos propios del método (eps e itmax para Heun, orden y modo para ABM, jacobiano, tol e itmax para los implícitos, matriz para Exponencial)
+    :return: float o array con los tiempos encontrados (NaN para los objetivos no alcanzados antes de t_max)
+    """
+    y_inicial = _estado_inicial(y_inicial)
+
+    if metodo in METODOS_EXTRAPOLACION:
+        raise ValueError("El método '{}' no tiene salida densa para ubicar los cruces, usar por ejemplo 'DOP853' o 'RK4(5)'".format(metodo))
+
+    if metodo in METODOS_PASO_FIJO:
+        if h is None:
+            raise ValueError("El método '{}' es de paso fijo, hay que indicar h".format(metodo))
+
+        objetivos = np.asarray(valores_objetivo, dtype=float)
+        objetivo_min, objetivo_max = objetivos.min(), objetivos.max()
+        valor_inicial = y_inicial if componente is None else y_inicial[componente]
+        rango = [valor_inicial, valor_inicial]
+
+        def detener(t, y):
+            # Se detiene cuando el recorrido de la solución ya cubre todos los objetivos
+            valor = y if componente is None else y[componente]
+            rango[0] = min(rango[0], valor)
+            rango[1] = max(rango[1], valor)
+            return rango[0] <= objetivo_min and rango[1] >= objetivo_max
+
+        paso = _crear_paso(metodo, f, h, y_inicial, **opciones)
+        _, interpolante = _integrar_paso_fijo(paso, f, t_inicial, t_max, h, y_inicial, como_tabla=False, interpolante=True, detener=detener)
+    else:
+        _, interpolante = integrar(metodo, t_inicial, t_max, y_inicial, f, rtol=rtol, atol=atol, como_tabla=False, interpolante=True, **opciones)
+
+    return buscar_tiempos(interpolante, valores_objetivo, componente=componente, tol=tol)
+
+def resolver_con_scipy(metodo, dya, t_inicial, t_final, y_inicial, rtol=1e-3, atol=1e-6, como_tabla=True, interpolante=False, estadisticas=False):
     """
     Función que resuelve una EDO usando métodos de scipy.integrate.solve_ivp
     
@@ -174,30 +1226,77 @@ def resolver_con_scipy(metodo, dya, t_inicial, t_final, y_inicial, rtol=1e-3, at
                 dya: función derivada del PVI
                 t_inicial: float, valor inicial de t
                 t_final: float, valor final de t
-                y_inicial: float, valor inicial
+                y_inicial: float, valor inicial, o array con el vector de estado de un sistema
                 rtol: float, tolerancia relativa (por defecto 1e-3)
                 atol: float, tolerancia absoluta (por defecto 1e-6)
-    :return: DataFrame, tabla de valores de t, y_aprox y error_local
+                como_tabla: bool, si es False se devuelven los arrays (t, y_aprox, error_local) sin armar el Resultado
+                interpolante: bool, si es True se pide dense_output=True a scipy y también se devuelve un InterpolanteScipy
+                estadisticas: bool, si es True también se devuelve un objeto Estadisticas con nfev, njev y nlu de scipy (scipy no informa los pasos rechazados)
+    :return: Resultado, tabla de valores de t, y_aprox y error_local; si se pide interpolante o estadisticas, tupla con la tabla y luego esos objetos en ese orden
     """
+    # scipy se importa recién acá (y antes de medir el tiempo) para que importar Metodos no lo cargue
+    import scipy.integrate as spi
+
     # Resolver usando scipy (sin especificar t_eval para que use el paso predefinido)
     limites_intervalo = (t_inicial, t_final)
-    solucion = spi.solve_ivp(dya, limites_intervalo, [y_inicial], method=metodo, rtol=rtol, atol=atol)
-    
-    # Guardar valores en listas para armar la tabla
-    filas_tabla = []
-    
-    for i in range(len(solucion.t)):
-        t = solucion.t[i]
-        y_aprox = solucion.y[0][i]
-        
-        # Calcular error local (diferencia con el paso anterior)
-        if i == 0:
-            e_local = np.nan
-        else:
-            e_local = np.abs(y_aprox - solucion.y[0][i-1])
-        
-        filas_tabla.append([t, y_aprox, e_local])
-    
-    tabla_valores = pd.DataFrame(columns=['t','y_aprox','error_local'], data=filas_tabla)
-    
-    return tabla_valores
+    inicio = time.perf_counter()
+    solucion = spi.solve_ivp(dya, limites_intervalo, np.atleast_1d(y_inicial), method=metodo, rtol=rtol, atol=atol, dense_output=interpolante)
+
+    # scipy devuelve (N, pasos); se guarda como (pasos, N) contiguo, o (pasos,) si el problema es escalar
+    if np.ndim(y_inicial) == 0:
+        valores_y = solucion.y[0].copy()
+    else:
+        valores_y = np.ascontiguousarray(solucion.y.T)
+
+    # Error local: diferencia con el paso anterior
+    errores_locales = np.empty_like(valores_y)
+    errores_locales[0] = np.nan
+    np.abs(np.diff(valores_y, axis=0), out=errores_locales[1:])
+
+    registro = None
+    if estadisticas:
+        registro = Estadisticas(metodo, tiempo_pared=time.perf_counter() - inicio, evaluaciones_f=solucion.nfev,
+                                pasos_aceptados=len(solucion.t) - 1, pasos_rechazados=None,
+                                evaluaciones_jacobiano=solucion.njev, factorizaciones_lu=solucion.nlu)
+
+    salida = [_armar_salida(solucion.t, valores_y, errores_locales, como_tabla, metodo=metodo, rtol=rtol, atol=atol, estadisticas=registro)]
+    if interpolante:
+        salida.append(InterpolanteScipy(solucion, escalar=np.ndim(y_inicial) == 0))
+    if registro is not None:
+        salida.append(registro)
+
+    return salida[0] if len(salida) == 1 else tuple(salida)
+
+def integrar(metodo, t_inicial, t_final, y_inicial, f, h=None, rtol=1e-3, atol=1e-6, como_tabla=True, interpolante=False, estadisticas=False, **opciones):
+    """
+    Función que integra un PVI con cualquiera de los métodos disponibles a partir de su nombre, con la misma salida para todos
+
+    :parametros metodo: str, método de paso fijo ('RK2', 'RK4', 'AB2', 'Heun', 'ABM', 'EulerImplicito', 'TrapecioImplicito', 'SDIRK2', 'Exponencial'), par adaptativo ('RK2(1)', 'RK4(5)'), extrapolación ('GBS', 'RichardsonRK2') o método de scipy ('RK45', 'RK23', 'DOP853', 'Radau', 'BDF', 'LSODA')
+                t_inicial: float, valor inicial de t
+                t_final: float, valor final de t
+                y_inicial: float o array (vector de estado de un sistema), valor inicial
+                f: función derivada del PVI
+                h: float, tamaño del paso (solo métodos de paso fijo)
+                rtol: float, tolerancia relativa (métodos adaptativos)
+                atol: float, tolerancia absoluta (métodos adaptativos)
+                como_tabla: bool, si es False se devuelven los arrays (t, y_aprox, error_local) sin armar el Resultado
+                interpolante: bool, si es True también se devuelve el interpolante de la corrida (los métodos de extrapolación no tienen y lanzan ValueError)
+                estadisticas: bool, si es True también se devuelve un objeto Estadisticas con el costo de la corrida
+                opciones: argumentos propios del método (eps e itmax para Heun, orden y modo para ABM, jacobiano, tol e itmax para los implícitos, matriz para Exponencial)
+    :return: Resultado, tabla de valores de t, y_aprox y error_local; si se pide interpolante o estadisticas, tupla con la tabla y luego esos objetos en ese orden
+    """
+    if metodo in METODOS_PASO_FIJO:
+        if h is None:
+            raise ValueError("El método '{}' es de paso fijo, hay que indicar h".format(metodo))
+        return _resolver_paso_fijo(metodo, t_inicial, t_final, h, _estado_inicial(y_inicial), f, como_tabla, interpolante, estadisticas, **opciones)
+
+    if metodo in PARES_ENCAJADOS:
+        return runge_kutta_adaptativo(t_inicial, t_final, y_inicial, f, par=metodo, rtol=rtol, atol=atol, como_tabla=como_tabla, interpolante=interpolante, estadisticas=estadisticas, **opciones)
+
+    if metodo in METODOS_EXTRAPOLACION:
+        return extrapolacion(t_inicial, t_final, y_inicial, f, base=METODOS_EXTRAPOLACION[metodo], rtol=rtol, atol=atol, como_tabla=como_tabla, interpolante=interpolante, estadisticas=estadisticas, **opciones)
+
+    if metodo in METODOS_SCIPY:
+        return resolver_con_scipy(metodo, f, t_inicial, t_final, y_inicial, rtol=rtol, atol=atol, como_tabla=como_tabla, interpolante=interpolante, estadisticas=estadisticas)
+
+    raise ValueError("Método '{}' no disponible, usar uno de {}".format(metodo, list(METODOS_PASO_FIJO) + list(PARES_ENCAJADOS) + list(METODOS_EXTRAPOLACION) + list(METODOS_SCIPY)))
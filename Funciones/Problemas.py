@@ -0,0 +1,177 @@
+import functools
+
+import numpy as np
+
+from Funciones.Constantes import LAMBDA, T_HALF, T_INICIAL, T_FINAL, y0
+
+# Las derivadas de los problemas están definidas a nivel de módulo para que se puedan enviar a otros procesos (pickle)
+
+def y1(t):
+    """Solución analítica: y(t) = y0 * e^(-λt)"""
+    return y0 * np.exp(-LAMBDA * t)
+
+def dy1(t, y):
+    """Derivada de la EDO: dy/dt = -λy"""
+    return -LAMBDA * y
+
+def matriz_cadena_bateman(constantes_desintegracion):
+    """
+    Función que arma la matriz de tasas de una cadena de desintegración padre -> hijo -> ... (sistema de Bateman)
+
+    :parametros constantes_desintegracion: array, constante de desintegración de cada isótopo de la cadena (año^-1). Un valor 0 representa un isótopo estable al final de la cadena
+    :return: array (N, N), matriz A tal que dy/dt = A y
+    """
+    lambdas = np.asarray(constantes_desintegracion, dtype=float)
+
+    # Cada isótopo pierde lambda_i * y_i y el siguiente de la cadena lo gana
+    matriz = np.diag(-lambdas)
+    matriz[np.arange(1, len(lambdas)), np.arange(len(lambdas)-1)] = lambdas[:-1]
+
+    return matriz
+
+def crear_cadena_bateman(constantes_desintegracion):
+    """
+    Función que crea la derivada del PVI para una cadena de desintegración de N isótopos
+
+    :parametros constantes_desintegracion: array, constante de desintegración de cada isótopo de la cadena (año^-1)
+    :return: función derivada dy(t, y), con y de forma (N,) o (M, N) para un conjunto de cadenas
+    """
+    matriz_transpuesta = matriz_cadena_bateman(constantes_desintegracion).T.copy()
+
+    def dy_cadena(t, y):
+        return y @ matriz_transpuesta
+
+    return dy_cadena
+
+# ==================== PROBLEMA RÍGIDO (Prothero-Robinson) ====================
+# dy/dt = L (y - φ(t)) + φ'(t) con φ(t) = cos(t): la solución con y(0) = 1 es cos(t), pero con L muy negativo los métodos
+# explícitos solo son estables con pasos h del orden de 1/|L|
+
+RIGIDEZ_PROTHERO_ROBINSON = -1e3
+
+def y_prothero_robinson(t):
+    """Solución analítica: y(t) = cos(t)"""
+    return np.cos(t)
+
+def dy_prothero_robinson(t, y):
+    """Derivada de la EDO: dy/dt = L (y - cos(t)) - sin(t)"""
+    return RIGIDEZ_PROTHERO_ROBINSON * (y - np.cos(t)) - np.sin(t)
+
+def jacobiano_prothero_robinson(t, y):
+    """Jacobiano de la EDO: df/dy = L (uno por componente si y es un conjunto)"""
+    return np.full(np.shape(y), RIGIDEZ_PROTHERO_ROBINSON)
+
+# ==================== PROBLEMA RÍGIDO NO LINEAL (Robertson) ====================
+# Cinética química de Robertson: tres especies con constantes de reacción de escalas muy distintas (0.04, 1e4 y 3e7). No tiene
+# solución cerrada: la referencia se calcula una vez con Radau a tolerancias muy estrictas
+
+CONSTANTES_ROBERTSON = (0.04, 1e4, 3e7)
+Y_INICIAL_ROBERTSON = np.array([1.0, 0.0, 0.0])
+T_FINAL_ROBERTSON = 40.0
+
+def dy_robertson(t, y):
+    """Derivada de la EDO: y1' = -k1 y1 + k2 y2 y3, y2' = k1 y1 - k2 y2 y3 - k3 y2², y3' = k3 y2², con y de forma (3,) o (..., 3)"""
+    k1, k2, k3 = CONSTANTES_ROBERTSON
+    y1, y2, y3 = y[..., 0], y[..., 1], y[..., 2]
+    reaccion_1 = k1*y1 - k2*y2*y3
+    reaccion_3 = k3*y2*y2
+    return np.stack([-reaccion_1, reaccion_1 - reaccion_3, reaccion_3], axis=-1)
+
+def jacobiano_robertson(t, y):
+    """Jacobiano de la EDO: matriz (3, 3), o (..., 3, 3) si y es un conjunto"""
+    k1, k2, k3 = CONSTANTES_ROBERTSON
+    y2, y3 = y[..., 1], y[..., 2]
+    cero = np.zeros_like(y2)
+    fila_1 = np.stack([np.full_like(y2, -k1), k2*y3, k2*y2], axis=-1)
+    fila_3 = np.stack([cero, 2*k3*y2, cero], axis=-1)
+    return np.stack([fila_1, -fila_1 - fila_3, fila_3], axis=-2)
+
+@functools.lru_cache(maxsize=1)
+def _solucion_referencia_robertson():
+    from scipy.integrate import solve_ivp
+
+    return solve_ivp(dy_robertson, (0.0, T_FINAL_ROBERTSON), Y_INICIAL_ROBERTSON, method='Radau', jac=jacobiano_robertson,
+                     rtol=1e-12, atol=1e-16, dense_output=True).sol
+
+def y_robertson(t):
+    """
+    Solución de referencia de Robertson (Radau con rtol = 1e-12, atol = 1e-16, salida densa)
+
+    :parametros t: float o array, tiempos en [0, T_FINAL_ROBERTSON]
+    :return: array de forma (3,) o (len(t), 3)
+    """
+    return np.moveaxis(_solucion_referencia_robertson()(t), 0, -1)
+
+# ==================== CADENA DE VARIOS ISÓTOPOS ====================
+# Cadena ilustrativa C14 -> B -> C -> estable, con vidas medias del mismo orden para que todos los isótopos importen en el intervalo
+
+VIDAS_MEDIAS_CADENA = np.array([T_HALF, 2000.0, 800.0, np.inf])  # años (np.inf: isótopo estable)
+CONSTANTES_CADENA = np.log(2) / VIDAS_MEDIAS_CADENA  # año^-1
+Y_INICIAL_CADENA = np.array([y0, 0.0, 0.0, 0.0])
+
+_MATRIZ_CADENA_TRANSPUESTA = matriz_cadena_bateman(CONSTANTES_CADENA).T.copy()
+
+def dy_cadena(t, y):
+    """Derivada de la cadena de ejemplo: dy/dt = A y, con y de forma (N,) o (M, N)"""
+    return y @ _MATRIZ_CADENA_TRANSPUESTA
+
+def jacobiano_cadena(t, y):
+    """Jacobiano de la cadena de ejemplo: la matriz A (una por miembro si y es un conjunto de forma (M, N))"""
+    return np.broadcast_to(_MATRIZ_CADENA_TRANSPUESTA.T, np.shape(y)[:-1] + _MATRIZ_CADENA_TRANSPUESTA.shape)
+
+def y_cadena(t):
+    """
+    Solución analítica de la cadena de ejemplo con las ecuaciones de Bateman (constantes distintas entre sí y solo el primer isótopo al inicio):
+    y_n(t) = y0 * λ_1...λ_{n-1} * Σ_i e^(-λ_i t) / Π_{j≠i} (λ_j - λ_i), con i, j = 1..n
+
+    :parametros t: float o array, tiempos
+    :return: array de forma (N,) o (len(t), N)
+    """
+    lambdas = CONSTANTES_CADENA
+    exponenciales = np.exp(-np.multiply.outer(t, lambdas))
+    columnas = []
+    for n in range(len(lambdas)):
+        diferencias = lambdas[:n+1, None] - lambdas[None, :n+1]
+        np.fill_diagonal(diferencias, 1.0)
+        coeficientes = np.prod(lambdas[:n]) / np.prod(diferencias, axis=0)
+        columnas.append(exponenciales[..., :n+1] @ coeficientes)
+
+    return y0 * np.stack(columnas, axis=-1)
+
+# Problemas disponibles por nombre (por ejemplo para los barridos): derivada, solución exacta (o None), intervalo y, si se conoce, el jacobiano para los métodos implícitos
+# y la matriz de tasas de los problemas lineales homogéneos (para el método 'Exponencial' y Metodos.solucion_lineal)
+PROBLEMAS = {
+    'C14': {
+        'f': dy1,
+        'exacta': y1,
+        'matriz': -LAMBDA,
+        't_inicial': T_INICIAL,
+        't_final': T_FINAL,
+        'y_inicial': y0,
+    },
+    'ProtheroRobinson': {
+        'f': dy_prothero_robinson,
+        'exacta': y_prothero_robinson,
+        'jacobiano': jacobiano_prothero_robinson,
+        't_inicial': 0.0,
+        't_final': 10.0,
+        'y_inicial': 1.0,
+    },
+    'Robertson': {
+        'f': dy_robertson,
+        'exacta': y_robertson,
+        'jacobiano': jacobiano_robertson,
+        't_inicial': 0.0,
+        't_final': T_FINAL_ROBERTSON,
+        'y_inicial': Y_INICIAL_ROBERTSON,
+    },
+    'Cadena': {
+        'f': dy_cadena,
+        'exacta': y_cadena,
+        'jacobiano': jacobiano_cadena,
+        'matriz': _MATRIZ_CADENA_TRANSPUESTA.T,
+        't_inicial': T_INICIAL,
+        't_final': T_FINAL,
+        'y_inicial': Y_INICIAL_CADENA,
+    },
+}
@@ -0,0 +1,199 @@
+"""
+Reporte de comparación sin pantalla: ejecuta un barrido de métodos y tamaños de paso (Barrido.py), calcula los errores
+(Errores.py), exporta las figuras de Graficas.py / GraficasPasoAdaptativo.py en un grupo de procesos (una figura por
+proceso, backend Agg) y escribe un reporte HTML autocontenido con los PNG y un resumen JSON
+
+Uso (desde la raíz del repositorio):
+    python -m Funciones.Reporte --salida reporte
+    python -m Funciones.Reporte --problema Cadena --metodos RK4 ABM DOP853 --valores-h 1000 100 --procesos 4
+"""
+import argparse
+import base64
+import datetime
+import html
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from Funciones.Barrido import crear_configuraciones, ejecutar_barrido
+from Funciones.Constantes import VALORES_H
+from Funciones.Errores import analizar_corridas
+from Funciones.Graficas import crear_figura_comparacion, MAX_PUNTOS
+from Funciones.GraficasPasoAdaptativo import crear_grafico_barras, COLORES_PASO_ADAPTATIVO
+from Funciones.Metodos import METODOS_PASO_FIJO
+from Funciones.Problemas import PROBLEMAS
+
+# Los mismos métodos que los notebooks de comparación
+METODOS_REPORTE = ['RK2', 'RK4', 'AB2', 'Heun', 'RK45', 'RK23', 'DOP853', 'Radau', 'BDF', 'LSODA']
+
+OPCIONES_METODO = {'Heun': {'eps': 1e-10, 'itmax': 5}}
+
+# Funciones de Graficas que puede ejecutar un proceso del grupo, por nombre (las tareas viajan por pickle)
+FUNCIONES_FIGURA = {'comparacion': crear_figura_comparacion, 'barras': crear_grafico_barras}
+
+def _exportar_figura(tarea):
+    """
+    Función que ejecuta un proceso del grupo: arma una figura con el backend Agg y la guarda en su archivo
+
+    :parametros tarea: tupla (nombre de FUNCIONES_FIGURA, archivo, dict de argumentos)
+    :return: tupla (archivo, segundos que tardó)
+    """
+    funcion, archivo, argumentos = tarea
+    inicio = time.perf_counter()
+    FUNCIONES_FIGURA[funcion](archivo=archivo, **argumentos)
+    return archivo, time.perf_counter() - inicio
+
+def exportar_figuras(tareas, n_procesos=None):
+    """
+    Función que exporta varias figuras en un grupo de procesos, una figura por proceso
+
+    :parametros tareas: lista de tuplas (nombre de FUNCIONES_FIGURA, archivo, dict de argumentos), n_procesos: int, cantidad de procesos (por defecto todos los núcleos; 1 exporta en el proceso actual)
+    :return: lista de tuplas (archivo, segundos), en el orden de las tareas
+    """
+    n_procesos = min(n_procesos or os.cpu_count() or 1, len(tareas))
+    if n_procesos <= 1:
+        return [_exportar_figura(tarea) for tarea in tareas]
+    with ProcessPoolExecutor(max_workers=n_procesos) as ejecutor:
+        return list(ejecutor.map(_exportar_figura, tareas))
+
+def crear_tareas_figuras(tabla, resumen, problema, carpeta, componente=0, max_puntos=MAX_PUNTOS):
+    """
+    Función que arma las tareas de figuras del reporte: una comparación completa por cada h (los métodos de paso fijo con ese h
+    junto con los adaptativos), una comparación de los adaptativos y un gráfico de barras con sus pasos
+
+    :parametros tabla: DataFrame largo de Barrido.ejecutar_barrido, resumen: DataFrame de Errores.analizar_corridas, problema: dict de PROBLEMAS,
+                carpeta: str, carpeta de los PNG, componente: int, componente que se grafica si el problema es un sistema, max_puntos: int, puntos por serie a partir de los cuales se diezma
+    :return: lista de tareas para exportar_figuras
+    """
+    tabla = tabla[tabla['componente'] == componente]
+    corridas = {configuracion: grupo[['t', 'y_aprox', 'error_local', 'error_global']].reset_index(drop=True)
+                for configuracion, grupo in tabla.groupby('configuracion', sort=False)}
+
+    valores_t = np.linspace(problema['t_inicial'], problema['t_final'], 200)
+    valores_exacta = np.asarray(problema['exacta'](valores_t))
+    if valores_exacta.ndim > 1:
+        valores_exacta = valores_exacta[:, componente]
+
+    paso_fijo = resumen[resumen['metodo'].isin(list(METODOS_PASO_FIJO))]
+    filas_adaptativos = resumen[~resumen.index.isin(paso_fijo.index)]
+    # Con varias tolerancias cada corrida adaptativa se nombra con su rtol
+    varias_tolerancias = filas_adaptativos['rtol'].nunique() > 1
+    adaptativos = {('{} (rtol={:g})'.format(fila.metodo, fila.rtol) if varias_tolerancias else fila.metodo): corridas[fila.configuracion]
+                   for fila in filas_adaptativos.itertuples()}
+
+    tareas = []
+    for h, filas in paso_fijo.groupby('h', sort=False):
+        resultados = {fila.metodo: corridas[fila.configuracion] for fila in filas.itertuples()}
+        resultados.update(adaptativos)
+        tareas.append(('comparacion', os.path.join(carpeta, 'comparacion_h{:g}.png'.format(h)),
+                       {'resultados': resultados, 'valores_t': valores_t, 'valores_solucion_exacta': valores_exacta,
+                        'titulo_paso': ' (h={:g})'.format(h), 'max_puntos': max_puntos}))
+
+    if adaptativos:
+        tareas.append(('comparacion', os.path.join(carpeta, 'paso_adaptativo.png'),
+                       {'resultados': adaptativos, 'valores_t': valores_t, 'valores_solucion_exacta': valores_exacta,
+                        'paneles': ('solucion', 'error_global', 'error_global_log'), 'columnas': 3,
+                        'colores': dict(zip(adaptativos, COLORES_PASO_ADAPTATIVO)), 'max_puntos': max_puntos}))
+        pasos = [(metodo, len(corrida) - 1) for metodo, corrida in adaptativos.items()]
+        tareas.append(('barras', os.path.join(carpeta, 'pasos_adaptativos.png'), {'valores': pasos}))
+
+    return tareas
+
+def escribir_html(archivo, titulo, resumen, figuras, metadatos):
+    """
+    Función que escribe un reporte HTML autocontenido: metadatos, tabla resumen y figuras incrustadas en base64
+
+    :parametros archivo: str, ruta del HTML, titulo: str, resumen: DataFrame de Errores.analizar_corridas, figuras: lista de rutas de PNG, metadatos: dict
+    """
+    partes = ['<!DOCTYPE html>', '<html lang="es"><head><meta charset="utf-8">', '<title>{}</title>'.format(html.escape(titulo)),
+              '<style>body{font-family:sans-serif;margin:2em} table{border-collapse:collapse;font-size:90%}'
+              ' td,th{border:1px solid #ccc;padding:2px 6px;text-align:right} img{max-width:100%}</style>',
+              '</head><body>', '<h1>{}</h1>'.format(html.escape(titulo)), '<ul>']
+    partes += ['<li><b>{}</b>: {}</li>'.format(html.escape(str(clave)), html.escape(str(valor))) for clave, valor in metadatos.items()]
+    partes += ['</ul>', '<h2>Resumen de errores</h2>', resumen.to_html(index=False, na_rep='', float_format='{:.4g}'.format), '<h2>Figuras</h2>']
+
+    for figura in figuras:
+        with open(figura, 'rb') as archivo_png:
+            datos = base64.b64encode(archivo_png.read()).decode('ascii')
+        nombre = html.escape(os.path.basename(figura))
+        partes.append('<h3>{}</h3><img alt="{}" src="data:image/png;base64,{}">'.format(nombre, nombre, datos))
+
+    partes.append('</body></html>')
+    with open(archivo, 'w', encoding='utf-8') as salida:
+        salida.write('\n'.join(partes))
+
+def generar_reporte(problema='C14', metodos=METODOS_REPORTE, valores_h=VALORES_H, tolerancias=((1e-3, 1e-6),), carpeta='reporte',
+                    n_procesos=None, componente=0, max_puntos=MAX_PUNTOS):
+    """
+    Función que genera el reporte completo: barrido, errores, figuras en paralelo, HTML y resumen JSON
+
+    :parametros problema: str, clave de PROBLEMAS, metodos: lista de nombres de métodos, valores_h: lista de pasos de los métodos de paso fijo,
+                tolerancias: lista de pares (rtol, atol) de los adaptativos, carpeta: str, carpeta de salida, n_procesos: int, procesos del barrido y de las figuras,
+                componente: int, componente que se grafica si el problema es un sistema, max_puntos: int, puntos por serie a partir de los cuales se diezma
+    :return: dict con el resumen (el mismo que se guarda en resumen.json)
+    """
+    inicio = time.perf_counter()
+    os.makedirs(carpeta, exist_ok=True)
+
+    configuraciones = crear_configuraciones(metodos, valores_h=valores_h, tolerancias=tolerancias, problemas=(problema,), opciones_metodo=OPCIONES_METODO)
+    tabla = ejecutar_barrido(configuraciones, n_procesos=n_procesos)
+    resumen = analizar_corridas(tabla, columnas_corrida=('configuracion',))
+    tiempo_barrido = time.perf_counter() - inicio
+
+    tareas = crear_tareas_figuras(tabla, resumen, PROBLEMAS[problema], carpeta, componente=componente, max_puntos=max_puntos)
+    figuras = exportar_figuras(tareas, n_procesos=n_procesos)
+    tiempo_figuras = time.perf_counter() - inicio - tiempo_barrido
+
+    metadatos = {
+        'fecha': datetime.datetime.now().isoformat(timespec='seconds'),
+        'problema': problema,
+        'metodos': list(metodos),
+        'valores_h': list(valores_h),
+        'tolerancias': [list(par) for par in tolerancias],
+        'procesos': n_procesos or os.cpu_count(),
+        'tiempo_barrido': round(tiempo_barrido, 3),
+        'tiempo_figuras': round(tiempo_figuras, 3),
+    }
+    escribir_html(os.path.join(carpeta, 'reporte.html'), 'Comparación de métodos: {}'.format(problema), resumen.drop(columns='configuracion'),
+                  [archivo for archivo, _ in figuras], metadatos)
+
+    metadatos['tiempo_total'] = round(time.perf_counter() - inicio, 3)
+    salida = {
+        'metadatos': metadatos,
+        # to_json convierte los NaN en null
+        'resumen': json.loads(resumen.to_json(orient='records', double_precision=15)),
+        'figuras': [{'archivo': os.path.basename(archivo), 'segundos': round(segundos, 3)} for archivo, segundos in figuras],
+    }
+    with open(os.path.join(carpeta, 'resumen.json'), 'w', encoding='utf-8') as archivo:
+        json.dump(salida, archivo, indent=2, ensure_ascii=False)
+
+    return salida
+
+def main():
+    parser = argparse.ArgumentParser(description='Reporte de comparación de métodos sin pantalla (HTML con figuras y resumen JSON)')
+    parser.add_argument('--problema', default='C14', choices=list(PROBLEMAS))
+    parser.add_argument('--metodos', nargs='+', default=METODOS_REPORTE)
+    parser.add_argument('--valores-h', nargs='+', type=float, default=VALORES_H)
+    parser.add_argument('--rtol', nargs='+', type=float, default=[1e-3], help='tolerancias relativas de los adaptativos')
+    parser.add_argument('--atol', nargs='+', type=float, default=[1e-6], help='tolerancias absolutas (una por rtol)')
+    parser.add_argument('--salida', default='reporte', help='carpeta donde se guardan reporte.html, resumen.json y los PNG')
+    parser.add_argument('--procesos', type=int, default=None, help='procesos del barrido y de las figuras (por defecto todos los núcleos)')
+    parser.add_argument('--componente', type=int, default=0, help='componente que se grafica si el problema es un sistema')
+    parser.add_argument('--max-puntos', type=int, default=MAX_PUNTOS, help='puntos por serie a partir de los cuales se diezma')
+    argumentos = parser.parse_args()
+
+    if len(argumentos.rtol) != len(argumentos.atol):
+        parser.error('--rtol y --atol tienen que tener la misma cantidad de valores')
+
+    salida = generar_reporte(argumentos.problema, argumentos.metodos, argumentos.valores_h, list(zip(argumentos.rtol, argumentos.atol)),
+                             argumentos.salida, argumentos.procesos, argumentos.componente, argumentos.max_puntos)
+    metadatos = salida['metadatos']
+    print("Reporte en {}: barrido {:.2f} s, {} figuras {:.2f} s, total {:.2f} s".format(
+        os.path.join(argumentos.salida, 'reporte.html'), metadatos['tiempo_barrido'], len(salida['figuras']),
+        metadatos['tiempo_figuras'], metadatos['tiempo_total']))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,177 @@
+import json
+import os
+
+import numpy as np
+
+# Columnas que tiene toda corrida; las demás (y_real, error_global, ...) se agregan después o se derivan a pedido
+COLUMNAS_BASE = ('t', 'y_aprox', 'error_local')
+
+class Resultado:
+    """
+    Resultado de una corrida: columnas guardadas como arreglos contiguos de float64 y metadatos de la corrida. Se indexa como la
+    tabla que devolvían antes los métodos (resultado['t'], resultado['y_real'] = ...) y el DataFrame se arma solo si se pide
+    """
+    __slots__ = ('_columnas', 'metodo', 'h', 'rtol', 'atol', 'estadisticas', 'exacta')
+
+    def __init__(self, t, y_aprox, error_local, metodo=None, h=None, rtol=None, atol=None, estadisticas=None, exacta=None):
+        """
+        :param t: array (pasos,), valores de t
+        :param y_aprox: array (pasos,) o (pasos, N), valores aproximados
+        :param error_local: array con la forma de y_aprox
+        :param metodo: str, nombre del método
+        :param h: float, tamaño del paso (métodos de paso fijo)
+        :param rtol: float, tolerancia relativa (métodos adaptativos)
+        :param atol: float, tolerancia absoluta (métodos adaptativos)
+        :param estadisticas: Estadisticas de la corrida (tiempo, evaluaciones de f, pasos), si se midieron
+        :param exacta: función solución exacta y(t); si se da, y_real y error_global se calculan la primera vez que se piden
+        """
+        # Sin copias si los arreglos ya son float64 contiguos, como los que arman los métodos
+        self._columnas = {'t': np.ascontiguousarray(t, dtype=float),
+                          'y_aprox': np.ascontiguousarray(y_aprox, dtype=float),
+                          'error_local': np.ascontiguousarray(error_local, dtype=float)}
+        self.metodo = metodo
+        self.h = h
+        self.rtol = rtol
+        self.atol = atol
+        self.estadisticas = estadisticas
+        self.exacta = exacta
+
+    def __len__(self):
+        return len(self._columnas['t'])
+
+    def __contains__(self, nombre):
+        return nombre in self._columnas
+
+    @property
+    def columns(self):
+        """Nombres de las columnas guardadas, en orden (como DataFrame.columns)"""
+        return list(self._columnas)
+
+    @property
+    def sistema(self):
+        """True si y_aprox tiene una columna por componente"""
+        return self._columnas['y_aprox'].ndim > 1
+
+    def __getitem__(self, nombre):
+        if nombre in self._columnas:
+            return self._columnas[nombre]
+
+        # Columnas derivadas: se calculan la primera vez y quedan guardadas
+        if nombre == 'y_real' and self.exacta is not None:
+            self['y_real'] = np.reshape(self.exacta(self._columnas['t']), self._columnas['y_aprox'].shape)
+            return self._columnas['y_real']
+        if nombre == 'error_global' and ('y_real' in self._columnas or self.exacta is not None):
+            self._columnas['error_global'] = np.abs(self._columnas['y_aprox'] - self['y_real'])
+            return self._columnas['error_global']
+
+        # Componente de un sistema con los nombres de la tabla de antes (y_aprox_0, error_local_1, ...)
+        base, _, indice = nombre.rpartition('_')
+        if self.sistema and indice.isdigit() and base in self._columnas:
+            return self._columnas[base][:, int(indice)]
+
+        raise KeyError(nombre)
+
+    def __setitem__(self, nombre, valores):
+        valores = np.ascontiguousarray(valores, dtype=float)
+        if len(valores) != len(self):
+            raise ValueError("La columna '{}' tiene {} filas y el resultado {}".format(nombre, len(valores), len(self)))
+        self._columnas[nombre] = valores
+        if nombre == 'y_real':
+            # error_global derivado de un y_real anterior ya no vale
+            self._columnas.pop('error_global', None)
+
+    def __getattr__(self, nombre):
+        # Compatibilidad con el código que usaba la tabla como DataFrame (tail, iloc, describe, ...): se convierte a pedido
+        if nombre.startswith('_') or nombre in Resultado.__slots__:
+            raise AttributeError(nombre)
+        return getattr(self.a_pandas(), nombre)
+
+    def metadatos(self):
+        """
+        Devuelve los metadatos de la corrida como dict de valores simples
+
+        :return: dict con metodo, h, rtol, atol, filas y las estadísticas (si hay)
+        """
+        return {'metodo': self.metodo, 'h': self.h, 'rtol': self.rtol, 'atol': self.atol, 'filas': len(self),
+                'estadisticas': self.estadisticas.como_dict() if hasattr(self.estadisticas, 'como_dict') else self.estadisticas}
+
+    def a_pandas(self):
+        """
+        Arma el DataFrame de la corrida, con las mismas columnas que la tabla de antes (una por componente en los sistemas)
+
+        :return: DataFrame
+        """
+        import pandas as pd
+
+        # Las columnas derivables se calculan antes para que la tabla las muestre
+        for nombre in ('y_real', 'error_global'):
+            if nombre not in self._columnas and (self.exacta is not None or 'y_real' in self._columnas):
+                self[nombre]
+
+        if not self.sistema:
+            # copy=False para que las columnas sean vistas de los arreglos y no copias
+            return pd.DataFrame(self._columnas, copy=False)
+
+        columnas = {}
+        for nombre, valores in self._columnas.items():
+            if valores.ndim == 1:
+                columnas[nombre] = valores
+            else:
+                for i in range(valores.shape[1]):
+                    columnas['{}_{}'.format(nombre, i)] = valores[:, i]
+        # Mismo orden de antes: t, todas las y_aprox_i, todos los error_local_i, y luego las demás
+        return pd.DataFrame(columnas)
+
+    def __repr__(self):
+        return "Resultado(metodo={!r}, h={!r}, filas={}, columnas={})".format(self.metodo, self.h, len(self), self.columns)
+
+    def _repr_html_(self):
+        # En los notebooks display() muestra la tabla; el DataFrame se arma solo para mostrarla
+        return self.a_pandas()._repr_html_()
+
+    def guardar(self, carpeta):
+        """
+        Guarda la corrida en una carpeta: un .npy por columna y los metadatos en metadatos.json
+
+        :param carpeta: str, carpeta de destino (se crea si no existe)
+        """
+        os.makedirs(carpeta, exist_ok=True)
+        for nombre, valores in self._columnas.items():
+            np.save(os.path.join(carpeta, nombre + '.npy'), valores)
+
+        metadatos = self.metadatos()
+        metadatos['columnas'] = self.columns
+        with open(os.path.join(carpeta, 'metadatos.json'), 'w', encoding='utf-8') as archivo:
+            json.dump(metadatos, archivo, indent=2, ensure_ascii=False)
+
+    @classmethod
+    def cargar(cls, carpeta, mmap=True):
+        """
+        Carga una corrida guardada con guardar. Con mmap los .npy se mapean en memoria: los datos se leen del disco recién cuando se usan
+
+        :param carpeta: str, carpeta de la corrida
+        :param mmap: bool, si es True las columnas son arreglos mapeados de solo lectura
+        :return: Resultado (las estadísticas se recuperan como dict)
+        """
+        with open(os.path.join(carpeta, 'metadatos.json'), encoding='utf-8') as archivo:
+            metadatos = json.load(archivo)
+
+        modo = 'r' if mmap else None
+        columnas = {nombre: np.load(os.path.join(carpeta, nombre + '.npy'), mmap_mode=modo) for nombre in metadatos['columnas']}
+        resultado = cls(*(columnas.pop(nombre) for nombre in COLUMNAS_BASE), metodo=metadatos['metodo'], h=metadatos['h'],
+                        rtol=metadatos['rtol'], atol=metadatos['atol'], estadisticas=metadatos['estadisticas'])
+        # Las columnas agregadas se asignan directo, sin convertirlas (siguen mapeadas)
+        resultado._columnas.update(columnas)
+        return resultado
+
+def cargar_resultados(carpeta, mmap=True):
+    """
+    Carga todas las corridas guardadas en las subcarpetas de una carpeta (por ejemplo un archivo de miles de corridas) sin leer sus datos
+
+    :param carpeta: str, carpeta con una subcarpeta por corrida
+    :param mmap: bool, si es True las columnas se mapean en memoria
+    :return: dict {nombre de la subcarpeta: Resultado}, en orden alfabético
+    """
+    return {entrada.name: Resultado.cargar(entrada.path, mmap=mmap)
+            for entrada in sorted(os.scandir(carpeta), key=lambda entrada: entrada.name)
+            if entrada.is_dir() and os.path.exists(os.path.join(entrada.path, 'metadatos.json'))}
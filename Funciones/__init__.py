@@ -0,0 +1,64 @@
+"""
+API estable del paquete: los nombres de abajo se pueden importar directo de Funciones (from Funciones import integrar).
+Al importar el paquete solo se cargan numpy, Resultado y Estadisticas: cada submódulo se importa la primera vez que se pide
+uno de sus nombres, y scipy, pandas y matplotlib recién cuando se usa una función que los necesita (resolver_con_scipy,
+a_pandas, las gráficas, ...)
+"""
+import importlib
+
+# Resultado y Estadisticas se llaman igual que su submódulo: se importan ya (solo dependen de numpy) para que el nombre del
+# paquete quede ligado a la clase y no al módulo, que es lo que hace la importación de un submódulo la primera vez
+from Funciones.Estadisticas import Estadisticas
+from Funciones.Resultado import Resultado
+
+# Nombre público -> submódulo que lo define
+_API = {
+    # Métodos
+    'integrar': 'Metodos', 'integrar_conjunto': 'Metodos', 'integrar_por_bloques': 'Metodos',
+    'runge_kutta_2_trapecio': 'Metodos', 'runge_kutta_4': 'Metodos', 'adam_bashforth_2_con_euler_RK1_explicito': 'Metodos',
+    'heun': 'Metodos', 'adams_bashforth_moulton': 'Metodos', 'euler_implicito': 'Metodos', 'trapecio_implicito': 'Metodos',
+    'sdirk2': 'Metodos', 'exponencial_lineal': 'Metodos', 'solucion_lineal': 'Metodos', 'runge_kutta_adaptativo': 'Metodos',
+    'extrapolacion': 'Metodos', 'resolver_con_scipy': 'Metodos', 'calcular_tiempo_para_valor': 'Metodos',
+    'METODOS_PASO_FIJO': 'Metodos', 'METODOS_SCIPY': 'Metodos', 'PARES_ENCAJADOS': 'Metodos', 'METODOS_EXTRAPOLACION': 'Metodos',
+    # Resultados, estadísticas e interpolantes
+    'cargar_resultados': 'Resultado',
+    'InterpolanteHermite': 'Interpolacion', 'InterpolanteScipy': 'Interpolacion',
+    # Errores
+    'calcular_y_reales': 'Errores', 'calcular_error_global': 'Errores', 'calcular_errores_globales': 'Errores',
+    'normas_error': 'Errores', 'orden_convergencia': 'Errores', 'analizar_corridas': 'Errores',
+    # Problemas y constantes
+    'PROBLEMAS': 'Problemas', 'y1': 'Problemas', 'dy1': 'Problemas', 'crear_cadena_bateman': 'Problemas',
+    'T_HALF': 'Constantes', 'LAMBDA': 'Constantes', 'R_REMANENTE': 'Constantes', 'T_INICIAL': 'Constantes',
+    'T_FINAL': 'Constantes', 'VALORES_H': 'Constantes', 'T_HALF_SIGMA': 'Constantes', 'R_REMANENTE_SIGMA': 'Constantes',
+    # Propagación de incertidumbre
+    'propagar_incertidumbre': 'Incertidumbre', 'muestrear_entradas': 'Incertidumbre', 'PropagacionIncertidumbre': 'Incertidumbre',
+    # Barridos, caché y versiones compiladas
+    'crear_configuraciones': 'Barrido', 'ejecutar_barrido': 'Barrido',
+    'CacheResultados': 'Cache',
+    'jit_opcional': 'Compilado', 'NUMBA_DISPONIBLE': 'Compilado',
+    # Gráficas
+    'graficar_solucion_exacta': 'Graficas', 'crear_figura_comparacion': 'Graficas', 'crear_figura_completa_comparacion': 'Graficas',
+    'guardar_figura': 'Graficas', 'diezmar': 'Graficas',
+    'crear_figura_comparacion_paso_adaptativo': 'GraficasPasoAdaptativo', 'crear_grafico_barras': 'GraficasPasoAdaptativo',
+    'crear_grafico_barras_pasos': 'GraficasPasoAdaptativo',
+}
+
+_SUBMODULOS = ('Barrido', 'Cache', 'Compilado', 'Constantes', 'Errores', 'Estadisticas', 'Graficas', 'GraficasPasoAdaptativo',
+               'Incertidumbre', 'Interpolacion', 'Metodos', 'Problemas', 'Reporte', 'Resultado')
+
+__all__ = ['Estadisticas', 'Resultado'] + list(_API)
+
+def __getattr__(nombre):
+    if nombre in _API:
+        valor = getattr(importlib.import_module('.' + _API[nombre], __name__), nombre)
+    elif nombre in _SUBMODULOS:
+        valor = importlib.import_module('.' + nombre, __name__)
+    else:
+        raise AttributeError("module {!r} has no attribute {!r}".format(__name__, nombre))
+
+    # Se guarda en el paquete para que los accesos siguientes no pasen por acá
+    globals()[nombre] = valor
+    return valor
+
+def __dir__():
+    return sorted(set(globals()) | set(_API) | set(_SUBMODULOS))